@@ -0,0 +1,419 @@
+#!/usr/bin/env python3
+"""Benchmarks that measure EasyMoney's simulation performance without a GUI.
+
+Run with the names of benchmarks to run, or no arguments to run them all.
+"""
+
+
+__copyright__ = 'Copyright © 2019, Erik Anderson, James Abernathy, and Tyler Gerritsen'
+__license__ = 'MIT'
+
+
+import argparse
+import datetime
+import gc
+import json
+import multiprocessing
+import multiprocessing.connection
+import os
+import pprint
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import typing
+
+import dispatch
+from controller.sim_controller import SimController
+from event_bridge import EventBridge, EventReceiver
+from model.sim_model import SimModel
+from model.trader import Trader
+from model.trader_pool import TraderThreadPool
+
+
+
+
+def _run_momentum_traders(
+    set_pool: typing.Callable[[SimModel], None],
+    num_traders: int,
+    num_stock_symbols: int,
+    num_ticks: int
+) -> typing.Tuple[float, typing.List[typing.Dict[str, typing.Any]]]:
+    """Time `num_ticks` random market samples traded on by `num_traders`
+    momentum traders, after `set_pool` configures the model's trader pool.
+    Returns the elapsed time along with final trader statistics.
+    """
+    random.seed(0)
+    model = SimModel()
+    for index in range(num_traders):
+        model.add_trader('Trader {:03d}'.format(index),
+            10000.0, 0.1 * (index % 10), 'Momentum', {})
+    set_pool(model)
+    model.reset_market_and_trader_accounts()
+
+    market = model.get_stock_market()
+    start = datetime.datetime(2019, 1, 1)
+    prices = {'STOCK{:d}'.format(index): 100.0
+        for index in range(num_stock_symbols)}
+    time_start = time.perf_counter()
+    for tick in range(num_ticks):
+        for stock_symbol, price in prices.items():
+            prices[stock_symbol] = max(1.0, price + random.gauss(0, 1))
+        market.add_next_prices(
+            start + datetime.timedelta(minutes=tick), prices)
+    elapsed = time.perf_counter() - time_start
+
+    statistics = []
+    for trader in sorted(model.get_traders(), key=Trader.get_name):
+        account = trader.get_account()
+        assert account is not None, 'Missing TraderAccount'
+        statistics.append(account.get_statistics_overall())
+    model.set_trader_threads(0)
+    model.set_trader_processes(0)
+    return elapsed, statistics
+
+
+def benchmark_trader_pools(
+) -> None:
+    """Compare serial trading against trader thread and process pools."""
+    NUM_TRADERS, NUM_STOCK_SYMBOLS, NUM_TICKS = 400, 50, 300
+    num_workers = os.cpu_count() or 1
+    print('{:d} traders, {:d} stock symbols, {:d} ticks, {:d} CPUs, '
+        'free-threaded: {}'.format(NUM_TRADERS, NUM_STOCK_SYMBOLS, NUM_TICKS,
+            num_workers, TraderThreadPool.is_free_threaded()))
+
+    elapsed_serial, statistics_serial = _run_momentum_traders(
+        lambda model: None, NUM_TRADERS, NUM_STOCK_SYMBOLS, NUM_TICKS)
+    print('Serial:       {:.3f} s'.format(elapsed_serial))
+    for name, set_pool in [
+        ('Thread pool', lambda model: model.set_trader_threads(num_workers)),
+        ('Process pool', lambda model: model.set_trader_processes(num_workers))
+    ]:
+        elapsed, statistics = _run_momentum_traders(
+            set_pool, NUM_TRADERS, NUM_STOCK_SYMBOLS, NUM_TICKS)
+        print('{:<13} {:.3f} s ({:.2f}x), identical results: {}'.format(
+            name + ':', elapsed, elapsed_serial / elapsed,
+            statistics == statistics_serial))
+
+
+
+def _write_alpha_vantage_json(
+    directory: str,
+    stock_symbol: str,
+    num_ticks: int
+) -> str:
+    """Write a random walk of `num_ticks` one-minute prices for `stock_symbol`
+    to an Alpha Vantage `TIME_SERIES_INTRADAY` JSON file in `directory`, and
+    return its filename.
+    """
+    start = datetime.datetime(2019, 1, 2, 9, 30)
+    price = 100.0
+    time_series = {}
+    for tick in reversed(range(num_ticks)):  # Newest first, as served
+        price = max(1.0, price + random.gauss(0, 1))
+        time_series['{:%Y-%m-%d %H:%M:%S}'.format(
+            start + datetime.timedelta(minutes=tick))] = {
+                '4. close': '{:.4f}'.format(price)}
+
+    filename = os.path.join(directory, stock_symbol + '.json')
+    with open(filename, 'w', encoding='utf_8') as json_file:
+        json.dump({
+            'Meta Data': {
+                '2. Symbol': stock_symbol,
+                '4. Interval': '1min'},
+            'Time Series (1min)': time_series}, json_file)
+    return filename
+
+def benchmark_headless_run(
+) -> None:
+    """Measure a headless `SimController.run_to_completion` over a datasource
+    of random prices.
+    """
+    NUM_TRADERS, NUM_STOCK_SYMBOLS, NUM_TICKS = 3, 10, 100_000
+    random.seed(0)
+    controller = SimController(SimModel())
+    for index in range(NUM_TRADERS):
+        controller.add_trader('Trader {:d}'.format(index),
+            10000.0, 0.5 * index, 'Momentum')
+
+    with tempfile.TemporaryDirectory() as directory:
+        for index in range(NUM_STOCK_SYMBOLS):
+            controller.get_datasource().add_stock_symbol(
+                _write_alpha_vantage_json(directory,
+                    'STOCK{:d}'.format(index), NUM_TICKS))
+
+    time_start = time.perf_counter()
+    statistics = controller.run_to_completion()
+    elapsed = time.perf_counter() - time_start
+
+    print('{:d} ticks of {:d} stock symbols with {:d} traders: {:.3f} s '
+        '({:,.0f} ticks per minute), Kivy imported: {}'.format(
+            NUM_TICKS, NUM_STOCK_SYMBOLS, NUM_TRADERS, elapsed,
+            60 * NUM_TICKS / elapsed, 'kivy' in sys.modules))
+    for name, trader_statistics in statistics.items():
+        print('{}: {}'.format(name, trader_statistics))
+
+
+def _time_import(
+    statement: str
+) -> typing.Optional[float]:
+    """Return the seconds a fresh interpreter takes to execute the import
+    `statement`, or `None` if it fails, such as when a module is missing.
+    """
+    script = ('import time\n'
+        'time_start = time.perf_counter()\n'
+        '{}\n'
+        'print(time.perf_counter() - time_start)'.format(statement))
+    environment = dict(os.environ, KIVY_NO_ARGS='1', KIVY_NO_CONSOLELOG='1')
+    result = subprocess.run([sys.executable, '-c', script],
+        cwd=os.path.dirname(os.path.abspath(__file__)), env=environment,
+        stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+        universal_newlines=True)
+    if result.returncode:
+        return None
+    return float(result.stdout)
+
+def benchmark_import_time(
+) -> None:
+    """Compare cold-start import times of a headless simulation with and
+    without Kivy's clock, as `controller.market_updater` once required.
+    """
+    NUM_SAMPLES = 5
+    for name, statement in [
+        ('Headless', 'import controller.sim_controller, model.sim_model'),
+        ('With kivy.clock', 'import kivy.clock\n'
+            'import controller.sim_controller, model.sim_model')
+    ]:
+        samples = [_time_import(statement) for _ in range(NUM_SAMPLES)]
+        times = [sample for sample in samples if sample is not None]
+        if len(times) < len(samples):
+            print('{:<16} unavailable'.format(name + ':'))
+        else:
+            print('{:<16} {:.1f} ms (best of {:d})'.format(
+                name + ':', 1000 * min(times), NUM_SAMPLES))
+
+
+
+def benchmark_dispatch(
+) -> None:
+    """Measure event emits per second through `Dispatcher.emit` and through
+    pre-bound `_EventListeners`, with varying numbers of listeners, while
+    profiling, and to listeners with deferred delivery policies.
+    """
+    NUM_EMITS = 200_000
+
+    class Emitter(dispatch.Dispatcher):
+        EVENTS = frozenset(['EVENT'])
+
+    for num_listeners in [0, 1, 1000]:
+        emitter = Emitter()
+        for _ in range(num_listeners):
+            emitter.bind(EVENT=lambda **kwargs: None)
+        listeners = emitter.get_event_listeners('EVENT')
+        num_emits = NUM_EMITS // max(1, num_listeners // 10)
+
+        for name, emit in [
+            ('emit', lambda: emitter.emit('EVENT', value=1)),
+            ('pre-bound', lambda: listeners(value=1))
+        ]:
+            time_start = time.perf_counter()
+            for _ in range(num_emits):
+                emit()
+            elapsed = time.perf_counter() - time_start
+            print('{:>5d} listeners, {:<10} {:>12,.0f} emits per second'.format(
+                num_listeners, name + ':', num_emits / elapsed))
+
+    emitter = Emitter()
+    emitter.bind(EVENT=lambda **kwargs: None)
+    listeners = emitter.get_event_listeners('EVENT')
+    dispatch.Dispatcher.set_profile(dispatch.DispatchProfile())
+    time_start = time.perf_counter()
+    for _ in range(NUM_EMITS):
+        listeners(value=1)
+    elapsed = time.perf_counter() - time_start
+    dispatch.Dispatcher.set_profile(None)
+    print('{:>5d} listeners, {:<10} {:>12,.0f} emits per second'.format(
+        1, 'profiled:', NUM_EMITS / elapsed))
+
+    for name, delivery in [
+        ('coalesced', dispatch.CoalescedDelivery()),
+        ('batched', dispatch.BatchedDelivery())
+    ]:
+        emitter = Emitter()
+        emitter.bind_deferred(delivery, EVENT=lambda *args, **kwargs: None)
+        listeners = emitter.get_event_listeners('EVENT')
+
+        time_start = time.perf_counter()
+        for index in range(NUM_EMITS):
+            listeners(value=1)
+            if not index % 1000:  # As if flushed once per frame
+                delivery.flush()
+        delivery.flush()
+        elapsed = time.perf_counter() - time_start
+        print('{:>5d} listeners, {:<10} {:>12,.0f} emits per second'.format(
+            1, name + ':', NUM_EMITS / elapsed))
+
+
+def _bind_formatters(
+    dispatcher: dispatch.Dispatcher
+) -> None:
+    """Bind listeners to all of `dispatcher`'s events that pretty-print their
+    arguments, like a `LoggingView` whose messages get written.
+    """
+    pprinter = pprint.PrettyPrinter(indent=4)
+    def format_event(*args: typing.Any, **kwargs: typing.Any) -> None:
+        pprinter.pformat((args, kwargs))
+    for name in dispatcher.get_event_names():
+        dispatcher.bind(**{name: format_event})
+
+def _format_events_forwarded(
+    connection: multiprocessing.connection.Connection
+) -> None:
+    """Pretty-print all events of the market forwarded over `connection`,
+    until the bridge closes. Runs in a child process.
+    """
+    receiver = EventReceiver(connection)
+    _bind_formatters(receiver.get_proxy('market'))
+    receiver.run()
+
+def benchmark_event_bridge(
+) -> None:
+    """Compare simulation time with no market listeners, with an in-process
+    listener that pretty-prints every event, and with events forwarded over
+    an `EventBridge` to the same listener in a child process.
+    """
+    NUM_TRADERS, NUM_STOCK_SYMBOLS, NUM_TICKS = 10, 50, 5000
+
+    def run(bind: typing.Callable[[SimModel], None],
+        finish: typing.Callable[[], typing.Any] = lambda: None
+    ) -> float:
+        random.seed(0)
+        model = SimModel()
+        for index in range(NUM_TRADERS):
+            model.add_trader('Trader {:d}'.format(index),
+                10000.0, 0.1 * index, 'Momentum', {})
+        model.reset_market_and_trader_accounts()
+        market = model.get_stock_market()
+        bind(model)
+
+        start = datetime.datetime(2019, 1, 1)
+        prices = {'STOCK{:d}'.format(index): 100.0
+            for index in range(NUM_STOCK_SYMBOLS)}
+        time_start = time.perf_counter()
+        for tick in range(NUM_TICKS):
+            for stock_symbol, price in prices.items():
+                prices[stock_symbol] = max(1.0, price + random.gauss(0, 1))
+            market.add_next_prices(
+                start + datetime.timedelta(minutes=tick), prices)
+        finish()
+        return time.perf_counter() - time_start
+
+    print('{:d} traders, {:d} stock symbols, {:d} ticks'.format(
+        NUM_TRADERS, NUM_STOCK_SYMBOLS, NUM_TICKS))
+    print('{:<24} {:.3f} s'.format('No listeners:', run(lambda model: None)))
+    print('{:<24} {:.3f} s'.format('In-process listener:', run(
+        lambda model: _bind_formatters(model.get_stock_market()))))
+
+    context = multiprocessing.get_context()
+    connection, connection_child = context.Pipe()
+    process = context.Process(target=_format_events_forwarded,
+        args=(connection_child,), daemon=True)
+    process.start()
+    connection_child.close()
+    bridge = EventBridge(connection)
+    elapsed = run(lambda model:
+        bridge.forward(model.get_stock_market(), 'market'), bridge.flush)
+    bridge.close()
+    process.join()
+    print('{:<24} {:.3f} s, {:,d} events, {:.1f} bytes per event'.format(
+        'Forwarded listener:', elapsed, bridge.get_num_events_sent(),
+        bridge.get_num_bytes_sent() / max(1, bridge.get_num_events_sent())))
+
+
+def benchmark_trader_reset(
+) -> None:
+    """Measure resetting the market with many traders, each of which rebinds
+    its listeners to a new account and to the market.
+    """
+    NUM_SAMPLES = 3
+    for num_traders in [1000, 10_000]:
+        model = SimModel()
+        for index in range(num_traders):
+            model.add_trader('Trader {:05d}'.format(index),
+                10000.0, 0.0, 'Momentum', {})
+
+        samples = []
+        for _ in range(NUM_SAMPLES):
+            time_start = time.perf_counter()
+            model.reset_market_and_trader_accounts()
+            samples.append(time.perf_counter() - time_start)
+        print('{:>6,d} traders: {:.1f} ms (best of {:d})'.format(
+            num_traders, 1000 * min(samples), NUM_SAMPLES))
+
+
+def benchmark_listener_memory(
+) -> None:
+    """Check that memory stays flat across many cycles of adding a trader,
+    resetting the market, and removing the trader again, since discarded
+    traders and accounts must not stay bound to the market.
+    """
+    NUM_CYCLES, NUM_CYCLES_WARMUP = 10_000, 100
+    model = SimModel()
+    model.add_trader('Trader', 10000.0, 0.0, 'Momentum', {})
+    market = model.get_stock_market()
+
+    def run_cycles(num_cycles: int) -> None:
+        for _ in range(num_cycles):
+            model.add_trader('Temporary', 10000.0, 0.0, 'Momentum', {})
+            model.reset_market_and_trader_accounts()
+            model.remove_trader('Temporary')
+
+    run_cycles(NUM_CYCLES_WARMUP)  # Fill caches first
+    tracemalloc.start()
+    gc.collect()  # Traders and their accounts refer to each other
+    memory_start = tracemalloc.get_traced_memory()[0]
+    run_cycles(NUM_CYCLES)
+    gc.collect()
+    memory_growth = tracemalloc.get_traced_memory()[0] - memory_start
+    tracemalloc.stop()
+
+    print('{:,d} cycles: {:+,d} bytes ({:+.1f} per cycle), {:d} '
+        'STOCKMARKET_ADDITION listeners'.format(NUM_CYCLES, memory_growth,
+            memory_growth / NUM_CYCLES,
+            len(market.get_event_listeners('STOCKMARKET_ADDITION'))))
+
+
+
+BENCHMARKS: typing.Dict[str, typing.Callable[[], None]] = {
+    'dispatch': benchmark_dispatch,
+    'event_bridge': benchmark_event_bridge,
+    'headless_run': benchmark_headless_run,
+    'import_time': benchmark_import_time,
+    'listener_memory': benchmark_listener_memory,
+    'trader_pools': benchmark_trader_pools,
+    'trader_reset': benchmark_trader_reset}
+"""Benchmark functions indexed by their command line names."""
+
+
+def main() -> None:
+    """Run benchmarks named on the command line."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('benchmarks', nargs='*', metavar='BENCHMARK',
+        help='Benchmarks to run, or all if omitted. One of: {}.'.format(
+            ', '.join(BENCHMARKS)))
+    arguments = parser.parse_args()
+    for name in arguments.benchmarks:
+        if name not in BENCHMARKS:
+            parser.error('Unrecognized benchmark {!r}.'.format(name))
+
+    for name in arguments.benchmarks or BENCHMARKS:
+        print('== {} =='.format(name))
+        BENCHMARKS[name]()
+
+
+
+
+if __name__ == '__main__':
+    main()
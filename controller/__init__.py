@@ -5,7 +5,9 @@ __copyright__ = 'Copyright © 2019, Erik Anderson, James Abernathy, and Tyler Ge
 __license__ = 'MIT'
 
 
+# `async_market_updater` loads `asyncio`, so it's only imported on demand
 from controller import (
     sim_controller,
     market_datasource,
-    market_updater)
+    market_updater,
+    update_clock)
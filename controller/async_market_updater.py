@@ -0,0 +1,261 @@
+"""Defines `AsyncMarketUpdater`."""
+
+
+__copyright__ = 'Copyright © 2019, Erik Anderson, James Abernathy, and Tyler Gerritsen'
+__license__ = 'MIT'
+
+
+import asyncio
+import datetime
+import time
+import typing
+
+from controller.market_updater import MarketUpdater
+
+# Local package imports duplicated at end of file to resolve circular dependencies
+if typing.TYPE_CHECKING:
+    from controller.market_datasource import MarketDatasource
+    from controller.update_clock import UpdateClock
+    from model.sim_model import SimModel
+
+
+
+
+def _get_current_task(
+) -> typing.Optional['asyncio.Task']:
+    """Return the running `asyncio.Task`, or `None` if called outside of one.
+    """
+    try:
+        return asyncio.current_task()
+    except RuntimeError:  # No running event loop
+        return None
+
+
+
+
+class AsyncMarketUpdater(MarketUpdater):
+    """A `MarketUpdater` driven by an `asyncio` event loop instead of Kivy's
+    clock, with the same states and events. While playing, prices are
+    delivered by a task that yields to the event loop every
+    `get_yield_ticks` prices or `get_yield_interval` seconds, so several
+    simulations can share one event loop without threads.
+
+    `play` and `run_until_async` must be called from the event loop's
+    thread. The blocking batch runs inherited from `MarketUpdater`, such as
+    `MarketUpdater.run_until`, still work without yielding to it.
+    """
+
+    _task: typing.Optional['asyncio.Task']
+    """The task delivering prices while playing, or `None` in other states.
+    """
+
+    _yield_ticks: int
+    """Maximum number of prices delivered between yields to the event loop.
+    """
+
+    _yield_interval: typing.Optional[float]
+    """Maximum seconds spent delivering prices between yields to the event
+    loop, or `None` to yield only every `_yield_ticks` prices.
+    """
+
+
+    def __init__(self,
+        datasource: 'MarketDatasource',
+        model: 'SimModel',
+        clock: typing.Optional['UpdateClock'] = None
+    ) -> None:
+        """Start this new `AsyncMarketUpdater` in a reset state. Any other
+        periodic updates are scheduled by `clock`, or on the running event
+        loop if `None`.
+        """
+        self._task = None
+        self._yield_ticks = 100
+        self._yield_interval = 0.005
+        super().__init__(datasource, model,
+            AsyncioUpdateClock() if clock is None else clock)
+
+
+    def get_yield_ticks(self
+    ) -> int:
+        """Return the maximum number of prices delivered between yields to the
+        event loop. See `set_yield_ticks`.
+        """
+        return self._yield_ticks
+
+    def set_yield_ticks(self,
+        yield_ticks: int
+    ) -> None:
+        """Yield to the event loop at least every `yield_ticks` prices while
+        playing.
+        """
+        if yield_ticks < 1:
+            raise ValueError('Yield ticks must be positive.')
+        self._yield_ticks = yield_ticks
+
+    def get_yield_interval(self
+    ) -> typing.Optional[float]:
+        """Return the maximum seconds spent delivering prices between yields
+        to the event loop, or `None` if unlimited. See `set_yield_interval`.
+        """
+        return self._yield_interval
+
+    def set_yield_interval(self,
+        yield_interval_s: typing.Optional[float]
+    ) -> None:
+        """Yield to the event loop at least every `yield_interval_s` seconds
+        while playing, or only every `get_yield_ticks` prices if `None`.
+        """
+        if yield_interval_s is not None and yield_interval_s <= 0:
+            raise ValueError('Yield interval must be positive.')
+        self._yield_interval = yield_interval_s
+
+
+    def set_threaded(self,
+        threaded: bool
+    ) -> None:
+        """Threaded mode is unsupported, since prices are always delivered
+        from the event loop's thread. Raises `ValueError` if `threaded`.
+        """
+        if threaded:
+            raise ValueError('AsyncMarketUpdater always plays from its event '
+                'loop rather than a worker thread.')
+
+
+    def play(self
+    ) -> None:
+        """Start or resume delivering prices to the `model.StockMarket` from a
+        task on the running event loop, until paused or out of data.
+        """
+        with self._command_lock:
+            if self.is_playing():
+                return  # Already playing
+            self._start_task(None)
+
+    async def run_until_async(self,
+        time: typing.Optional[datetime.datetime] = None
+    ) -> int:
+        """Deliver prices up to and including those at `time`, or all
+        remaining prices if `None`, yielding to the event loop between
+        batches, unlike the blocking `MarketUpdater.run_until`. Starts from
+        reset or resumes from paused like `play`, and returns the number of
+        prices delivered once paused again, including when `pause` is called
+        meanwhile. Cancelling the awaiting task pauses this updater before
+        propagating.
+        """
+        with self._command_lock:
+            self.pause()  # Stop any task started by `play`
+            task = self._start_task(time)
+        return await task
+
+    def _start_task(self,
+        time_until: typing.Optional[datetime.datetime]
+    ) -> 'asyncio.Task':
+        """Enter the `PLAYING` state and start a task that delivers prices up
+        to `time_until`.
+        """
+        loop = asyncio.get_running_loop()
+        self._start_playing()
+        self._anchor_replay()
+        self._speed_ticks = 0
+        self._speed_time_start = time.perf_counter()
+
+        self._task = loop.create_task(self._deliver_prices(time_until))
+        return self._task
+
+
+    def pause(self
+    ) -> None:
+        """Pause this updater, cancelling the task delivering prices."""
+        with self._command_lock:
+            if self.is_playing():
+                self._cancel_task()
+            super().pause()
+
+    def pause_restored(self
+    ) -> None:
+        """See `MarketUpdater.pause_restored`."""
+        with self._command_lock:
+            self._cancel_task()
+            super().pause_restored()
+
+    def _cancel_task(self
+    ) -> None:
+        """Stop the task delivering prices, unless it's the caller."""
+        task = self._task
+        self._task = None
+        if task is not None and task is not _get_current_task():
+            task.cancel()
+
+
+    async def _deliver_prices(self,
+        time_until: typing.Optional[datetime.datetime]
+    ) -> int:
+        """Deliver prices from the datasource to the model's `StockMarket` up
+        to `time_until`, or until out of data, then pause and return the
+        number delivered. Runs as `_task`.
+        """
+        market = self._model.get_stock_market()
+        if self._delta_ticks:
+            get_next_prices = self._datasource.get_next_price_changes
+            add_next_prices = market.add_next_price_changes
+        else:
+            get_next_prices = self._datasource.get_next_prices
+            add_next_prices = market.add_next_prices
+        peek_next_time = self._datasource.peek_next_time
+
+        count = count_yielded = 0
+        time_yielded = time.perf_counter()
+        task = _get_current_task()
+        try:
+            while True:
+                if time_until is not None:
+                    time_next = peek_next_time()
+                    if time_next is None or time_next > time_until:
+                        break
+                if self._replay_speed is not None:
+                    time_next = peek_next_time()
+                    delay = (0.0 if time_next is None
+                        else self._get_replay_delay(time_next))
+                    if delay > 0.0:  # Recheck periodically for speed changes
+                        self._speed_ticks += count - count_yielded
+                        count_yielded = count
+                        await asyncio.sleep(min(delay, self.SPEED_INTERVAL_s))
+                        time_yielded = time.perf_counter()
+                        continue
+                time_and_prices = get_next_prices()
+                if not time_and_prices:  # Ran out of data
+                    break
+                add_next_prices(*time_and_prices)
+                count += 1
+                if self._task is not task:  # Paused or reset by a listener
+                    break
+
+                time_now = time.perf_counter()
+                if (count - count_yielded >= self._yield_ticks
+                    or (self._yield_interval is not None
+                        and time_now - time_yielded >= self._yield_interval)
+                ):
+                    self._speed_ticks += count - count_yielded
+                    if time_now - self._speed_time_start >= self.SPEED_INTERVAL_s:
+                        self._set_ticks_per_second(self._speed_ticks
+                            / (time_now - self._speed_time_start))
+                    count_yielded = count
+
+                    await asyncio.sleep(0)
+                    time_yielded = time.perf_counter()
+            return count
+        except asyncio.CancelledError:
+            if self._task is not task:
+                return count  # Stopped by `pause`, so already paused
+            raise
+        finally:
+            if self._task is task:  # Finished rather than stopped by `pause`
+                self.pause()
+
+
+
+
+# Imported last to avoid circular dependencies
+from controller.market_datasource import MarketDatasource
+from controller.update_clock import AsyncioUpdateClock, UpdateClock
+from model.sim_model import SimModel
@@ -58,6 +58,22 @@ class DatasourcesMissingError(RuntimeError):
             'Cannot confirm without adding at least one stock symbol.')
 
 
+class DatasourcePositionError(ValueError):
+    """An exception raised when seeking the datasource to a position outside
+    of its complete entries.
+    """
+
+    position: int
+    """The requested position that could not be sought to."""
+
+    def __init__(self,
+        position: int
+    ) -> None:
+        self.position = position
+        super().__init__(
+            'Datasource position {:d} is out of range.'.format(position))
+
+
 
 
 class MarketDatasource(dispatch.Dispatcher):
@@ -83,6 +99,14 @@ class MarketDatasource(dispatch.Dispatcher):
     `.get_next_prices()` to serve. Only set while `.is_confirmed()`.
     """
 
+    _combined_price_changes: typing.Optional[
+        typing.List[typing.Optional[typing.Dict[str, float]]]]
+    """Prices from each entry of `._combined_prices` that changed since the
+    previous entry, for `.get_next_price_changes()` to serve. Entries before
+    the starting `._combined_prices_index` are `None`, and the starting entry
+    includes all prices. Only set while `.is_confirmed()`.
+    """
+
     EVENTS: typing.ClassVar[typing.FrozenSet[str]] = frozenset([
         'MARKETDATASOURCE_CAN_CONFIRM_UPDATED',
         'MARKETDATASOURCE_CONFIRMED',
@@ -100,6 +124,7 @@ class MarketDatasource(dispatch.Dispatcher):
 
         self._combined_prices = None
         self._combined_prices_index = None
+        self._combined_price_changes = None
 
 
     def get_stock_symbols(self
@@ -209,19 +234,17 @@ class MarketDatasource(dispatch.Dispatcher):
         '''
         TODO: Rewrite so that it automatically filters out segments missing
         data from some stock symbols.
-
-        If this algorithm is too slow, use a merge-sort to join all
-        `SymbolPrices` lists, using the previous `dict` of prices as the base
-        for each successive entry to simultaneously fill in holes.
         '''
         assert self._combined_prices is None, 'Prices already combined'
 
-        # First add all available data
-        combined_prices: typing.List[CombinedPrices] = []
+        # First add all available data, grouped by time
+        prices_by_time: typing.Dict[datetime.datetime, typing.Dict[str, float]] = {}
         for stock_symbol, symbol_prices in self._symbols_prices.items():
             for symbol_price in symbol_prices:
-                self._combine_stock_price(combined_prices,
-                    symbol_price.time, stock_symbol, symbol_price.price)
+                prices_by_time.setdefault(symbol_price.time, {})[
+                    stock_symbol] = symbol_price.price
+        combined_prices = [CombinedPrices(time=time, prices=prices)
+            for time, prices in sorted(prices_by_time.items())]
 
         # Next fill in any data holes
         for index, prices in enumerate(combined_prices):
@@ -240,30 +263,6 @@ class MarketDatasource(dispatch.Dispatcher):
         # Save combined list
         self._combined_prices = combined_prices
 
-    def _combine_stock_price(self,
-        combined_prices: typing.List[CombinedPrices],
-        time: datetime.datetime,
-        stock_symbol: str,
-        price: float
-    ) -> None:
-        """Given a `time`, `stock_symbol`, and `price`, update the running list
-        of `combined_prices` in chronological order. If there is already an
-        entry at the given `time`, add the new stock price to the existing
-        entry.
-        """
-        new_price = CombinedPrices(time=time, prices={stock_symbol: price})
-
-        for index, prices in enumerate(combined_prices):
-            if time < prices.time:
-                combined_prices.insert(index, new_price)
-                return
-            elif time == prices.time:
-                prices.prices.update(new_price.prices)
-                return
-
-        # Otherwise element is not present, add to end of list
-        combined_prices.append(new_price)
-
 
     def _find_start_index(self
     ) -> None:
@@ -282,6 +281,29 @@ class MarketDatasource(dispatch.Dispatcher):
         self._combined_prices_index = len(self._combined_prices)
 
 
+    def _find_price_changes(self
+    ) -> None:
+        """Determine which prices in `._combined_prices` change from each
+        entry to the next, starting from `._combined_prices_index`.
+        """
+        assert self._combined_prices is not None, 'Combined prices missing'
+        assert self._combined_prices_index is not None, 'Prices index missing'
+
+        start = self._combined_prices_index
+        combined_price_changes: typing.List[
+            typing.Optional[typing.Dict[str, float]]] = [None] * start
+
+        prices_previous: typing.Dict[str, float] = {}
+        for combined_prices in self._combined_prices[start:]:
+            prices = combined_prices.prices
+            combined_price_changes.append({stock_symbol: price
+                for stock_symbol, price in prices.items()
+                    if prices_previous.get(stock_symbol) != price})
+            prices_previous = prices
+
+        self._combined_price_changes = combined_price_changes
+
+
     def can_confirm(self
     ) -> bool:
         """Return `True` if there is at least one stock symbol added."""
@@ -310,6 +332,7 @@ class MarketDatasource(dispatch.Dispatcher):
 
         self._combine_confirmed_data()
         self._find_start_index()
+        self._find_price_changes()
         self._confirmed = True
 
         self.emit('MARKETDATASOURCE_CONFIRMED',
@@ -326,11 +349,64 @@ class MarketDatasource(dispatch.Dispatcher):
         self._confirmed = False
         self._combined_prices = None
         self._combined_prices_index = None
+        self._combined_price_changes = None
 
         self.emit('MARKETDATASOURCE_UNCONFIRMED',
             datasource=self)
 
 
+    def get_position(self
+    ) -> int:
+        """Return the position of the next entry that `get_next_prices` will
+        serve, which can later be passed to `set_position` to resume from the
+        same entry. Raises `DatasourceUnconfirmedError` if this datasource
+        isn't yet confirmed.
+        """
+        if not self.is_confirmed():
+            raise DatasourceUnconfirmedError()
+        assert self._combined_prices_index is not None, 'Prices index missing'
+
+        return self._combined_prices_index
+
+    def set_position(self,
+        position: int
+    ) -> None:
+        """Seek to a `position` previously returned by `get_position` of a
+        datasource with the same stock symbols. Raises
+        `DatasourcePositionError` if `position` precedes the first entry with
+        all prices or follows the last entry, and raises
+        `DatasourceUnconfirmedError` if this datasource isn't yet confirmed.
+        """
+        if not self.is_confirmed():
+            raise DatasourceUnconfirmedError()
+        assert self._combined_prices is not None, 'Combined prices missing'
+        assert self._combined_price_changes is not None, 'Changes missing'
+
+        if not 0 <= position <= len(self._combined_prices):
+            raise DatasourcePositionError(position)
+        if (position < len(self._combined_prices)
+            and self._combined_price_changes[position] is None
+        ):  # Before all symbols have prices
+            raise DatasourcePositionError(position)
+
+        self._combined_prices_index = position
+
+    def peek_next_time(self
+    ) -> typing.Optional[datetime.datetime]:
+        """Return the time of the entry that `get_next_prices` will serve
+        next without serving it, or `None` if no more remain. Raises
+        `DatasourceUnconfirmedError` if this datasource isn't yet confirmed.
+        """
+        if not self.is_confirmed():
+            raise DatasourceUnconfirmedError()
+        assert self._combined_prices is not None, 'Combined prices missing'
+        assert self._combined_prices_index is not None, 'Prices index missing'
+
+        if self._combined_prices_index >= len(self._combined_prices):
+            return None  # Out of data
+        return self._combined_prices[self._combined_prices_index][0]
+
+
     def get_next_prices(self
     ) -> typing.Optional[typing.Tuple[datetime.datetime, typing.Dict[str, float]]]:
         """Return the next time and set of prices from this datasource, or
@@ -348,3 +424,30 @@ class MarketDatasource(dispatch.Dispatcher):
         next_prices = self._combined_prices[self._combined_prices_index]
         self._combined_prices_index += 1
         return next_prices
+
+    def get_next_price_changes(self
+    ) -> typing.Optional[typing.Tuple[datetime.datetime, typing.Dict[str, float]]]:
+        """Return the next time and set of prices from this datasource, like
+        `get_next_prices`, except that only prices which changed since the
+        previously served entry are included. The first entry includes all
+        prices. Returns `None` if no more entries remain, and raises
+        `DatasourceUnconfirmedError` if this datasource isn't yet confirmed.
+
+        This shares its position with `get_next_prices`, so the two can be
+        called interchangeably.
+        """
+        if not self.is_confirmed():
+            raise DatasourceUnconfirmedError()
+        assert self._combined_prices is not None, 'Combined prices missing'
+        assert self._combined_prices_index is not None, 'Prices index missing'
+        assert self._combined_price_changes is not None, 'Changes missing'
+
+        index = self._combined_prices_index
+        if index >= len(self._combined_prices):
+            return None  # Out of data
+
+        price_changes = self._combined_price_changes[index]
+        assert price_changes is not None, 'Served entry before start index'
+        self._combined_prices_index += 1
+        return CombinedPrices(
+            time=self._combined_prices[index].time, prices=price_changes)
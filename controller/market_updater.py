@@ -5,12 +5,13 @@ __copyright__ = 'Copyright © 2019, Erik Anderson, James Abernathy, and Tyler Ge
 __license__ = 'MIT'
 
 
+import datetime
 import enum
+import threading
+import time
+import types
 import typing
 
-from kivy.clock import (
-    Clock, ClockEvent)
-
 import dispatch
 
 # Local package imports duplicated at end of file to resolve circular dependencies
@@ -21,6 +22,64 @@ if typing.TYPE_CHECKING:
 
 
 
+class TraderSnapshot(typing.NamedTuple):
+    """An immutable summary of a `model.TraderAccount` at one moment."""
+    balance: float
+    """The account's bank balance. See `model.TraderAccount.get_balance`."""
+
+    stocks: typing.Mapping[str, float]
+    """Quantities of shares held, indexed by stock symbol."""
+
+    statistics_daily: typing.Mapping[str, typing.Any]
+    """See `model.TraderAccount.get_statistics_daily`."""
+
+    statistics_overall: typing.Mapping[str, typing.Any]
+    """See `model.TraderAccount.get_statistics_overall`."""
+
+
+class MarketSnapshot(typing.NamedTuple):
+    """An immutable, consistent summary of a simulation at one moment, safe
+    to read from any thread while the simulation continues.
+    """
+    time: typing.Optional[datetime.datetime]
+    """Time of the latest prices, or `None` if the market is empty."""
+
+    prices: typing.Mapping[str, float]
+    """Latest prices indexed by stock symbol."""
+
+    traders: typing.Mapping[str, TraderSnapshot]
+    """Summaries of each trader with an account, indexed by trader name."""
+
+    @classmethod
+    def capture(cls,
+        model: 'SimModel'
+    ) -> 'MarketSnapshot':
+        """Summarize `model`'s current market and trader accounts. The model
+        must not change during the call.
+        """
+        market = model.get_stock_market()
+        time_range = market.get_time_range()
+
+        traders = {}
+        for trader in model.get_traders():
+            account = trader.get_account()
+            if account is not None:
+                traders[trader.get_name()] = TraderSnapshot(
+                    balance=account.get_balance(),
+                    stocks=types.MappingProxyType(account.get_stocks()),
+                    statistics_daily=types.MappingProxyType(
+                        account.get_statistics_daily()),
+                    statistics_overall=types.MappingProxyType(
+                        account.get_statistics_overall()))
+
+        return cls(
+            time=None if time_range is None else time_range[1],
+            prices=types.MappingProxyType(market.get_prices() or {}),
+            traders=types.MappingProxyType(traders))
+
+
+
+
 class UnexpectedDatasourceUnconfirmError(RuntimeError):
     """An exception raised when the `MarketDatasource` becomes unconfirmed
     while the `MarketUpdater` is playing or paused.
@@ -43,7 +102,13 @@ class UnexpectedDatasourceUnconfirmError(RuntimeError):
 class MarketUpdater(dispatch.Dispatcher):
     """Periodically gets data from a price datasource and channels it into the
     `model.StockMarket`. The data flow starts out stopped (called reset), and
-    can be started with `.play()` and paused with `.pause()`.
+    can be started with `.play()` and paused with `.pause()`. While playing,
+    updates are scheduled by an `UpdateClock`, which is Kivy's by default.
+
+    In threaded mode (see `set_threaded`), prices are delivered by a worker
+    thread rather than the clock, and the GUI renders `MarketSnapshot`s
+    handed off by `MARKETUPDATER_SNAPSHOT` events instead. `play`, `pause`,
+    and `reset` may be called from any thread.
     """
 
 
@@ -72,28 +137,155 @@ class MarketUpdater(dispatch.Dispatcher):
     _state: State
     """Status of this updater controlling its activity."""
 
-    _update_timer: typing.Optional[ClockEvent]
-    """A timer updater started by Kivy while playing, or `None` in other
+    _clock: 'UpdateClock'
+    """Schedules periodic updates while playing."""
+
+    _update_timer: typing.Optional['ScheduledUpdate']
+    """A timer updater started by `_clock` while playing, or `None` in other
     states.
     """
 
+    _delta_ticks: bool
+    """When `True`, only prices that changed since the previous update are
+    passed from the datasource into the `model.StockMarket`.
+    """
+
+    _ticks_per_frame: int
+    """Number of prices delivered per clock frame while playing, unless
+    `_frame_budget` is set.
+    """
+
+    _frame_budget: typing.Optional[float]
+    """Seconds of each clock frame to spend delivering prices while playing,
+    or `None` to deliver a fixed `_ticks_per_frame` instead.
+    """
+
+    _tick_cost: typing.Optional[float]
+    """Smoothed measurement of the seconds taken to deliver one price while
+    playing, used to size batches within `_frame_budget`. `None` until
+    measured.
+    """
+
+    _replay_speed: typing.Optional[float]
+    """Multiple of real time to replay prices at while playing, or `None` to
+    deliver them as fast as `_ticks_per_frame` or `_frame_budget` allow.
+    """
+
+    _replay_time_anchor: typing.Optional[datetime.datetime]
+    """Market time that was due at `_replay_clock_anchor` while replaying,
+    or `None` if unknown.
+    """
+
+    _replay_clock_anchor: float
+    """`time.perf_counter` value when `_replay_time_anchor` was due."""
+
+    _speed_ticks: int
+    """Number of prices delivered since `_speed_time_start`."""
+
+    _speed_time_start: float
+    """`time.perf_counter` value when the current speed measurement began.
+    """
+
+    _ticks_per_second: float
+    """Most recently measured speed of delivery while playing."""
+
+    _quiet: bool
+    """`True` while a batch run started with `quiet` delivers prices."""
+
+    _threaded: bool
+    """When `True`, `play` delivers prices from a worker thread."""
+
+    _command_lock: threading.RLock
+    """Serializes `play`, `pause`, and `reset` commands across threads."""
+
+    _model_lock: threading.RLock
+    """Held by the worker thread while it changes the `_model`. See
+    `get_model_lock`.
+    """
+
+    _worker: typing.Optional[threading.Thread]
+    """The thread delivering prices while playing in threaded mode, or
+    `None`.
+    """
+
+    _worker_stop: threading.Event
+    """Set to ask `_worker` to return."""
+
+    _worker_ticks: int
+    """Number of prices `_worker` has delivered since it started."""
+
+    _worker_command: typing.Optional[typing.Callable[[], None]]
+    """A command called from `_worker`, deferred until it returns."""
+
+    _worker_exception: typing.Optional[BaseException]
+    """An exception that stopped `_worker`, to re-raise from the thread
+    that handles its snapshots.
+    """
+
+    _snapshot: typing.Optional[MarketSnapshot]
+    """The latest snapshot taken by `_worker`, or `None`."""
+
+    _snapshot_emitted: typing.Optional[MarketSnapshot]
+    """The last snapshot broadcast with `MARKETUPDATER_SNAPSHOT`."""
+
+    SNAPSHOT_INTERVAL_s: typing.ClassVar[float] = 0.1
+    """Minimum seconds between snapshots taken while playing in threaded
+    mode.
+    """
+
+    SPEED_INTERVAL_s: typing.ClassVar[float] = 0.5
+    """Seconds between measurements of `get_ticks_per_second`."""
+
+    TICK_COST_SMOOTHING: typing.ClassVar[float] = 0.5
+    """Weight of the latest frame's measured cost per price in `_tick_cost`.
+    """
+
     EVENTS: typing.ClassVar[typing.FrozenSet[str]] = frozenset([
+        'MARKETUPDATER_BATCH_FINISHED',
         'MARKETUPDATER_PAUSED',
         'MARKETUPDATER_PLAYING',
-        'MARKETUPDATER_RESET'])
+        'MARKETUPDATER_RESET',
+        'MARKETUPDATER_SNAPSHOT',
+        'MARKETUPDATER_SPEED_CHANGED'])
     """Events broadcast by the `MarketDatasource`."""
 
 
     def __init__(self,
         datasource: 'MarketDatasource',
-        model: 'SimModel'
+        model: 'SimModel',
+        clock: typing.Optional['UpdateClock'] = None
     ) -> None:
-        """Start this new `MarketUpdater` in a reset state."""
+        """Start this new `MarketUpdater` in a reset state. Periodic updates
+        while playing are scheduled by `clock`, or by Kivy's clock if `None`.
+        """
         self._datasource = datasource
         self._model = model
+        self._clock = KivyUpdateClock() if clock is None else clock
 
         self._state = self.State.RESET
         self._update_timer = None
+        self._delta_ticks = False
+        self._ticks_per_frame = 1
+        self._frame_budget = None
+        self._tick_cost = None
+        self._replay_speed = None
+        self._replay_time_anchor = None
+        self._replay_clock_anchor = time.perf_counter()
+        self._speed_ticks = 0
+        self._speed_time_start = time.perf_counter()
+        self._ticks_per_second = 0.0
+
+        self._quiet = False
+        self._threaded = False
+        self._command_lock = threading.RLock()
+        self._model_lock = threading.RLock()
+        self._worker = None
+        self._worker_stop = threading.Event()
+        self._worker_ticks = 0
+        self._worker_command = None
+        self._worker_exception = None
+        self._snapshot = None
+        self._snapshot_emitted = None
 
         datasource.bind(
             MARKETDATASOURCE_UNCONFIRMED=self._on_marketdatasource_unconfirmed)
@@ -106,6 +298,207 @@ class MarketUpdater(dispatch.Dispatcher):
         self.reset()
 
 
+    def get_clock(self
+    ) -> 'UpdateClock':
+        """Return the clock that schedules periodic updates while playing.
+        """
+        return self._clock
+
+    def set_clock(self,
+        clock: 'UpdateClock'
+    ) -> None:
+        """Schedule periodic updates with `clock` from now on. If playing,
+        play resumes on the new clock.
+        """
+        with self._command_lock:
+            playing = self.is_playing()
+            self.pause()
+            self._clock = clock
+            if playing:
+                self.play()
+
+
+    def is_delta_ticks(self
+    ) -> bool:
+        """Return `True` if this updater only passes changed prices into the
+        `model.StockMarket`. See `set_delta_ticks`.
+        """
+        return self._delta_ticks
+
+    def set_delta_ticks(self,
+        delta_ticks: bool
+    ) -> None:
+        """Choose whether to pass only changed prices from the datasource into
+        the `model.StockMarket` (see `StockMarket.add_next_price_changes`),
+        which is faster for datasources with many stock symbols that rarely
+        change at once. Otherwise, complete prices are passed every update.
+        """
+        self._delta_ticks = delta_ticks
+
+
+    def get_ticks_per_frame(self
+    ) -> int:
+        """Return the number of prices delivered each clock frame while
+        playing, unless a frame budget is set. See `set_ticks_per_frame`.
+        """
+        return self._ticks_per_frame
+
+    def set_ticks_per_frame(self,
+        ticks_per_frame: int
+    ) -> None:
+        """Deliver a fixed `ticks_per_frame` prices each clock frame while
+        playing, clearing any frame budget set by `set_frame_budget`.
+        """
+        if ticks_per_frame < 1:
+            raise ValueError('Ticks per frame must be positive.')
+        self._ticks_per_frame = ticks_per_frame
+        self._frame_budget = None
+
+    def get_frame_budget(self
+    ) -> typing.Optional[float]:
+        """Return the seconds of each clock frame spent delivering prices
+        while playing, or `None` if a fixed number of ticks per frame is
+        delivered instead. See `set_frame_budget`.
+        """
+        return self._frame_budget
+
+    def set_frame_budget(self,
+        frame_budget_s: typing.Optional[float]
+    ) -> None:
+        """Deliver as many prices as fit within `frame_budget_s` seconds each
+        clock frame while playing, or return to `get_ticks_per_frame` prices
+        per frame if `None`. Batch sizes adapt to the measured cost of each
+        price, so the GUI keeps drawing frames between batches.
+        """
+        if frame_budget_s is not None and frame_budget_s <= 0:
+            raise ValueError('Frame budget must be positive.')
+        self._frame_budget = frame_budget_s
+
+    def get_replay_speed(self
+    ) -> typing.Optional[float]:
+        """Return the multiple of real time that prices are replayed at while
+        playing, or `None` if not paced. See `set_replay_speed`.
+        """
+        return self._replay_speed
+
+    def set_replay_speed(self,
+        replay_speed: typing.Optional[float]
+    ) -> None:
+        """Pace `play` so that prices are delivered when as much real time
+        has passed as separates their timestamps, divided by `replay_speed`,
+        or deliver them as fast as the ticks per frame or frame budget allow
+        if `None`. Prices are scheduled relative to when play started rather
+        than the previous price, so delays don't accumulate; Late frames
+        catch up by delivering every price that came due, limited to the
+        frame budget if set. If playing, pacing continues from the current
+        market time.
+        """
+        if replay_speed is not None and replay_speed <= 0:
+            raise ValueError('Replay speed must be positive.')
+        with self._command_lock:
+            if self.is_playing():
+                if (self._replay_speed is not None
+                    and self._replay_time_anchor is not None
+                ):  # Continue from the market time currently due
+                    clock_now = time.perf_counter()
+                    self._replay_time_anchor += datetime.timedelta(seconds=
+                        (clock_now - self._replay_clock_anchor)
+                            * self._replay_speed)
+                    self._replay_clock_anchor = clock_now
+                else:
+                    self._anchor_replay()
+            self._replay_speed = replay_speed
+
+    def _anchor_replay(self
+    ) -> None:
+        """Start pacing from the latest delivered prices, or from the next
+        prices if none were delivered yet, as of now.
+        """
+        time_range = self._model.get_stock_market().get_time_range()
+        self._replay_time_anchor = (self._datasource.peek_next_time()
+            if time_range is None else time_range[1])
+        self._replay_clock_anchor = time.perf_counter()
+
+    def _get_replay_delay(self,
+        time_next: datetime.datetime
+    ) -> float:
+        """Return the seconds until prices at `time_next` are due while
+        replaying, which is not positive if they're due already.
+        """
+        if self._replay_time_anchor is None or self._replay_speed is None:
+            return 0.0  # Not replaying
+        return ((time_next - self._replay_time_anchor).total_seconds()
+            / self._replay_speed
+            - (time.perf_counter() - self._replay_clock_anchor))
+
+    def get_ticks_per_second(self
+    ) -> float:
+        """Return the most recently measured rate that prices were delivered
+        while playing, or `0.0` if not playing. Remeasured every
+        `SPEED_INTERVAL_s` seconds, emitting `MARKETUPDATER_SPEED_CHANGED`.
+        """
+        return self._ticks_per_second
+
+    def _set_ticks_per_second(self,
+        ticks_per_second: float
+    ) -> None:
+        """Record a new speed measurement and restart measuring."""
+        self._speed_ticks = 0
+        self._speed_time_start = time.perf_counter()
+        if ticks_per_second != self._ticks_per_second:
+            self._ticks_per_second = ticks_per_second
+            self.emit('MARKETUPDATER_SPEED_CHANGED',
+                updater=self, ticks_per_second=ticks_per_second)
+
+
+    def is_threaded(self
+    ) -> bool:
+        """Return `True` if `play` delivers prices from a worker thread. See
+        `set_threaded`.
+        """
+        return self._threaded
+
+    def set_threaded(self,
+        threaded: bool
+    ) -> None:
+        """Choose whether `play` delivers prices from a worker thread, so
+        slow traders can't delay GUI frames. While the worker plays, the
+        `_model` changes outside of the GUI's thread, so views should render
+        `MarketSnapshot`s from `MARKETUPDATER_SNAPSHOT` events, and changes to
+        the model must hold `get_model_lock`. If playing, play resumes in the
+        new mode.
+        """
+        with self._command_lock:
+            if threaded == self._threaded:
+                return
+            playing = self.is_playing()
+            self.pause()
+            self._threaded = threaded
+            if playing:
+                self.play()
+
+    def is_worker_thread(self
+    ) -> bool:
+        """Return `True` if called from this updater's worker thread, such as
+        by a `model` event handler while playing in threaded mode.
+        """
+        return threading.current_thread() is self._worker
+
+    def get_model_lock(self
+    ) -> threading.RLock:
+        """Return a lock that the worker thread holds while delivering each
+        price in threaded mode. Hold it to change the `model` while playing.
+        """
+        return self._model_lock
+
+    def get_snapshot(self
+    ) -> typing.Optional[MarketSnapshot]:
+        """Return the latest `MarketSnapshot` handed off while playing or
+        paused in threaded mode, or `None` if none was taken since reset.
+        """
+        return self._snapshot
+
+
     def is_playing(self
     ) -> bool:
         """Return `True` if this `MarketUpdater` is updating."""
@@ -116,9 +509,35 @@ class MarketUpdater(dispatch.Dispatcher):
         """Start or resume periodically delivering prices to the
         `model.StockMarket` from the `_controller`'s `MarketDatasource`.
         """
-        if self.is_playing():
-            return  # Already playing
-
+        with self._command_lock:
+            if self.is_playing():
+                return  # Already playing
+
+            self._start_playing()
+            self._anchor_replay()
+            self._tick_cost = None
+            self._speed_ticks = 0
+            self._speed_time_start = time.perf_counter()
+
+            # Resume periodic updates
+            if self._threaded:
+                self._start_worker()
+                self._update_timer = self._clock.schedule_interval(
+                    self._handoff_snapshot, self.SNAPSHOT_INTERVAL_s)
+            else:
+                INTERVAL_s = 0.0  # Once per frame
+                self._update_timer = self._clock.schedule_interval(
+                    self._add_market_prices_from_datasource, INTERVAL_s)
+                # Make first update immediately
+                self._add_market_prices_from_datasource(elapsed=0.0)
+
+
+    def _start_playing(self
+    ) -> None:
+        """Enter the `PLAYING` state from the paused or reset state. Resuming
+        from reset first resets the `model`'s market and trader accounts, and
+        confirms the datasource.
+        """
         if self.is_paused():
             if not self._datasource.is_confirmed():
                 self.reset()
@@ -131,12 +550,115 @@ class MarketUpdater(dispatch.Dispatcher):
         self.emit('MARKETUPDATER_PLAYING',
             updater=self)
 
-        # Resume periodic updates
-        INTERVAL_s = 0.0  # Once per frame
-        self._update_timer = Clock.schedule_interval(
-            self._add_market_prices_from_datasource, INTERVAL_s)
-        # Make first update immediately
-        self._add_market_prices_from_datasource(elapsed=0.0)
+    def run(self,
+        num_ticks: typing.Optional[int] = None,
+        quiet: bool = False
+    ) -> int:
+        """Deliver up to `num_ticks` prices, or all remaining prices if `None`,
+        from the datasource to the `model.StockMarket` as fast as possible,
+        without waiting for a clock. Starts from reset or resumes from paused
+        like `play`, and returns the number of prices delivered once paused
+        again. Any periodic updates from `play` stop first.
+
+        If `quiet`, views should skip rendering each price while `is_quiet`,
+        and instead catch up upon the `MARKETUPDATER_BATCH_FINISHED` event
+        that follows every run.
+
+        Doesn't require Kivy, so simulations can run headless from scripts.
+        """
+        return self._run_batch(num_ticks, None, None, quiet)
+
+    def step(self,
+        num_ticks: int = 1,
+        quiet: bool = False
+    ) -> int:
+        """Deliver the next `num_ticks` prices and pause, returning the number
+        delivered, which is fewer if the datasource runs out. See `run`.
+        """
+        if num_ticks < 1:
+            raise ValueError('Number of ticks to step must be positive.')
+        return self._run_batch(num_ticks, None, None, quiet)
+
+    def run_until(self,
+        time: datetime.datetime,
+        quiet: bool = False
+    ) -> int:
+        """Deliver prices up to and including those at `time` and pause,
+        returning the number delivered. See `run`.
+        """
+        return self._run_batch(None, time, None, quiet)
+
+    def fast_forward(self,
+        duration: datetime.timedelta,
+        quiet: bool = False
+    ) -> int:
+        """Deliver prices until `duration` of market time has passed since the
+        latest delivered prices, or since the first available prices if
+        starting from reset, and pause. Returns the number of prices
+        delivered. See `run`.
+        """
+        return self._run_batch(None, None, duration, quiet)
+
+    def is_quiet(self
+    ) -> bool:
+        """Return `True` while delivering prices in a batch run with `quiet`
+        set, during which views should skip rendering each price. See `run`.
+        """
+        return self._quiet
+
+    def _run_batch(self,
+        num_ticks: typing.Optional[int],
+        time_until: typing.Optional[datetime.datetime],
+        duration: typing.Optional[datetime.timedelta],
+        quiet: bool
+    ) -> int:
+        """Deliver prices in a tight loop until `num_ticks` are delivered, the
+        next prices follow `time_until` or `duration` past the latest prices,
+        or the datasource runs out. Then pause, emit
+        `MARKETUPDATER_BATCH_FINISHED`, and return the number delivered.
+        """
+        with self._command_lock:
+            self.pause()  # Stop periodic updates if playing
+            self._start_playing()
+
+        market = self._model.get_stock_market()
+        if self._delta_ticks:
+            get_next_prices = self._datasource.get_next_price_changes
+            add_next_prices = market.add_next_price_changes
+        else:
+            get_next_prices = self._datasource.get_next_prices
+            add_next_prices = market.add_next_prices
+        peek_next_time = self._datasource.peek_next_time
+
+        if duration is not None:
+            time_range = market.get_time_range()
+            time_start = (peek_next_time() if time_range is None
+                else time_range[1])
+            if time_start is not None:
+                time_until = time_start + duration
+
+        count = 0
+        self._quiet = quiet
+        try:
+            while num_ticks is None or count < num_ticks:
+                if time_until is not None:
+                    time_next = peek_next_time()
+                    if time_next is None or time_next > time_until:
+                        break
+                time_and_prices = get_next_prices()
+                if not time_and_prices:  # Ran out of data
+                    break
+                add_next_prices(*time_and_prices)
+                count += 1
+                if not self.is_playing():  # Paused or reset by a listener
+                    break
+        finally:
+            self._quiet = False
+            self.pause()
+
+        self.emit('MARKETUPDATER_BATCH_FINISHED',
+            updater=self, num_ticks=count)
+        return count
 
 
     def is_paused(self
@@ -151,16 +673,42 @@ class MarketUpdater(dispatch.Dispatcher):
         """Pause this `MarketUpdater`, halting the flow of prices from
         `MarketDatasource` to `model.StockMarket`.
         """
-        if not self.is_playing():
-            return  # No activity to pause
+        if self.is_worker_thread():
+            self._defer_worker_command(self.pause)
+            return
 
-        if self._update_timer is not None:
-            self._update_timer.cancel()
-            self._update_timer = None
+        with self._command_lock:
+            if not self.is_playing():
+                return  # No activity to pause
+
+            if self._update_timer is not None:
+                self._update_timer.cancel()
+                self._update_timer = None
+            self._stop_worker()
+
+            self._state = self.State.PAUSED
+            self._set_ticks_per_second(0.0)
+            self.emit('MARKETUPDATER_PAUSED',
+                updater=self)
 
-        self._state = self.State.PAUSED
-        self.emit('MARKETUPDATER_PAUSED',
-            updater=self)
+
+    def pause_restored(self
+    ) -> None:
+        """Enter the paused state from any state without resetting the
+        `model`'s market, such as after it was restored from a checkpoint.
+        The datasource must already be confirmed so that `play` can resume
+        from it.
+        """
+        with self._command_lock:
+            if self._update_timer is not None:
+                self._update_timer.cancel()
+                self._update_timer = None
+            self._stop_worker()
+
+            self._state = self.State.PAUSED
+            self._set_ticks_per_second(0.0)
+            self.emit('MARKETUPDATER_PAUSED',
+                updater=self)
 
 
     def is_reset(self
@@ -176,39 +724,212 @@ class MarketUpdater(dispatch.Dispatcher):
         trader accounts, and unlocks the datasource. If `force` is specified,
         another reset will occur even if already in the `RESET` state.
         """
-        if self.is_reset() and not force:
-            return  # Already reset
+        if self.is_worker_thread():
+            self._defer_worker_command(lambda: self.reset(force))
+            return
 
-        self.pause()  # Stop updates if playing
+        with self._command_lock:
+            if self.is_reset() and not force:
+                return  # Already reset
 
-        self._state = self.State.RESET
-        self.emit('MARKETUPDATER_RESET',
-            updater=self)
+            self.pause()  # Stop updates if playing
+
+            self._state = self.State.RESET
+            self._snapshot = self._snapshot_emitted = None
+            self.emit('MARKETUPDATER_RESET',
+                updater=self)
 
-        self._model.reset_market_and_trader_accounts()
-        self._datasource.unconfirm()
+            self._model.reset_market_and_trader_accounts()
+            self._datasource.unconfirm()
 
 
     def _add_market_prices_from_datasource(self,
         elapsed: float
     ) -> None:
-        """Pass current prices from the datasource to the model's
-        `StockMarket`. Called periodically by `kivy.clock`.
+        """Pass the next batch of prices from the datasource to the model's
+        `StockMarket`. Called once per frame by `_clock` while playing.
         """
         if not self._datasource.is_confirmed():
             self.reset()
             raise UnexpectedDatasourceUnconfirmError(self.State.PLAYING)
 
-        time_and_prices = self._datasource.get_next_prices()
-        if not time_and_prices:  # Ran out of data
+        replaying = self._replay_speed is not None
+        time_deadline = None
+        if replaying:
+            num_ticks = None  # Deliver every price that came due
+            if self._frame_budget is not None:
+                time_deadline = time.perf_counter() + self._frame_budget
+        elif self._frame_budget is None:
+            num_ticks = self._ticks_per_frame
+        elif self._tick_cost is None or self._tick_cost <= 0.0:
+            num_ticks = 1  # Measure the cost of a single price first
+        else:
+            num_ticks = max(1, int(self._frame_budget / self._tick_cost))
+
+        market = self._model.get_stock_market()
+        if self._delta_ticks:
+            get_next_prices = self._datasource.get_next_price_changes
+            add_next_prices = market.add_next_price_changes
+        else:
+            get_next_prices = self._datasource.get_next_prices
+            add_next_prices = market.add_next_prices
+        peek_next_time = self._datasource.peek_next_time
+
+        time_start = time.perf_counter()
+        count = 0
+        exhausted = False
+        while num_ticks is None or count < num_ticks:
+            if replaying:
+                time_next = peek_next_time()
+                if (time_next is not None
+                    and (self._get_replay_delay(time_next) > 0.0
+                        or (time_deadline is not None
+                            and time.perf_counter() >= time_deadline))
+                ):  # Not due yet, or catch up next frame
+                    break
+            time_and_prices = get_next_prices()
+            if not time_and_prices:  # Ran out of data
+                exhausted = True
+                break
+            add_next_prices(*time_and_prices)
+            count += 1
+            if not self.is_playing():  # Paused or reset by a listener
+                break
+        time_end = time.perf_counter()
+
+        if count:
+            tick_cost = (time_end - time_start) / count
+            self._tick_cost = (tick_cost if self._tick_cost is None
+                else self._tick_cost + self.TICK_COST_SMOOTHING
+                    * (tick_cost - self._tick_cost))
+        self._speed_ticks += count
+        if time_end - self._speed_time_start >= self.SPEED_INTERVAL_s:
+            self._set_ticks_per_second(
+                self._speed_ticks / (time_end - self._speed_time_start))
+
+        if exhausted:
             self.pause()
+
+
+    def _start_worker(self
+    ) -> None:
+        """Start a worker thread that delivers prices until stopped by
+        `_stop_worker` or out of data.
+        """
+        self._worker_stop = threading.Event()
+        self._worker_ticks = 0
+        self._worker_command = None
+        self._worker_exception = None
+        self._worker = threading.Thread(target=self._run_worker,
+            args=(self._worker_stop,), name='MarketUpdater', daemon=True)
+        self._worker.start()
+
+    def _stop_worker(self
+    ) -> None:
+        """Stop and wait for any worker thread, which finishes its current
+        price first, then hand off a final snapshot of where it stopped.
+        """
+        worker = self._worker
+        if worker is None:
             return
+        self._worker_stop.set()
+        worker.join()
+        self._worker = None
+
+        self._snapshot = MarketSnapshot.capture(self._model)
+        self._handoff_snapshot(elapsed=0.0)
 
-        self._model.get_stock_market().add_next_prices(*time_and_prices)
+    def _run_worker(self,
+        stop: threading.Event
+    ) -> None:
+        """Deliver prices from the datasource to the model's `StockMarket`
+        until `stop` is set or the datasource runs out, taking a snapshot at
+        most every `SNAPSHOT_INTERVAL_s`. Runs in the worker thread.
+        """
+        market = self._model.get_stock_market()
+        if self._delta_ticks:
+            get_next_prices = self._datasource.get_next_price_changes
+            add_next_prices = market.add_next_price_changes
+        else:
+            get_next_prices = self._datasource.get_next_prices
+            add_next_prices = market.add_next_prices
+        peek_next_time = self._datasource.peek_next_time
+
+        model_lock = self._model_lock
+        snapshot_time = time.perf_counter()
+        try:
+            while not stop.is_set():
+                if self._replay_speed is not None:
+                    time_next = peek_next_time()
+                    delay = (0.0 if time_next is None
+                        else self._get_replay_delay(time_next))
+                    if delay > 0.0:  # Recheck periodically for speed changes
+                        stop.wait(min(delay, self.SNAPSHOT_INTERVAL_s))
+                        continue
+
+                with model_lock:
+                    time_and_prices = get_next_prices()
+                    if not time_and_prices:  # Ran out of data
+                        break
+                    add_next_prices(*time_and_prices)
+                    self._worker_ticks += 1
+
+                    time_now = time.perf_counter()
+                    if time_now - snapshot_time >= self.SNAPSHOT_INTERVAL_s:
+                        snapshot_time = time_now
+                        self._snapshot = MarketSnapshot.capture(self._model)
+        except BaseException as exception:
+            self._worker_exception = exception
+
+    def _handoff_snapshot(self,
+        elapsed: float
+    ) -> None:
+        """Broadcast the worker's latest snapshot with
+        `MARKETUPDATER_SNAPSHOT`, if it's new, and pause once the worker
+        finishes. Called periodically by `_clock` while playing in
+        threaded mode, so handlers run in the GUI's thread.
+        """
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot is not self._snapshot_emitted:
+            self._snapshot_emitted = snapshot
+            self.emit('MARKETUPDATER_SNAPSHOT',
+                updater=self, snapshot=snapshot)
+
+        worker = self._worker
+        if worker is None:
+            return  # Called by `_stop_worker`
+        time_now = time.perf_counter()
+        if time_now - self._speed_time_start >= self.SPEED_INTERVAL_s:
+            self._set_ticks_per_second(
+                (self._worker_ticks - self._speed_ticks)
+                    / (time_now - self._speed_time_start))
+            self._speed_ticks = self._worker_ticks
+
+        if not worker.is_alive():  # Ran out of data, stopped itself, or failed
+            command = self._worker_command
+            exception = self._worker_exception
+            self.pause()
+            if command is not None:
+                command()
+            if exception is not None:
+                raise exception
+
+    def _defer_worker_command(self,
+        command: typing.Callable[[], None]
+    ) -> None:
+        """Stop the worker thread, which must be calling this, and run
+        `command` from `_handoff_snapshot` once it returns.
+        """
+        self._worker_command = command
+        self._worker_stop.set()
 
 
 
 
 # Imported last to avoid circular dependencies
 from controller.market_datasource import MarketDatasource
+from controller.update_clock import (
+    KivyUpdateClock,
+    ScheduledUpdate,
+    UpdateClock)
 from model.sim_model import SimModel
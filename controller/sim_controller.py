@@ -13,6 +13,7 @@ if typing.TYPE_CHECKING:
     from model.trader import Trader
     from controller.market_datasource import MarketDatasource
     from controller.market_updater import MarketUpdater
+    from controller.update_clock import UpdateClock
 
 
 
@@ -58,14 +59,22 @@ class SimController(object):
 
 
     def __init__(self,
-        model: 'SimModel'
+        model: 'SimModel',
+        updater_class: typing.Optional[typing.Type['MarketUpdater']] = None,
+        clock: typing.Optional['UpdateClock'] = None
     ) -> None:
         """Initialize without a datasource, an updater, and an existing
-        `SimModel` to control.
+        `SimModel` to control. The updater is a `MarketUpdater` unless another
+        `updater_class` is given, such as
+        `controller.async_market_updater.AsyncMarketUpdater` to run on an
+        `asyncio` event loop. Its periodic updates are scheduled by `clock`,
+        or by the updater's default clock if `None` (see
+        `controller.update_clock`).
         """
         self._model = model
         self._datasource = MarketDatasource()
-        self._updater = MarketUpdater(self._datasource, model)
+        self._updater = (updater_class or MarketUpdater)(
+            self._datasource, model, clock)
 
 
     def get_model(self
@@ -91,6 +100,69 @@ class SimController(object):
         return self._updater
 
 
+    def run(self,
+        num_ticks: typing.Optional[int] = None
+    ) -> typing.Dict[str, typing.Dict[str, typing.Any]]:
+        """Run the simulation headless for up to `num_ticks` price updates as
+        fast as possible, starting from reset or resuming from paused. See
+        `MarketUpdater.run`. Returns the overall statistics of each trader
+        with an account, indexed by trader name (see
+        `model.TraderAccount.get_statistics_overall`).
+
+        Raises `controller.market_datasource.DatasourcesMissingError` if
+        starting without any datasource stock symbols.
+        """
+        self._updater.run(num_ticks)
+
+        statistics = {}
+        for trader in self._model.get_traders():
+            account = trader.get_account()
+            if account is not None:
+                statistics[trader.get_name()] = account.get_statistics_overall()
+        return statistics
+
+    def run_to_completion(self
+    ) -> typing.Dict[str, typing.Dict[str, typing.Any]]:
+        """Run the simulation headless until the datasource runs out of
+        prices, and return each trader's overall statistics. See `run`.
+        """
+        return self.run()
+
+
+    def save_checkpoint(self,
+        filename: str
+    ) -> None:
+        """Save the simulation's `StockMarket` history, trader accounts, and
+        datasource position to a checkpoint file named `filename`, which
+        `load_checkpoint` can resume from. Playing updates get paused first.
+        """
+        self._updater.pause()
+
+        datasource_position = (self._datasource.get_position()
+            if self._datasource.is_confirmed() else None)
+        self._model.save_checkpoint(filename, datasource_position)
+
+    def load_checkpoint(self,
+        filename: str
+    ) -> None:
+        """Restore the simulation from a checkpoint file named `filename`
+        previously written by `save_checkpoint`, and leave the
+        `MarketUpdater` paused where the checkpoint was saved. The datasource
+        must have the same stock symbols as when the checkpoint was saved.
+
+        Raises `model.checkpoint.CheckpointFormatError` if the file isn't a
+        valid checkpoint, and `controller.market_datasource.DatasourcesMissingError`
+        if the datasource has no stock symbols.
+        """
+        self._updater.pause()
+        self._datasource.confirm()
+
+        datasource_position = self._model.load_checkpoint(filename)
+        if datasource_position is not None:
+            self._datasource.set_position(datasource_position)
+        self._updater.pause_restored()
+
+
     def add_trader(self,
         name: str,
         initial_funds: typing.Union[float, str],
@@ -133,9 +205,10 @@ class SimController(object):
             algorithm_settings = self._model.get_trader_algorithm_settings_defaults(
                 algorithm)
 
-        return self._model.add_trader(name,
-            float(initial_funds), float(trading_fee),
-            algorithm, algorithm_settings)
+        with self._updater.get_model_lock():
+            return self._model.add_trader(name,
+                float(initial_funds), float(trading_fee),
+                algorithm, algorithm_settings)
 
     def remove_trader(self,
         name: str
@@ -143,7 +216,8 @@ class SimController(object):
         """Remove a `Trader` instance from this `SimModel` by name. If `name`
         does not exist within the simulation, no error occurs.
         """
-        self._model.remove_trader(name)
+        with self._updater.get_model_lock():
+            self._model.remove_trader(name)
 
     def freeze_trader(self,
         name: str,
@@ -159,7 +233,8 @@ class SimController(object):
 
         account = trader.get_account()
         if account is not None:
-            account.freeze(reason)
+            with self._updater.get_model_lock():
+                account.freeze(reason)
 
     def set_trader_initial_funds(self,
         trader_name: str,
@@ -177,7 +252,8 @@ class SimController(object):
         if trader is None:
             raise TraderNotFoundError(trader_name)
 
-        trader.set_initial_funds(float(initial_funds))
+        with self._updater.get_model_lock():
+            trader.set_initial_funds(float(initial_funds))
 
     def set_trader_trading_fee(self,
         trader_name: str,
@@ -193,7 +269,8 @@ class SimController(object):
         if trader is None:
             raise TraderNotFoundError(trader_name)
 
-        trader.set_trading_fee(float(trading_fee))
+        with self._updater.get_model_lock():
+            trader.set_trading_fee(float(trading_fee))
 
     def set_trader_algorithm_settings(self,
         trader_name: str,
@@ -208,7 +285,8 @@ class SimController(object):
         if trader is None:
             raise TraderNotFoundError(trader_name)
 
-        trader.set_algorithm_settings(algorithm_settings)
+        with self._updater.get_model_lock():
+            trader.set_algorithm_settings(algorithm_settings)
 
 
     def validate_trader_algorithm(self,
@@ -289,3 +367,4 @@ from model.sim_model import SimModel
 from model.trader import Trader
 from controller.market_datasource import MarketDatasource
 from controller.market_updater import MarketUpdater
+from controller.update_clock import UpdateClock
@@ -0,0 +1,233 @@
+"""Defines `UpdateClock` and its implementations, which schedule a
+`MarketUpdater`'s periodic updates without tying the controller to a GUI
+toolkit.
+"""
+
+
+__copyright__ = 'Copyright © 2019, Erik Anderson, James Abernathy, and Tyler Gerritsen'
+__license__ = 'MIT'
+
+
+import abc
+import typing
+
+# Imported only when scheduling on an event loop, to keep imports fast
+if typing.TYPE_CHECKING:
+    import asyncio
+
+
+
+
+UpdateCallback = typing.Callable[[float], typing.Any]
+"""A periodic callback passed the seconds elapsed since it was last called."""
+
+
+
+
+class ScheduledUpdate(abc.ABC):
+    """A periodic callback scheduled with an `UpdateClock`."""
+
+    @abc.abstractmethod
+    def cancel(self
+    ) -> None:
+        """Stop calling this update's callback. Has no effect if already
+        cancelled.
+        """
+        raise NotImplementedError
+
+
+
+
+class UpdateClock(abc.ABC):
+    """Calls back periodically to drive a `MarketUpdater` while playing."""
+
+    @abc.abstractmethod
+    def schedule_interval(self,
+        callback: UpdateCallback,
+        interval_s: float
+    ) -> ScheduledUpdate:
+        """Call `callback` every `interval_s` seconds, or as often as this
+        clock ticks if `0.0`, until the returned update gets cancelled.
+        """
+        raise NotImplementedError
+
+
+
+
+class KivyUpdateClock(UpdateClock):
+    """Schedules updates with `kivy.clock.Clock`, once per frame at most.
+    Kivy only gets imported once the first update is scheduled.
+    """
+
+    def schedule_interval(self,
+        callback: UpdateCallback,
+        interval_s: float
+    ) -> ScheduledUpdate:
+        """See `UpdateClock.schedule_interval`. Kivy's `ClockEvent`s already
+        provide `ScheduledUpdate.cancel`.
+        """
+        from kivy.clock import Clock
+        return Clock.schedule_interval(callback, interval_s)
+
+
+
+
+class _AsyncioScheduledUpdate(ScheduledUpdate):
+    """An update that reschedules itself on an `asyncio` event loop."""
+
+    _loop: 'asyncio.AbstractEventLoop'
+    """The loop that calls `_callback`."""
+
+    _callback: UpdateCallback
+    """The scheduled callback."""
+
+    _interval_s: float
+    """Seconds between calls to `_callback`."""
+
+    _time_last: float
+    """Event loop time when `_callback` was last called or scheduled."""
+
+    _handle: typing.Optional['asyncio.Handle']
+    """The loop's handle for the next call, or `None` once cancelled."""
+
+    def __init__(self,
+        loop: 'asyncio.AbstractEventLoop',
+        callback: UpdateCallback,
+        interval_s: float
+    ) -> None:
+        self._loop = loop
+        self._callback = callback
+        self._interval_s = interval_s
+        self._time_last = loop.time()
+        self._handle = loop.call_later(interval_s, self._call)
+
+    def _call(self
+    ) -> None:
+        """Call back and schedule the next call first, in case the callback
+        cancels it.
+        """
+        time_now = self._loop.time()
+        elapsed, self._time_last = time_now - self._time_last, time_now
+        self._handle = self._loop.call_later(self._interval_s, self._call)
+        self._callback(elapsed)
+
+    def cancel(self
+    ) -> None:
+        """See `ScheduledUpdate.cancel`."""
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+
+
+class AsyncioUpdateClock(UpdateClock):
+    """Schedules updates on an `asyncio` event loop, where an interval of
+    `0.0` calls back once per iteration of the loop.
+    """
+
+    _loop: typing.Optional['asyncio.AbstractEventLoop']
+    """The loop to schedule updates on, or `None` for the running loop."""
+
+    def __init__(self,
+        loop: typing.Optional['asyncio.AbstractEventLoop'] = None
+    ) -> None:
+        """Schedule updates on `loop`, or on whichever loop is running when
+        updates get scheduled if `None`.
+        """
+        self._loop = loop
+
+    def schedule_interval(self,
+        callback: UpdateCallback,
+        interval_s: float
+    ) -> ScheduledUpdate:
+        """See `UpdateClock.schedule_interval`."""
+        import asyncio
+        loop = self._loop or asyncio.get_running_loop()
+        return _AsyncioScheduledUpdate(loop, callback, interval_s)
+
+
+
+
+class _ManualScheduledUpdate(ScheduledUpdate):
+    """An update called back by `ManualUpdateClock.advance`."""
+
+    callback: UpdateCallback
+    """The scheduled callback."""
+
+    interval_s: float
+    """Seconds between calls to `callback`."""
+
+    time_last: float
+    """Clock time when `callback` was last called or scheduled."""
+
+    cancelled: bool
+    """`True` once this update has been cancelled."""
+
+    def __init__(self,
+        callback: UpdateCallback,
+        interval_s: float,
+        time: float
+    ) -> None:
+        self.callback = callback
+        self.interval_s = interval_s
+        self.time_last = time
+        self.cancelled = False
+
+    def cancel(self
+    ) -> None:
+        """See `ScheduledUpdate.cancel`."""
+        self.cancelled = True
+
+
+class ManualUpdateClock(UpdateClock):
+    """A clock that only ticks when `advance` is called, for scripts and
+    tests that step simulations deterministically.
+    """
+
+    _time: float
+    """Seconds this clock has been advanced in total."""
+
+    _updates: typing.List[_ManualScheduledUpdate]
+    """Updates that haven't been cancelled, in the order scheduled."""
+
+    def __init__(self
+    ) -> None:
+        self._time = 0.0
+        self._updates = []
+
+    def get_time(self
+    ) -> float:
+        """Return the seconds this clock has been advanced in total."""
+        return self._time
+
+    def has_updates(self
+    ) -> bool:
+        """Return `True` if any scheduled updates weren't cancelled."""
+        return any(not update.cancelled for update in self._updates)
+
+    def schedule_interval(self,
+        callback: UpdateCallback,
+        interval_s: float
+    ) -> ScheduledUpdate:
+        """See `UpdateClock.schedule_interval`."""
+        update = _ManualScheduledUpdate(callback, interval_s, self._time)
+        self._updates.append(update)
+        return update
+
+    def advance(self,
+        seconds: float = 0.0
+    ) -> None:
+        """Move this clock forward by `seconds` and tick once, calling back
+        each update whose interval has passed since it was last called.
+        """
+        if seconds < 0:
+            raise ValueError('Cannot advance a clock backwards.')
+        self._time += seconds
+        for update in list(self._updates):
+            if (not update.cancelled
+                and self._time - update.time_last >= update.interval_s
+            ):
+                elapsed, update.time_last = (self._time - update.time_last,
+                    self._time)
+                update.callback(elapsed)
+        self._updates = [update for update in self._updates
+            if not update.cancelled]
@@ -5,7 +5,12 @@ __copyright__ = 'Original python-dispatch 0.1.2 Copyright © 2016 Matthew Reid'
 __license__ = 'MIT'
 
 
+import abc
+import collections
+import time
+import types
 import typing
+import weakref
 
 
 
@@ -34,13 +39,39 @@ Callbacks can return `False` to halt dispatching to further listeners.
 """
 
 
+_CallbackEntry = typing.Tuple[
+    typing.Optional['weakref.WeakMethod'], typing.Optional[_Callback]]
+"""A registered callback, as either a weak reference to a bound method and
+`None`, or `None` and a strongly-referenced callback.
+"""
+
+
 
 
-def _remove_if_found(collection, entry):
-    try:
-        collection.remove(entry)
-    except (KeyError, ValueError):
-        pass  # Ignore if not found
+def _get_callback_key(
+    callback: _Callback
+) -> typing.Hashable:
+    """Return a key identifying `callback` that doesn't refer to it, since
+    bound methods are recreated on each attribute access and are only held
+    weakly.
+    """
+    if isinstance(callback, types.MethodType):
+        return id(callback.__self__), id(callback.__func__)
+    return callback
+
+
+
+
+def _get_callback_name(
+    callback: _Callback
+) -> str:
+    """Return a readable name for `callback`, shared by bound methods of all
+    instances of the same class.
+    """
+    if isinstance(callback, types.MethodType):
+        return '{}.{}'.format(type(callback.__self__).__qualname__,
+            callback.__func__.__name__)
+    return getattr(callback, '__qualname__', None) or repr(callback)
 
 
 
@@ -48,89 +79,120 @@ def _remove_if_found(collection, entry):
 class _EventListeners(object):
     """Holds references to event names and subscribed listeners.
 
-    This is used internally by :class:`Dispatcher`.
+    This is used internally by :class:`Dispatcher`, though instances can also
+    be called directly as pre-bound emitters of their event. They are falsy
+    while no listeners are subscribed, so that emitters can skip building
+    event arguments nobody will receive.
     """
-    __slots__ = ('name', '_callbacks',
-        '_calling',
-        '_pending_additions', '_pending_removals')
+    __slots__ = ('name', '_callbacks', '_snapshot',
+        '_calling', '_keys_collected')
 
     name: str
 
-    _callbacks: typing.List[_Callback]
-    """All registered callbacks, preserving registration order."""
+    _callbacks: typing.Dict[typing.Hashable, _CallbackEntry]
+    """All registered callbacks indexed by `_get_callback_key`, preserving
+    registration order, so that they can be added, found and removed in
+    constant time.
+    """
+
+    _snapshot: typing.Optional[typing.Tuple[_CallbackEntry, ...]]
+    """An immutable copy of `_callbacks` to dispatch to, or `None` if it must
+    be copied again because callbacks changed. Dispatches in progress keep
+    calling the snapshot they started with, so listeners can subscribe and
+    unsubscribe while calling without any pending changes to apply
+    afterwards.
+    """
 
     _calling: bool
     """`True` while this event dispatches to its listeners."""
 
-    _pending_additions: typing.List[_Callback]
-    """Callbacks to add after `_calling` becomes `False`, preserving
-    registration order.
+    _profile: typing.ClassVar[typing.Optional['DispatchProfile']] = None
+    """Records dispatch latencies of all events while not `None`, when
+    `_call_profiled` replaces `__call__`. See `Dispatcher.set_profile`.
     """
 
-    _pending_removals: typing.Set[_Callback]
-    """Callbacks to remove after `_calling` becomes `False`."""
+    _keys_collected: typing.List[typing.Hashable]
+    """Keys of weakly-referenced callbacks that were garbage collected, to be
+    pruned from `_callbacks` by `_prune`. Collection can happen at any time
+    and on any thread, so entries are only queued for removal then.
+    """
 
 
     def __init__(self,
         name: str
     ) -> None:
         self.name = name
-        self._callbacks = []
+        self._callbacks = {}
+        self._snapshot = ()
 
         self._calling = False
-        self._pending_additions = []
-        self._pending_removals = set()
+        self._keys_collected = []
 
 
-    def add(self,
+    def _reference(self,
+        key: typing.Hashable,
         callback: _Callback
+    ) -> _CallbackEntry:
+        """Return an entry for `callback` that only weakly references it if
+        it's a bound method, queueing `key` to be pruned once collected.
+        """
+        if isinstance(callback, types.MethodType):
+            keys_collected = self._keys_collected
+            try:
+                return weakref.WeakMethod(callback,
+                    lambda reference: keys_collected.append(key)), None
+            except TypeError:
+                pass  # Instance doesn't support weak references
+        return None, callback
+
+
+    def _prune(self
     ) -> None:
-        if not self._calling:
-            if callback not in self._callbacks:
-                self._callbacks.append(callback)
+        """Remove callbacks that were garbage collected."""
+        keys_collected = self._keys_collected
+        while keys_collected:
+            if self._callbacks.pop(keys_collected.pop(), None) is not None:
+                self._snapshot = None
 
-        elif callback not in self._pending_additions:
-            # Add after done calling
-            _remove_if_found(self._pending_removals, callback)
-            if callback not in self._callbacks:
-                self._pending_additions.append(callback)
+
+    def add(self,
+        callback: _Callback,
+        delivery: typing.Optional['Delivery'] = None
+    ) -> None:
+        self._prune()  # Collected instances' IDs can be reused
+        key = _get_callback_key(callback)
+        if key not in self._callbacks:
+            entry = self._reference(key, callback)
+            if delivery is not None:  # Only record events until flushed
+                recorder = delivery._create_recorder(entry)
+                recorder.__qualname__ = '{} ({})'.format(
+                    _get_callback_name(callback), type(delivery).__name__)
+                entry = None, recorder
+            self._callbacks[key] = entry
+            self._snapshot = None
 
 
     def remove(self,
         callback: _Callback
     ) -> None:
-        if not self._calling:
-            _remove_if_found(self._callbacks, callback)
-
-        elif callback not in self._pending_removals:
-            # Remove after done calling
-            _remove_if_found(self._pending_additions, callback)
-            if callback in self._callbacks:
-                self._pending_removals.add(callback)
+        self._prune()
+        if self._callbacks.pop(_get_callback_key(callback), None) is not None:
+            self._snapshot = None
 
 
     def remove_all(self,
     ) -> None:
-        if not self._calling:
-            self._callbacks.clear()
+        self._callbacks.clear()
+        self._keys_collected.clear()
+        self._snapshot = ()
 
-        else:  # Remove all after done calling
-            self._pending_additions.clear()
-            self._pending_removals.update(self._callbacks)
 
-
-    def _apply_pending(self
-    ) -> None:
-        """Applies pending callback additions and removals."""
-        assert not self._calling, \
-            'Cannot apply pending callbacks while calling.'
-
-        for callback in self._pending_removals:
-            self._callbacks.remove(callback)
-        self._pending_removals.clear()
-
-        self._callbacks.extend(self._pending_additions)
-        self._pending_additions.clear()
+    def __len__(self
+    ) -> int:
+        """Return the number of subscribed listeners."""
+        if self._keys_collected:
+            self._prune()
+        return len(self._callbacks)
 
 
     def __call__(self,
@@ -141,21 +203,72 @@ class _EventListeners(object):
 
         Called by :meth:`~Dispatcher.emit`
         """
+        callbacks = self._snapshot
+        if callbacks is None:  # Copied lazily, so binding many stays linear
+            self._prune()
+            callbacks = self._snapshot = tuple(self._callbacks.values())
+        if not callbacks:
+            return True  # Nobody to notify
         if self._calling:
             raise RecursiveDispatchError(self)
 
         self._calling = True
         try:
-            cancelled = False
-            for callback in self._callbacks:
+            for reference, callback in callbacks:
+                if reference is not None:
+                    callback = reference()
+                if callback is None:
+                    continue  # Collected since the snapshot was copied
                 if callback(*args, **kwargs) is False:
-                    # Don't notify any more listeners
-                    cancelled = True
-                    break
-            return not cancelled
+                    return False  # Don't notify any more listeners
+            return True
         finally:
             self._calling = False
-            self._apply_pending()
+
+    _call_unprofiled = __call__
+
+
+    def _call_profiled(self,
+        *args: typing.Any,
+        **kwargs: typing.Any
+    ) -> bool:
+        """Dispatch the event to listeners like `_call_unprofiled`, while
+        recording how long each listener and the whole dispatch take in
+        `_profile`. Replaces `__call__` while profiling.
+        """
+        profile = self._profile
+        if profile is None:  # Stopped profiling from another thread
+            return self._call_unprofiled(*args, **kwargs)
+        perf_counter_ns = time.perf_counter_ns
+        time_start = perf_counter_ns()
+
+        callbacks = self._snapshot
+        if callbacks is None:
+            self._prune()
+            callbacks = self._snapshot = tuple(self._callbacks.values())
+        if not callbacks:
+            profile.record_emit(self.name, perf_counter_ns() - time_start)
+            return True
+        if self._calling:
+            raise RecursiveDispatchError(self)
+
+        self._calling = True
+        try:
+            for reference, callback in callbacks:
+                if reference is not None:
+                    callback = reference()
+                if callback is None:
+                    continue
+                time_callback = perf_counter_ns()
+                result = callback(*args, **kwargs)
+                profile.record_listener(callback,
+                    perf_counter_ns() - time_callback)
+                if result is False:
+                    return False
+            return True
+        finally:
+            self._calling = False
+            profile.record_emit(self.name, perf_counter_ns() - time_start)
 
 
     def __repr__(self
@@ -170,6 +283,373 @@ class _EventListeners(object):
 
 
 
+def _resolve_callback(
+    entry: _CallbackEntry
+) -> typing.Optional[_Callback]:
+    """Return the callback registered as `entry`, or `None` if collected."""
+    reference, callback = entry
+    return callback if reference is None else reference()
+
+
+
+
+class Delivery(abc.ABC):
+    """A policy for listeners bound with `Dispatcher.bind_deferred`, which
+    only record events as they're emitted, so that emitters never wait on
+    them. Recorded events get delivered by `flush`, either on demand or
+    periodically with `flush_every`.
+
+    Events can be recorded from any thread, and get delivered on the thread
+    that calls `flush`. Deferred listeners can't cancel dispatching to other
+    listeners.
+    """
+
+    @abc.abstractmethod
+    def _create_recorder(self,
+        entry: _CallbackEntry
+    ) -> _Callback:
+        """Return a callback that records events for the callback registered
+        as `entry`, to deliver upon `flush`.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def flush(self
+    ) -> int:
+        """Deliver events recorded so far, and return the number of listener
+        calls made.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def clear(self
+    ) -> None:
+        """Discard events recorded so far without delivering them, such as
+        once they're obsolete or after unbinding.
+        """
+        raise NotImplementedError
+
+    def flush_every(self,
+        clock: typing.Any,
+        interval_s: float
+    ) -> typing.Any:
+        """Call `flush` every `interval_s` seconds using `clock`, which can be
+        `kivy.clock.Clock` or an `UpdateClock`, and return the scheduled
+        event for cancelling.
+        """
+        return clock.schedule_interval(lambda elapsed: self.flush(),
+            interval_s)
+
+
+class CoalescedDelivery(Delivery):
+    """Delivers only the latest of each listener's events since the last
+    `flush`, for listeners that display current state.
+    """
+
+    _pending: typing.Dict[_Callback, typing.Tuple[_CallbackEntry,
+        typing.Tuple[typing.Any, ...], typing.Dict[str, typing.Any]]]
+    """The callback entry and latest arguments to deliver, indexed by the
+    recorder of each listener with events pending, in order of each
+    listener's first event since the last `flush`.
+    """
+
+    def __init__(self
+    ) -> None:
+        self._pending = {}
+
+    def _create_recorder(self,
+        entry: _CallbackEntry
+    ) -> _Callback:
+        """See `Delivery._create_recorder`."""
+        pending = self._pending
+        def record(*args: typing.Any, **kwargs: typing.Any) -> None:
+            pending[record] = entry, args, kwargs
+        return record
+
+    def flush(self
+    ) -> int:
+        """See `Delivery.flush`."""
+        pending = self._pending
+        num_calls = 0
+        for record in list(pending):  # Recorders may add more meanwhile
+            try:
+                entry, args, kwargs = pending.pop(record)
+            except KeyError:
+                continue  # Cleared meanwhile
+            callback = _resolve_callback(entry)
+            if callback is not None:
+                callback(*args, **kwargs)
+                num_calls += 1
+        return num_calls
+
+    def clear(self
+    ) -> None:
+        """See `Delivery.clear`."""
+        self._pending.clear()
+
+
+class BatchedDelivery(Delivery):
+    """Delivers every event since the last `flush` in one call per listener,
+    as a `list` of each event's arguments. Keyword arguments are indexed by
+    name, and any positional ones by position.
+    """
+
+    _pending: typing.Deque[typing.Tuple[_CallbackEntry,
+        typing.Dict[typing.Union[str, int], typing.Any]]]
+    """The callback entry and arguments of each event recorded, in order."""
+
+    def __init__(self
+    ) -> None:
+        self._pending = collections.deque()
+
+    def _create_recorder(self,
+        entry: _CallbackEntry
+    ) -> _Callback:
+        """See `Delivery._create_recorder`."""
+        append = self._pending.append
+        def record(*args: typing.Any, **kwargs: typing.Any) -> None:
+            # Each call gets a new `kwargs`, so it can hold positions too
+            event = typing.cast(
+                typing.Dict[typing.Union[str, int], typing.Any], kwargs)
+            if args:
+                event.update(enumerate(args))
+            append((entry, event))
+        return record
+
+    def flush(self
+    ) -> int:
+        """See `Delivery.flush`."""
+        pending = self._pending
+        batches: typing.Dict[int, typing.Tuple[_CallbackEntry,
+            typing.List[typing.Dict[typing.Union[str, int], typing.Any]]]] = {}
+        for _ in range(len(pending)):  # Recorders may add more meanwhile
+            try:
+                entry, event = pending.popleft()
+            except IndexError:
+                break  # Cleared meanwhile
+            batch = batches.get(id(entry))
+            if batch is None:
+                batch = batches[id(entry)] = entry, []
+            batch[1].append(event)
+
+        num_calls = 0
+        for entry, events in batches.values():
+            callback = _resolve_callback(entry)
+            if callback is not None:
+                callback(events)
+                num_calls += 1
+        return num_calls
+
+    def clear(self
+    ) -> None:
+        """See `Delivery.clear`."""
+        self._pending.clear()
+
+
+
+
+class _LatencyStatistics(object):
+    """Accumulates a count and distribution of latencies in nanoseconds."""
+    __slots__ = ('count', 'total', 'maximum', 'histogram')
+
+    SUBDIVISIONS_LOG2: typing.ClassVar[int] = 2
+    """`histogram` divides each power of two into `2 **` this many buckets,
+    bounding percentile errors to about 19%.
+    """
+
+    count: int
+    """Number of latencies recorded."""
+
+    total: int
+    """Sum of all latencies recorded."""
+
+    maximum: int
+    """The longest latency recorded, or `0` if none."""
+
+    histogram: typing.List[int]
+    """Counts of latencies recorded within each bucket, indexed by
+    `_get_bucket`.
+    """
+
+    def __init__(self
+    ) -> None:
+        self.count = self.total = self.maximum = 0
+        self.histogram = [0] * (64 << self.SUBDIVISIONS_LOG2)
+
+    @classmethod
+    def _get_bucket(cls,
+        latency: int
+    ) -> int:
+        """Return the index of the `histogram` bucket containing `latency`,
+        from its highest bits.
+        """
+        num_bits = latency.bit_length()
+        shift = num_bits - 1 - cls.SUBDIVISIONS_LOG2
+        if shift <= 0:
+            return latency  # Small latencies get buckets of their own
+        return (shift + 1 << cls.SUBDIVISIONS_LOG2) + (
+            latency >> shift) - (1 << cls.SUBDIVISIONS_LOG2)
+
+    @classmethod
+    def _get_bucket_maximum(cls,
+        bucket: int
+    ) -> int:
+        """Return the longest latency within `histogram` bucket `bucket`."""
+        shift = (bucket >> cls.SUBDIVISIONS_LOG2) - 1
+        if shift <= 0:
+            return bucket
+        mantissa = bucket - (shift + 1 << cls.SUBDIVISIONS_LOG2) + (
+            1 << cls.SUBDIVISIONS_LOG2)
+        return ((mantissa + 1) << shift) - 1
+
+    def add(self,
+        latency: int
+    ) -> None:
+        """Record one `latency`."""
+        self.count += 1
+        self.total += latency
+        if latency > self.maximum:
+            self.maximum = latency
+        self.histogram[self._get_bucket(latency)] += 1
+
+    def get_percentile(self,
+        percentile: float
+    ) -> int:
+        """Return an upper bound of the latency that `percentile` percent of
+        recorded latencies don't exceed, or `0` if none were recorded.
+        """
+        threshold = self.count * percentile / 100
+        count = 0
+        for bucket, bucket_count in enumerate(self.histogram):
+            count += bucket_count
+            if bucket_count and count >= threshold:
+                return min(self._get_bucket_maximum(bucket), self.maximum)
+        return 0
+
+    def get_statistics(self
+    ) -> typing.Dict[str, typing.Any]:
+        """Return a `dict` of this distribution's statistics, with latencies
+        in seconds.
+        """
+        return {
+            'COUNT': self.count,
+            'TIME_TOTAL': self.total / 1e9,
+            'TIME_MEAN': self.total / self.count / 1e9 if self.count else 0.0,
+            'TIME_P50': self.get_percentile(50) / 1e9,
+            'TIME_P99': self.get_percentile(99) / 1e9,
+            'TIME_MAX': self.maximum / 1e9}
+
+
+class DispatchProfile(object):
+    """Emit counts and latencies of each event, and call counts and
+    latencies of each listener, recorded while installed with
+    `Dispatcher.set_profile`. Listeners are identified by name, so all bound
+    methods of a class share their statistics.
+
+    Emits of events that were never bound count with no latency. Emits that
+    callers skip when there are no listeners, as `StockMarket` and
+    `TraderAccount` do for their most frequent events, aren't counted.
+    Events emitted concurrently from several threads may be miscounted.
+    """
+
+    _events: typing.Dict[str, _LatencyStatistics]
+    """Statistics of whole dispatches, indexed by event name."""
+
+    _listeners: typing.Dict[str, _LatencyStatistics]
+    """Statistics of listener calls, indexed by `_get_callback_name`."""
+
+    _listener_names: typing.Dict[typing.Hashable, str]
+    """Cached names of listeners, indexed by their function or class and
+    function if a bound method.
+    """
+
+    def __init__(self
+    ) -> None:
+        self._events = {}
+        self._listeners = {}
+        self._listener_names = {}
+
+    def record_emit(self,
+        name: str,
+        latency: int
+    ) -> None:
+        """Record that event `name` took `latency` nanoseconds to dispatch."""
+        try:
+            statistics = self._events[name]
+        except KeyError:
+            statistics = self._events[name] = _LatencyStatistics()
+        statistics.add(latency)
+
+    def record_listener(self,
+        callback: _Callback,
+        latency: int
+    ) -> None:
+        """Record that `callback` took `latency` nanoseconds to return."""
+        if isinstance(callback, types.MethodType):
+            key: typing.Hashable = (type(callback.__self__), callback.__func__)
+        else:
+            key = callback
+        try:
+            name = self._listener_names[key]
+        except KeyError:
+            name = self._listener_names[key] = _get_callback_name(callback)
+        try:
+            statistics = self._listeners[name]
+        except KeyError:
+            statistics = self._listeners[name] = _LatencyStatistics()
+        statistics.add(latency)
+
+    def clear(self
+    ) -> None:
+        """Discard all recorded statistics."""
+        self._events.clear()
+        self._listeners.clear()
+
+    def get_event_statistics(self
+    ) -> typing.Dict[str, typing.Dict[str, typing.Any]]:
+        """Return `dict`s of dispatch statistics indexed by event name. Their
+        keys are `'COUNT'` of emits, and `'TIME_TOTAL'`, `'TIME_MEAN'`,
+        `'TIME_P50'`, `'TIME_P99'` and `'TIME_MAX'` latencies in seconds.
+        """
+        return {name: statistics.get_statistics()
+            for name, statistics in list(self._events.items())}
+
+    def get_listener_statistics(self
+    ) -> typing.Dict[str, typing.Dict[str, typing.Any]]:
+        """Return `dict`s of call statistics indexed by listener name, with
+        the same keys as `get_event_statistics`.
+        """
+        return {name: statistics.get_statistics()
+            for name, statistics in list(self._listeners.items())}
+
+    def report(self,
+        limit: typing.Optional[int] = 20
+    ) -> str:
+        """Return human-readable tables of the `limit` events and listeners
+        that took the longest in total, or all of them if `None`.
+        """
+        lines = []
+        for title, statistics in [
+            ('Event', self.get_event_statistics()),
+            ('Listener', self.get_listener_statistics())
+        ]:
+            lines.append('{:<56} {:>10} {:>10} {:>9} {:>9} {:>9} {:>9}'.format(
+                title, 'Count', 'Total ms', 'Mean us', 'P50 us', 'P99 us',
+                'Max us'))
+            ranked = sorted(statistics.items(),
+                key=lambda item: item[1]['TIME_TOTAL'], reverse=True)
+            for name, row in ranked[:limit]:
+                lines.append('{:<56} {:>10,d} {:>10.1f} {:>9.1f} {:>9.1f} '
+                    '{:>9.1f} {:>9.1f}'.format(name[:56], row['COUNT'],
+                        1e3 * row['TIME_TOTAL'], 1e6 * row['TIME_MEAN'],
+                        1e6 * row['TIME_P50'], 1e6 * row['TIME_P99'],
+                        1e6 * row['TIME_MAX']))
+            lines.append('')
+        return '\n'.join(lines[:-1])
+
+
+
+
 class Dispatcher(object):
     """Core class used to enable all functionality in the library.
 
@@ -183,11 +663,20 @@ class Dispatcher(object):
 
     Once defined, an event can be dispatched to listeners by calling :meth:`emit`.
     """
-    __initialized_subclasses: typing.ClassVar[typing.Set[typing.Type['Dispatcher']]] = set()
+    __events_combined: typing.ClassVar[typing.FrozenSet[str]]
+    """Names of all events of a `Dispatcher` subclass, combined from the
+    `EVENTS` of it and its bases when first instantiated.
+    """
 
-    __events_combined: typing.ClassVar[typing.Set[str]]
+    __events: typing.FrozenSet[str]
+    """Names of all events of this instance, shared with its class' set
+    until `register_events` adds more.
+    """
 
     __event_listeners: typing.Dict[str, _EventListeners]
+    """Listeners of events indexed by name, only allocated once first needed,
+    since most events of most instances never get bound.
+    """
 
     EVENTS: typing.ClassVar[typing.FrozenSet[str]]
     """Set of event names broadcast by `Dispatcher` subclasses."""
@@ -197,22 +686,10 @@ class Dispatcher(object):
         *args: typing.Any,
         **kwargs: typing.Any
     ) -> 'Dispatcher':
-        def iter_bases(cls_):
-            if cls_ is not object:
-                yield cls_
-                for base in cls_.__bases__:
-                    for base_cls in iter_bases(base):
-                        yield base_cls
-
-        if cls not in Dispatcher.__initialized_subclasses:
-            events_combined: typing.Set[str] = set()
-            for base_cls in iter_bases(cls):
-                try:
-                    events_combined |= base_cls.EVENTS
-                except AttributeError:
-                    pass
-            cls.__events_combined = events_combined
-            Dispatcher.__initialized_subclasses.add(cls)
+        if '_Dispatcher__events_combined' not in cls.__dict__:
+            cls.__events_combined = frozenset().union(*(
+                base_cls.__dict__.get('EVENTS', ())
+                    for base_cls in cls.__mro__))
 
         new = super(Dispatcher, cls).__new__
         if new is object.__new__:
@@ -220,8 +697,8 @@ class Dispatcher(object):
         else:
             instance = new(cls, *args, **kwargs)  # type: ignore
 
+        instance.__events = cls.__events_combined
         instance.__event_listeners = {}
-        instance.register_events(*cls.__events_combined)
         return instance
 
 
@@ -241,8 +718,7 @@ class Dispatcher(object):
         Args:
             *names (str): Name or names of the events to register
         """
-        self.__event_listeners.update((name, _EventListeners(name))
-            for name in names if name not in self.__event_listeners)
+        self.__events = self.__events.union(names)
 
 
     def bind(self,
@@ -261,11 +737,33 @@ class Dispatcher(object):
             foo.bind(awesome_event=my_listener.on_foo_awesome_event)
             foo.bind(awesome_event=other_listener.on_other_awesome_event)
 
-        The callbacks are stored as weak references and their order is not
-        maintained relative to the order of binding.
+        Bound methods are stored as weak references, so binding them doesn't
+        keep their instances alive, and they get unbound automatically once
+        their instances are garbage collected. Other callbacks, such as
+        functions and closures, are stored as strong references. Callbacks
+        get called in the order they were first bound.
+        """
+        for name, callback in event_callbacks.items():
+            self.get_event_listeners(name).add(callback)
+
+
+    def bind_deferred(self,
+        delivery: Delivery,
+        **event_callbacks: _Callback
+    ) -> None:
+        """Subscribe to events like :meth:`bind`, except that emitting only
+        records events for `delivery` to deliver when flushed, according to
+        its policy. Unbound with :meth:`unbind` like other callbacks::
+
+            delivery = CoalescedDelivery()
+            foo.bind_deferred(delivery,
+                awesome_event=my_listener.on_foo_awesome_event)
+            foo.emit('awesome_event', count=1)
+            foo.emit('awesome_event', count=2)
+            delivery.flush()  # Calls on_foo_awesome_event(count=2)
         """
         for name, callback in event_callbacks.items():
-            self.__event_listeners[name].add(callback)
+            self.get_event_listeners(name).add(callback, delivery)
 
 
     def unbind(self,
@@ -295,8 +793,61 @@ class Dispatcher(object):
             name (str): The name of the event to dispatch
             *args (Optional): Positional arguments to be sent to listeners
             **kwargs (Optional): Keyword arguments to be sent to listeners
+
+        Frequently emitted events can skip this method's lookup by calling
+        the object returned by :meth:`get_event_listeners` directly.
+        """
+        listeners = self.__event_listeners.get(name)
+        if listeners is None:
+            if name not in self.__events:
+                raise KeyError(name)
+            # Never bound, so nobody to notify, but still count it
+            profile = _EventListeners._profile
+            if profile is not None:
+                profile.record_emit(name, 0)
+            return True
+        return listeners(*args, **kwargs)
+
+
+    def get_event_names(self
+    ) -> typing.FrozenSet[str]:
+        """Return the names of all events that this dispatcher can emit,
+        including those of its base classes and from `register_events`.
         """
-        return self.__event_listeners[name](*args, **kwargs)
+        return self.__events
+
+
+    def has_listeners(self,
+        name: str
+    ) -> bool:
+        """Return `True` if any listeners are bound to event `name`, without
+        allocating its :class:`_EventListeners` otherwise. Emitters can
+        check this to skip building arguments of unheard events.
+        """
+        listeners = self.__event_listeners.get(name)
+        return listeners is not None and bool(listeners)
+
+
+    @staticmethod
+    def get_profile(
+    ) -> typing.Optional[DispatchProfile]:
+        """Return the profile recording all dispatches, or `None` if not
+        profiling. See `set_profile`.
+        """
+        return _EventListeners._profile
+
+    @staticmethod
+    def set_profile(
+        profile: typing.Optional[DispatchProfile]
+    ) -> None:
+        """Record counts and latencies of all dispatches and listener calls in
+        `profile` from now on, or stop profiling if `None`. Dispatching runs
+        at full speed while not profiling.
+        """
+        _EventListeners._profile = profile
+        _EventListeners.__call__ = (  # type: ignore
+            _EventListeners._call_unprofiled if profile is None
+                else _EventListeners._call_profiled)
 
 
     def get_event_listeners(self,
@@ -308,11 +859,19 @@ class Dispatcher(object):
             name (str): The name of the :class:`_EventListeners` object to retrieve
 
         Returns:
-            The :class:`_EventListeners` instance for the event definition
+            The :class:`_EventListeners` instance for the event definition,
+            which emits the event when called and is falsy while no listeners
+            are subscribed. It gets allocated on first use.
 
         .. versionadded:: 0.1.0
         """
-        return self.__event_listeners[name]
+        try:
+            return self.__event_listeners[name]
+        except KeyError:
+            if name not in self.__events:
+                raise
+            listeners = self.__event_listeners[name] = _EventListeners(name)
+            return listeners
 
 
 
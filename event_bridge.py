@@ -0,0 +1,629 @@
+"""Defines `EventBridge`, which forwards `Dispatcher` events to another
+process, and `EventReceiver` and `ProxyDispatcher`, which re-emit them there.
+"""
+
+
+__copyright__ = 'Copyright © 2019, Erik Anderson, James Abernathy, and Tyler Gerritsen'
+__license__ = 'MIT'
+
+
+import collections
+import collections.abc
+import datetime
+import multiprocessing.connection
+import pickle
+import threading
+import typing
+import weakref
+
+import dispatch
+
+
+
+
+_PORTABLE_TYPES: typing.Tuple[type, ...] = (bool, int, float, complex, str,
+    bytes, datetime.date, datetime.time, datetime.timedelta)
+"""Types of event arguments that get forwarded as they are."""
+
+_PORTABLE_TYPES_EXACT: typing.FrozenSet[type] = frozenset(
+    _PORTABLE_TYPES + (type(None),))
+"""`_PORTABLE_TYPES` and `NoneType`, for checking the common cases without
+`isinstance`.
+"""
+
+_ACKNOWLEDGEMENT = b'\x06'
+"""Sent back by an `EventReceiver` for each batch that it has re-emitted."""
+
+_END = b''
+"""Sent by `EventBridge.close`, since forked processes that inherited the
+bridge's end of the connection keep the receiver from reaching end of file.
+"""
+
+
+_DispatcherDefinition = typing.Tuple[int, typing.Optional[str], str,
+    typing.Tuple[str, ...]]
+"""A forwarded dispatcher's ID, name if forwarded by name, class name, and
+event names.
+"""
+
+_ForwardedEvent = typing.Tuple[int, str, typing.Tuple[typing.Any, ...],
+    typing.Dict[str, typing.Any]]
+"""The ID of the dispatcher that emitted an event, the event's name, and its
+positional and keyword arguments.
+"""
+
+
+
+
+class _DispatcherReference(typing.NamedTuple):
+    """Stands in for a `Dispatcher` within forwarded event arguments."""
+
+    dispatcher_id: int
+    """The ID that an `EventBridge` assigned to the dispatcher."""
+
+
+
+
+class EventBridgeError(RuntimeError):
+    """An exception raised when an `EventBridge` can no longer reach its
+    `EventReceiver`, such as when the receiving process exits.
+    """
+
+    exception: BaseException
+    """The exception raised by the connection."""
+
+    def __init__(self,
+        exception: BaseException
+    ) -> None:
+        self.exception = exception
+        super().__init__('Event receiver unreachable: {!r}'.format(
+            exception))
+
+
+
+
+class EventBridge(object):
+    """Forwards events of selected dispatchers over a `multiprocessing`
+    connection to an `EventReceiver` in another process, so that slow
+    listeners there never hold up the dispatchers' process.
+
+    Emitting a forwarded event only queues it. Queued events get pickled
+    together into one compact binary message once `get_batch_size` of them
+    are queued, when `flush` is called, or periodically with `flush_every`.
+    At most `get_max_batches_in_flight` messages can await the receiver at
+    once, after which queueing more events blocks until it catches up.
+
+    Event arguments get converted to portable values when flushed, so they
+    must not be changed after emitting. Dispatchers become references to
+    `ProxyDispatcher`s, mappings become `dict`s, other sequences become
+    `list`s or `tuple`s, and any other objects besides `_PORTABLE_TYPES`
+    and exceptions become their `repr`.
+    """
+
+    _connection: multiprocessing.connection.Connection
+    """Connection to the `EventReceiver`."""
+
+    _batch_size: int
+    """Number of queued events that triggers a `flush`."""
+
+    _max_batches_in_flight: int
+    """Number of sent batches that may await acknowledgement at once."""
+
+    _forward_discovered: bool
+    """When `True`, dispatchers first seen in event arguments get all of
+    their events forwarded too.
+    """
+
+    _lock: threading.RLock
+    """Held while flushing, which events may trigger from any thread."""
+
+    _pending: typing.Deque[_ForwardedEvent]
+    """Events queued since the last `flush`, with their original arguments.
+    """
+
+    _definitions: typing.List[_DispatcherDefinition]
+    """Dispatchers assigned IDs since the last `flush`."""
+
+    _dispatcher_ids: 'weakref.WeakKeyDictionary[dispatch.Dispatcher, int]'
+    """IDs of dispatchers that have been forwarded or seen in arguments."""
+
+    _dispatcher_references: typing.Dict[int, 'weakref.ref']
+    """Weak references to dispatchers indexed by ID, which queue their IDs
+    in `_ids_collected` once garbage collected.
+    """
+
+    _next_id: int
+    """ID to assign to the next dispatcher seen."""
+
+    _ids_collected: typing.List[int]
+    """IDs of dispatchers garbage collected since the last `flush`, so that
+    the receiver can discard their proxies.
+    """
+
+    _recorders: typing.Dict[int, typing.List[dispatch._Callback]]
+    """Callbacks bound to forward each dispatcher's events, indexed by ID."""
+
+    _names: typing.Set[str]
+    """Names passed to `forward` so far."""
+
+    _batches_in_flight: int
+    """Number of batches sent but not acknowledged yet."""
+
+    _num_events_sent: int
+    """Number of events sent so far."""
+
+    _num_bytes_sent: int
+    """Total size of all batches sent so far."""
+
+    _closed: bool
+    """`True` once `close` is called."""
+
+
+    def __init__(self,
+        connection: multiprocessing.connection.Connection,
+        batch_size: int = 256,
+        max_batches_in_flight: int = 4,
+        forward_discovered: bool = False
+    ) -> None:
+        """Forward events over `connection` in batches of up to `batch_size`,
+        letting up to `max_batches_in_flight` await the receiver. If
+        `forward_discovered`, dispatchers first seen in forwarded event
+        arguments, such as traders and their accounts, get all of their
+        events forwarded too from then on, like `LoggingView` binds them.
+        Only arguments themselves are searched for dispatchers when queued;
+        those nested in containers are discovered when flushed.
+        """
+        if batch_size < 1:
+            raise ValueError('Batch size must be positive.')
+        if max_batches_in_flight < 1:
+            raise ValueError('At least one batch must be allowed in flight.')
+
+        self._connection = connection
+        self._batch_size = batch_size
+        self._max_batches_in_flight = max_batches_in_flight
+        self._forward_discovered = forward_discovered
+
+        self._lock = threading.RLock()
+        self._pending = collections.deque()
+        self._definitions = []
+        self._dispatcher_ids = weakref.WeakKeyDictionary()
+        self._dispatcher_references = {}
+        self._next_id = 0
+        self._ids_collected = []
+        self._recorders = {}
+        self._names = set()
+
+        self._batches_in_flight = 0
+        self._num_events_sent = self._num_bytes_sent = 0
+        self._closed = False
+
+
+    def get_batch_size(self
+    ) -> int:
+        """Return the number of queued events that triggers a `flush`."""
+        return self._batch_size
+
+    def get_max_batches_in_flight(self
+    ) -> int:
+        """Return the number of sent batches that may await the receiver
+        before queueing more events blocks.
+        """
+        return self._max_batches_in_flight
+
+    def get_num_events_sent(self
+    ) -> int:
+        """Return the number of events sent so far."""
+        return self._num_events_sent
+
+    def get_num_bytes_sent(self
+    ) -> int:
+        """Return the total size in bytes of all batches sent so far."""
+        return self._num_bytes_sent
+
+
+    def forward(self,
+        dispatcher: dispatch.Dispatcher,
+        name: typing.Optional[str] = None,
+        event_names: typing.Optional[typing.Iterable[str]] = None
+    ) -> None:
+        """Forward `dispatcher`'s events named in `event_names`, or all of its
+        events if `None`. If `name` is given, the receiver can look up its
+        proxy with `EventReceiver.get_proxy`. The receiver learns about
+        `dispatcher` immediately, rather than with the next batch.
+        """
+        if self._closed:
+            raise ValueError('Cannot forward events over a closed bridge.')
+        if name is not None:
+            if name in self._names:
+                raise ValueError(
+                    'Already forwarding a dispatcher named {!r}.'.format(name))
+            self._names.add(name)
+
+        with self._lock:
+            dispatcher_id = self._get_dispatcher_id(dispatcher, name)
+            self._bind_recorders(dispatcher, dispatcher_id,
+                dispatcher.get_event_names() if event_names is None
+                    else event_names)
+            self.flush()
+
+    def _get_dispatcher_id(self,
+        dispatcher: dispatch.Dispatcher,
+        name: typing.Optional[str] = None
+    ) -> int:
+        """Return the ID of `dispatcher`, assigning it one and queueing its
+        definition if seen for the first time.
+        """
+        try:
+            return self._dispatcher_ids[dispatcher]
+        except KeyError:
+            pass
+
+        dispatcher_id = self._next_id
+        self._next_id += 1
+        ids_collected = self._ids_collected
+        self._dispatcher_references[dispatcher_id] = weakref.ref(dispatcher,
+            lambda reference: ids_collected.append(dispatcher_id))
+        self._dispatcher_ids[dispatcher] = dispatcher_id
+        self._definitions.append((dispatcher_id, name,
+            type(dispatcher).__qualname__,
+            tuple(sorted(dispatcher.get_event_names()))))
+
+        if name is None and self._forward_discovered:
+            self._bind_recorders(dispatcher, dispatcher_id,
+                dispatcher.get_event_names())
+        return dispatcher_id
+
+    def _bind_recorders(self,
+        dispatcher: dispatch.Dispatcher,
+        dispatcher_id: int,
+        event_names: typing.Iterable[str]
+    ) -> None:
+        """Bind callbacks that queue `dispatcher`'s events named in
+        `event_names` for forwarding.
+        """
+        recorders = self._recorders.setdefault(dispatcher_id, [])
+        for event_name in event_names:
+            recorder = self._create_recorder(dispatcher_id, event_name)
+            dispatcher.bind(**{event_name: recorder})
+            recorders.append(recorder)
+
+    def _create_recorder(self,
+        dispatcher_id: int,
+        event_name: str
+    ) -> dispatch._Callback:
+        """Return a callback that queues event `event_name` of the dispatcher
+        with ID `dispatcher_id`, flushing once a batch is full.
+        """
+        pending = self._pending
+        batch_size = self._batch_size
+        discover = (self._discover_dispatchers if self._forward_discovered
+            else None)
+        def record(*args: typing.Any, **kwargs: typing.Any) -> None:
+            if discover is not None:
+                discover(args)
+                discover(kwargs.values())
+            pending.append((dispatcher_id, event_name, args, kwargs))
+            if len(pending) >= batch_size:
+                self.flush()
+        record.__qualname__ = '{}.forward({})'.format(
+            type(self).__qualname__, event_name)
+        return record
+
+    def _discover_dispatchers(self,
+        values: typing.Iterable[typing.Any]
+    ) -> None:
+        """Start forwarding events of any dispatchers among `values` that
+        haven't been seen yet. Called while queueing the event that carries
+        them, so that none of their own events from before the next `flush`
+        get lost, such as an account's from right after its creation.
+        """
+        dispatcher_ids = self._dispatcher_ids
+        for value in values:
+            if (type(value) not in _PORTABLE_TYPES_EXACT
+                and isinstance(value, dispatch.Dispatcher)
+                and value not in dispatcher_ids
+            ):
+                with self._lock:
+                    self._get_dispatcher_id(value)
+
+
+    def _to_portable(self,
+        value: typing.Any
+    ) -> typing.Any:
+        """Return a copy of `value` that can be sent to the receiver. See the
+        class documentation for how values get converted.
+        """
+        if (type(value) in _PORTABLE_TYPES_EXACT
+            or isinstance(value, _PORTABLE_TYPES)
+        ):
+            return value
+        if isinstance(value, dispatch.Dispatcher):
+            return _DispatcherReference(self._get_dispatcher_id(value))
+        if isinstance(value, collections.abc.Mapping):
+            # Skip converting keys and prices, such as of `StockSymbolPrices`
+            to_portable = self._to_portable
+            return {
+                key if type(key) in _PORTABLE_TYPES_EXACT
+                    else to_portable(key):
+                item if type(item) in _PORTABLE_TYPES_EXACT
+                    else to_portable(item)
+                for key, item in value.items()}
+        if isinstance(value, list):
+            return [self._to_portable(item) for item in value]
+        if isinstance(value, (tuple, collections.abc.Sequence)):
+            return tuple(self._to_portable(item) for item in value)
+        if isinstance(value, (set, frozenset)):
+            return frozenset(self._to_portable(item) for item in value)
+        if isinstance(value, BaseException):
+            try:
+                return pickle.loads(pickle.dumps(value))
+            except Exception:
+                return RuntimeError(repr(value))
+        return repr(value)
+
+    def flush(self
+    ) -> int:
+        """Send all queued events to the receiver as one batch, waiting first
+        if too many batches are in flight, and return the number sent.
+        Raises `EventBridgeError` if the receiver is unreachable.
+        """
+        with self._lock:
+            pending = self._pending
+            events: typing.List[_ForwardedEvent] = []
+            for _ in range(len(pending)):  # Recorders may add more meanwhile
+                dispatcher_id, event_name, args, kwargs = pending.popleft()
+                events.append((dispatcher_id, event_name,
+                    self._to_portable(args), self._to_portable(kwargs)))
+
+            # Collect after converting, which can define dispatchers
+            definitions, self._definitions = self._definitions, []
+            ids_collected = self._ids_collected[:]
+            del self._ids_collected[:len(ids_collected)]
+            for dispatcher_id in ids_collected:
+                self._dispatcher_references.pop(dispatcher_id, None)
+                self._recorders.pop(dispatcher_id, None)
+            if not (events or definitions or ids_collected):
+                return 0
+
+            message = pickle.dumps((definitions, events, ids_collected),
+                pickle.HIGHEST_PROTOCOL)
+            try:
+                self._receive_acknowledgements(
+                    self._max_batches_in_flight - 1)
+                self._connection.send_bytes(message)
+            except (EOFError, OSError) as e:
+                raise EventBridgeError(e) from e
+            self._batches_in_flight += 1
+            self._num_events_sent += len(events)
+            self._num_bytes_sent += len(message)
+            return len(events)
+
+    def _receive_acknowledgements(self,
+        max_batches_in_flight: int
+    ) -> None:
+        """Receive acknowledgements of batches that the receiver finished,
+        waiting until no more than `max_batches_in_flight` remain.
+        """
+        connection = self._connection
+        while self._batches_in_flight and (
+            self._batches_in_flight > max_batches_in_flight
+                or connection.poll()
+        ):
+            connection.recv_bytes()
+            self._batches_in_flight -= 1
+
+    def flush_every(self,
+        clock: typing.Any,
+        interval_s: float
+    ) -> typing.Any:
+        """Call `flush` every `interval_s` seconds using `clock`, which can be
+        `kivy.clock.Clock` or an `UpdateClock`, and return the scheduled
+        event for cancelling.
+        """
+        return clock.schedule_interval(lambda elapsed: self.flush(),
+            interval_s)
+
+
+    def close(self
+    ) -> None:
+        """Send any queued events, stop forwarding, and close the connection
+        once the receiver has caught up, which it then sees as closed.
+        """
+        if self._closed:
+            return
+        with self._lock:
+            self._closed = True
+            for dispatcher, dispatcher_id in list(
+                self._dispatcher_ids.items()
+            ):
+                dispatcher.unbind(*self._recorders.get(dispatcher_id, ()))
+            try:
+                self.flush()
+                self._receive_acknowledgements(0)
+                self._connection.send_bytes(_END)
+            except (EventBridgeError, EOFError, OSError):
+                pass  # Receiver already gone
+            self._recorders.clear()
+            self._connection.close()
+
+
+
+
+class ProxyDispatcher(dispatch.Dispatcher):
+    """Re-emits the events of a dispatcher in another process, as received
+    by an `EventReceiver`. Dispatchers in event arguments are replaced by
+    their proxies too, so listeners can bind to them as usual.
+    """
+
+    _name: typing.Optional[str]
+    """The name this proxy's dispatcher was forwarded with, if any."""
+
+    _class_name: str
+    """The class name of this proxy's dispatcher."""
+
+    def __init__(self,
+        name: typing.Optional[str],
+        class_name: str,
+        event_names: typing.Iterable[str]
+    ) -> None:
+        """Stand in for a dispatcher of class `class_name` that emits events
+        named in `event_names`, and was forwarded with `name` if any.
+        """
+        self._name = name
+        self._class_name = class_name
+        self.register_events(*event_names)
+
+    def get_name(self
+    ) -> typing.Optional[str]:
+        """Return the name this proxy's dispatcher was forwarded with, or
+        `None` if it was only discovered in event arguments.
+        """
+        return self._name
+
+    def get_class_name(self
+    ) -> str:
+        """Return the qualified class name of this proxy's dispatcher."""
+        return self._class_name
+
+    def __repr__(self
+    ) -> str:
+        return '<{} of {}{}>'.format(type(self).__name__, self._class_name,
+            '' if self._name is None else ' {!r}'.format(self._name))
+
+
+
+
+class EventReceiver(object):
+    """Receives events forwarded by an `EventBridge` in another process, and
+    re-emits them from `ProxyDispatcher`s in the order they were emitted.
+    """
+
+    _connection: multiprocessing.connection.Connection
+    """Connection to the `EventBridge`."""
+
+    _proxies: typing.Dict[int, ProxyDispatcher]
+    """Proxies of dispatchers that haven't been garbage collected yet in the
+    sending process, indexed by their IDs.
+    """
+
+    _proxies_named: typing.Dict[str, ProxyDispatcher]
+    """Proxies of dispatchers forwarded with names, indexed by name."""
+
+    _closed: bool
+    """`True` once the bridge has closed the connection."""
+
+
+    def __init__(self,
+        connection: multiprocessing.connection.Connection
+    ) -> None:
+        """Receive events over `connection`, once `receive` is called."""
+        self._connection = connection
+        self._proxies = {}
+        self._proxies_named = {}
+        self._closed = False
+
+
+    def is_closed(self
+    ) -> bool:
+        """Return `True` once the bridge has closed the connection and all of
+        its events have been received.
+        """
+        return self._closed
+
+    def get_proxy(self,
+        name: str,
+        timeout: typing.Optional[float] = None
+    ) -> ProxyDispatcher:
+        """Return the proxy of the dispatcher forwarded as `name`, receiving
+        for up to `timeout` seconds, or indefinitely if `None`, if it hasn't
+        arrived yet. Raises `KeyError` if it doesn't arrive in time.
+        """
+        if name not in self._proxies_named and not self._closed:
+            self.receive(timeout, lambda: name in self._proxies_named)
+        return self._proxies_named[name]
+
+
+    def receive(self,
+        timeout: typing.Optional[float] = 0.0,
+        until: typing.Optional[typing.Callable[[], bool]] = None
+    ) -> int:
+        """Re-emit events from every batch that arrives within `timeout`
+        seconds, or wait indefinitely if `None`, and return the number of
+        events emitted. Stops early once `until` returns `True`, if given.
+        """
+        connection = self._connection
+        num_events = 0
+        while not self._closed and connection.poll(timeout):
+            try:
+                message = connection.recv_bytes()
+            except (EOFError, OSError):
+                message = _END
+            if message == _END:
+                self._closed = True
+                break
+            num_events += self._emit_batch(message)
+            connection.send_bytes(_ACKNOWLEDGEMENT)
+            if until is not None and until():
+                break
+            timeout = 0.0  # Only wait for the first batch
+        return num_events
+
+    def receive_every(self,
+        clock: typing.Any,
+        interval_s: float
+    ) -> typing.Any:
+        """Call `receive` every `interval_s` seconds using `clock`, which can
+        be `kivy.clock.Clock` or an `UpdateClock`, and return the scheduled
+        event for cancelling.
+        """
+        return clock.schedule_interval(lambda elapsed: self.receive(),
+            interval_s)
+
+    def run(self
+    ) -> None:
+        """Receive and re-emit events until the bridge closes the connection.
+        """
+        while not self._closed:
+            self.receive(None)
+        self._connection.close()
+
+    def _emit_batch(self,
+        message: bytes
+    ) -> int:
+        """Re-emit each event in a batch `message`, and return how many."""
+        definitions: typing.List[_DispatcherDefinition]
+        events: typing.List[_ForwardedEvent]
+        ids_collected: typing.List[int]
+        definitions, events, ids_collected = pickle.loads(message)
+
+        for dispatcher_id, name, class_name, event_names in definitions:
+            proxy = ProxyDispatcher(name, class_name, event_names)
+            self._proxies[dispatcher_id] = proxy
+            if name is not None:
+                self._proxies_named[name] = proxy
+
+        for dispatcher_id, event_name, args, kwargs in events:
+            self._proxies[dispatcher_id].emit(event_name,
+                *self._from_portable(args), **self._from_portable(kwargs))
+
+        # Events from before collection came first
+        for dispatcher_id in ids_collected:
+            self._proxies.pop(dispatcher_id, None)
+        return len(events)
+
+    def _from_portable(self,
+        value: typing.Any
+    ) -> typing.Any:
+        """Return a copy of portable `value` with dispatcher references
+        replaced by their proxies.
+        """
+        if isinstance(value, _DispatcherReference):
+            return self._proxies[value.dispatcher_id]
+        if isinstance(value, dict):
+            return {key: self._from_portable(item)
+                for key, item in value.items()}
+        if isinstance(value, list):
+            return [self._from_portable(item) for item in value]
+        if isinstance(value, tuple):
+            return tuple(self._from_portable(item) for item in value)
+        return value
@@ -9,6 +9,9 @@ __license__ = 'MIT'
 import os.path
 import sys
 
+from startup_timer import StartupTimer
+startup_timer = StartupTimer()
+
 def pythonw_disable_std_streams(
 ) -> None:
     """Disable output streams when running in console-less mode on Windows
@@ -36,24 +39,49 @@ os.environ['KIVY_HOME'] = os.path.join(
 
 import kivy
 kivy.require('1.9.0')
+startup_timer.mark('Import Kivy')
 
+from dispatch import DispatchProfile, Dispatcher
 from model.sim_model import SimModel
 from controller.sim_controller import SimController
-from view.logging_view import LoggingView
-from view.window_view import WindowView
+startup_timer.mark('Import model and controller')
+
+
 
 
+MEASURE_STARTUP_FLAG = '--measure-startup'
+"""Command line flag to print the time taken to show the first frame by
+phase, then exit. Pass it after `--` so that Kivy ignores it.
+"""
+
+PROFILE_EVENTS_FLAG = '--profile-events'
+"""Command line flag to print the slowest events and listeners upon exit.
+Pass it after `--` so that Kivy ignores it.
+"""
 
 
 def main() -> None:
     """Program entry point that opens the application window."""
+    if PROFILE_EVENTS_FLAG in sys.argv[1:]:
+        Dispatcher.set_profile(DispatchProfile())
     controller = SimController(SimModel())
+    startup_timer.mark('Create controller')
+
+    # Imported here to time them separately from the model and controller
+    from view.logging_view import LoggingView
+    from view.window_view import WindowView
+    startup_timer.mark('Import views')
 
     logger = LoggingView(controller)
-    window = WindowView(controller)
+    window = WindowView(controller,
+        startup_timer if MEASURE_STARTUP_FLAG in sys.argv[1:] else None)
 
     window.run()
 
+    profile = Dispatcher.get_profile()
+    if profile is not None:
+        print(profile.report())
+
 
 
 
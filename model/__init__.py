@@ -6,9 +6,12 @@ __license__ = 'MIT'
 
 
 from model import (
+    checkpoint,
+    shared_stock_market,
     sim_model,
     stock_market,
     trader,
     trader_account,
+    trader_pool,
 
     algorithms)
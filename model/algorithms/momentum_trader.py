@@ -5,8 +5,8 @@ __copyright__ = 'Copyright © 2019, Erik Anderson, James Abernathy, and Tyler Ge
 __license__ = 'MIT'
 
 
-import typing
 import datetime
+import typing
 
 from model.trader import Trader
 from model.trader_account import TraderAccount
@@ -33,8 +33,20 @@ class MomentumTrader(Trader):
     """
 
 
-    _prices_last: typing.Optional[typing.Dict[str, float]]
-    """Previously seen stock prices used to calculate price changes."""
+    TRADES_ON_PRICE_CHANGES_ONLY: typing.ClassVar[bool] = True
+    """Trading decisions depend only on price changes, so skip idle samples.
+    """
+
+    _prices_last: typing.Optional[typing.List[float]]
+    """Previously seen stock prices indexed by stock symbol ID, used to
+    calculate price changes. Only prices reported as changed by the
+    `StockMarket` get updated, unless samples were missed since.
+    """
+
+    _time_last: typing.Optional[datetime.datetime]
+    """The time of the sample that `_prices_last` was updated for, or `None`
+    if unknown, such as after restoring a checkpoint.
+    """
 
 
     @classmethod
@@ -52,7 +64,7 @@ class MomentumTrader(Trader):
         account = super().create_account()
 
         # Reinitialize
-        self._prices_last = None
+        self._prices_last = self._time_last = None
         return account
 
 
@@ -71,18 +83,19 @@ class MomentumTrader(Trader):
         # given the current balance
         free_balance = account.get_balance() - self.get_trading_fee()
         if free_balance > 0:
-            for stock_symbol in self._choose_symbols_to_buy(price_deltas):
-                price = self.get_stock_market().get_stock_symbol_price(stock_symbol)
+            for stock_symbol_id in self._choose_symbols_to_buy(price_deltas):
+                price = self.get_stock_market().get_stock_symbol_price_by_id(
+                    stock_symbol_id)
                 quantity = free_balance / price
 
-                account.buy(stock_symbol, quantity)
+                account.buy_by_id(stock_symbol_id, quantity)
                 break
 
         # sell everything that is depreciating
-        owned_stocks = account.get_stocks()
-        for stock_symbol in self._choose_symbols_to_sell(price_deltas):
-            if stock_symbol in owned_stocks and owned_stocks[stock_symbol]:
-                account.sell(stock_symbol, owned_stocks[stock_symbol])
+        owned_stocks = account.get_stocks_by_id()
+        for stock_symbol_id in self._choose_symbols_to_sell(price_deltas):
+            if owned_stocks.get(stock_symbol_id):
+                account.sell_by_id(stock_symbol_id, owned_stocks[stock_symbol_id])
 
 
     def set_algorithm_settings(self,
@@ -104,43 +117,75 @@ class MomentumTrader(Trader):
         self._set_algorithm_settings(algorithm_settings)
 
 
+    def get_checkpoint_state(self
+    ) -> typing.Any:
+        """Return previously seen prices that the next trade compares with."""
+        return self._prices_last
+
+    def restore_checkpoint_state(self,
+        state: typing.Any
+    ) -> None:
+        """Restore previously seen prices from a checkpoint."""
+        self._prices_last = state
+        self._time_last = None  # Compare all prices next time
+
+
     def _calculate_price_deltas(self
-    ) -> typing.Dict[str, float]:
+    ) -> typing.Dict[int, float]:
         """Calculates the difference between current stock prices and those
-        seen during the last call.
+        seen during the last call, indexed by stock symbol ID. Stock symbols
+        with unchanged prices are omitted.
+
+        Only prices that changed since the previous sample get compared if
+        the last call was for that sample. Otherwise, samples were missed,
+        such as those skipped as idle or added without announcing them, so
+        all prices get compared.
         """
-        prices_current = self.get_stock_market().get_prices()
-        assert prices_current is not None, 'Stock market prices missing'
+        market = self.get_stock_market()
+        time_range = market.get_time_range()
+        assert time_range is not None, 'Stock market prices missing'
+        time_last, self._time_last = self._time_last, time_range[1]
+        if self._prices_last is None:  # First data point
+            self._prices_last = market.get_prices_by_id()
+            return {}
 
         price_deltas = {}
-        for stock_symbol, price_current in prices_current.items():
-            if self._prices_last is None:  # First data point
-                price_delta = 0.0
-            else:
-                price_delta = price_current - self._prices_last[stock_symbol]
-            price_deltas[stock_symbol] = price_delta
-
-        self._prices_last = prices_current
+        prices_last = self._prices_last
+        if time_last is not None and time_last == market.get_time_previous():
+            for stock_symbol_id in market.get_price_changes_by_id():
+                price_current = market.get_stock_symbol_price_by_id(
+                    stock_symbol_id)
+                price_deltas[stock_symbol_id] = (
+                    price_current - prices_last[stock_symbol_id])
+                prices_last[stock_symbol_id] = price_current
+        else:
+            prices = market.get_prices_by_id()
+            for stock_symbol_id, price_current in enumerate(prices):
+                if price_current != prices_last[stock_symbol_id]:
+                    price_deltas[stock_symbol_id] = (
+                        price_current - prices_last[stock_symbol_id])
+            self._prices_last = prices
         return price_deltas
 
     def _choose_symbols_to_buy(self,
-        price_deltas: typing.Dict[str, float]
-    ) -> typing.List[str]:
+        price_deltas: typing.Dict[int, float]
+    ) -> typing.List[int]:
         """Rank all symbols first to last based on which ones would be the best
-        buying investment, and return a list of symbols for the result.
+        buying investment, and return a list of stock symbol IDs for the
+        result.
         """
-        return [stock_symbol
-            for stock_symbol, price_delta
+        return [stock_symbol_id
+            for stock_symbol_id, price_delta
                 in sorted(price_deltas.items(), reverse=True,
                     key=lambda symbol_and_delta: symbol_and_delta[1])
                 if price_delta > 0]
 
     def _choose_symbols_to_sell(self,
-        price_deltas: typing.Dict[str, float]
-    ) -> typing.List[str]:
-        """Return a list of stock symbols that should be sold."""
+        price_deltas: typing.Dict[int, float]
+    ) -> typing.List[int]:
+        """Return a list of stock symbol IDs that should be sold."""
         LOSS_THRESHOLD = -0.1  # Sell if delta goes at least this low
 
-        return [stock_symbol
-            for stock_symbol, price_delta in price_deltas.items()
+        return [stock_symbol_id
+            for stock_symbol_id, price_delta in price_deltas.items()
                 if price_delta <= LOSS_THRESHOLD]
@@ -0,0 +1,196 @@
+"""Defines `Checkpoint` and functions to read and write it as a snapshot file.
+"""
+
+
+__copyright__ = 'Copyright © 2019, Erik Anderson, James Abernathy, and Tyler Gerritsen'
+__license__ = 'MIT'
+
+
+import array
+import datetime
+import json
+import mmap
+import os
+import struct
+import sys
+import typing
+
+
+
+
+_MAGIC = b'EMCKPT\r\n'
+"""Bytes identifying checkpoint files, including line endings that reveal
+text-mode corruption.
+"""
+
+_VERSION = 1
+"""Checkpoint format version written by `write_checkpoint`."""
+
+_HEADER = struct.Struct('<8sHBxIQQQ')
+"""Fixed-size header preceding all checkpoint contents, with fields: magic
+bytes, format version, byte order (`0` for little-endian), stock symbol
+count, sample count, metadata length, and the offset of sample data.
+"""
+
+_ALIGNMENT = 8
+"""Byte alignment of sample data arrays, matching their item sizes."""
+
+_EPOCH = datetime.datetime(1970, 1, 1)
+"""Reference point that sample times are stored relative to."""
+
+_MICROSECOND = datetime.timedelta(microseconds=1)
+
+
+
+
+class CheckpointFormatError(ValueError):
+    """An exception raised when reading a file that isn't a valid checkpoint
+    for this platform.
+    """
+
+    filename: str
+    """The name of the file that could not be read."""
+
+    def __init__(self,
+        filename: str,
+        reason: str
+    ) -> None:
+        self.filename = filename
+        super().__init__('Cannot read checkpoint {!r}: {}'.format(
+            filename, reason))
+
+
+
+
+class Checkpoint(typing.NamedTuple):
+    """The contents of a checkpoint file. Price rows read from a file are
+    read-only `memoryview`s that share the file's memory map.
+    """
+    stock_symbols: typing.List[str]
+    """Stock symbols indexed by ID."""
+
+    times: typing.List[datetime.datetime]
+    """Sample times in chronological order."""
+
+    price_rows: typing.List[typing.Sequence[float]]
+    """Prices at each of `times`, indexed by stock symbol ID."""
+
+    metadata: typing.Dict[str, typing.Any]
+    """Other JSON-compatible state saved with the samples."""
+
+
+
+
+def time_to_microseconds(
+    time: datetime.datetime
+) -> int:
+    """Convert a naive `time` to a count of microseconds since the epoch."""
+    return (time - _EPOCH) // _MICROSECOND
+
+def microseconds_to_time(
+    microseconds: int
+) -> datetime.datetime:
+    """Convert a count of microseconds since the epoch to a naive `datetime`.
+    """
+    return _EPOCH + datetime.timedelta(microseconds=microseconds)
+
+
+
+
+def write_checkpoint(
+    filename: str,
+    checkpoint: Checkpoint
+) -> None:
+    """Save `checkpoint` to a snapshot file named `filename`, replacing any
+    existing file. Sample times must be naive `datetime`s.
+
+    The snapshot gets written to a temporary file that then replaces
+    `filename`, so rows still mapped from an existing checkpoint of the same
+    name keep their contents on POSIX systems. Windows can't replace mapped
+    files, so such rows must be copied first, as by
+    `StockMarket.copy_mapped_history`.
+    """
+    stock_symbols = checkpoint.stock_symbols
+    metadata = dict(checkpoint.metadata, STOCK_SYMBOLS=stock_symbols)
+    metadata_bytes = json.dumps(metadata).encode('utf_8')
+
+    data_offset = _HEADER.size + len(metadata_bytes)
+    padding = -data_offset % _ALIGNMENT
+    data_offset += padding
+
+    times = array.array('q', map(time_to_microseconds, checkpoint.times))
+    prices = array.array('d')
+    for row in checkpoint.price_rows:
+        if len(row) != len(stock_symbols):
+            raise ValueError('Price rows must include every stock symbol.')
+        prices.extend(row)
+
+    # In the same directory, so that it can be renamed, and with the usual
+    # permissions, unlike from `tempfile.mkstemp`
+    filename_temporary = '{}.{:d}.tmp'.format(filename, os.getpid())
+    try:
+        with open(filename_temporary, 'wb') as stream:
+            stream.write(_HEADER.pack(_MAGIC, _VERSION,
+                0 if sys.byteorder == 'little' else 1, len(stock_symbols),
+                len(times), len(metadata_bytes), data_offset))
+            stream.write(metadata_bytes)
+            stream.write(bytes(padding))
+            times.tofile(stream)
+            prices.tofile(stream)
+        os.replace(filename_temporary, filename)
+    except BaseException:
+        if os.path.exists(filename_temporary):
+            os.remove(filename_temporary)
+        raise
+
+
+def read_checkpoint(
+    filename: str
+) -> Checkpoint:
+    """Memory-map the snapshot file named `filename` and return its contents.
+    Price data is not copied or parsed; Each price row is a view into the
+    mapped file, which stays open as long as any row is referenced.
+
+    Raises `CheckpointFormatError` if the file isn't a compatible checkpoint.
+    """
+    with open(filename, 'rb') as stream:
+        try:
+            mapping = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError as e:  # Empty file
+            raise CheckpointFormatError(filename, 'File is empty.') from e
+
+    try:
+        (magic, version, byte_order, num_symbols, num_times, metadata_length,
+            data_offset) = _HEADER.unpack_from(mapping)
+    except struct.error as e:
+        mapping.close()
+        raise CheckpointFormatError(filename, 'Header is truncated.') from e
+
+    reason = None
+    data_length = num_times * (1 + num_symbols) * _ALIGNMENT
+    if magic != _MAGIC:
+        reason = 'Not a checkpoint file.'
+    elif version != _VERSION:
+        reason = 'Unsupported format version {:d}.'.format(version)
+    elif byte_order != (0 if sys.byteorder == 'little' else 1):
+        reason = 'Saved on a platform with a different byte order.'
+    elif len(mapping) < data_offset + data_length:
+        reason = 'Sample data is truncated.'
+    if reason is not None:
+        mapping.close()
+        raise CheckpointFormatError(filename, reason)
+
+    metadata = json.loads(
+        mapping[_HEADER.size:_HEADER.size + metadata_length].decode('utf_8'))
+    stock_symbols = metadata.pop('STOCK_SYMBOLS')
+
+    data = memoryview(mapping)[data_offset:data_offset + data_length]
+    times_end = num_times * _ALIGNMENT
+    times = list(map(microseconds_to_time, data[:times_end].cast('q')))
+    prices = data[times_end:].cast('d')
+    price_rows: typing.List[typing.Sequence[float]] = [
+        prices[index * num_symbols:(index + 1) * num_symbols]
+            for index in range(num_times)]
+
+    return Checkpoint(stock_symbols=stock_symbols, times=times,
+        price_rows=price_rows, metadata=metadata)
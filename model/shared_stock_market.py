@@ -0,0 +1,466 @@
+"""Defines `SharedStockMarket`, which mirrors its price history into shared
+memory, and `SharedStockMarketView` for reading it from other processes.
+"""
+
+
+__copyright__ = 'Copyright © 2019, Erik Anderson, James Abernathy, and Tyler Gerritsen'
+__license__ = 'MIT'
+
+
+import array
+import datetime
+import typing
+from multiprocessing import shared_memory
+
+from model.checkpoint import microseconds_to_time, time_to_microseconds
+from model.stock_market import RetentionPolicyError, StockMarket
+
+
+
+
+_HEADER_FIELDS = 6
+"""Number of `int64` header fields at the start of a shared segment."""
+
+_TICK_COUNT = 0
+"""Header field counting every sample published since the segment was created.
+Only ever increases, and is updated after each sample is completely written.
+"""
+
+_TICK_OLDEST = 1
+"""Header field holding the tick of the oldest retained sample. Only ever
+increases, and is updated before a sample's slot gets overwritten.
+"""
+
+_CAPACITY = 2
+"""Header field holding the number of sample slots in the segment."""
+
+_MAX_STOCK_SYMBOLS = 3
+"""Header field holding the number of prices that each sample slot fits."""
+
+_NUM_STOCK_SYMBOLS = 4
+"""Header field holding the current number of stock symbols."""
+
+_STOCK_SYMBOLS_LENGTH = 5
+"""Header field holding the encoded length of the stock symbol table."""
+
+_STOCK_SYMBOL_BYTES = 32
+"""Room reserved in the stock symbol table for each stock symbol."""
+
+_ITEM_SIZE = 8
+"""Size in bytes of each header field, time, and price."""
+
+
+
+
+class SharedCapacityError(ValueError):
+    """An exception raised when a `SharedStockMarket`'s history or stock
+    symbols would not fit in its fixed-size shared memory segment.
+    """
+
+    capacity: int
+    """The maximum amount that fits in the shared memory segment."""
+
+    def __init__(self,
+        what: str,
+        capacity: int
+    ) -> None:
+        self.capacity = capacity
+        super().__init__(
+            'Shared stock market cannot fit more than {:d} {}.'.format(
+                capacity, what))
+
+
+class SharedTickUnavailableError(LookupError):
+    """An exception raised when a `SharedStockMarketView` is asked for a sample
+    that hasn't been published yet or that was already overwritten.
+    """
+
+    tick: int
+    """The requested tick that is unavailable."""
+
+    tick_oldest: int
+    """The oldest tick that was available."""
+
+    tick_count: int
+    """The number of ticks published when the request was made."""
+
+    def __init__(self,
+        tick: int,
+        tick_oldest: int,
+        tick_count: int
+    ) -> None:
+        self.tick = tick
+        self.tick_oldest = tick_oldest
+        self.tick_count = tick_count
+        super().__init__('Tick {:d} is unavailable; Only ticks {:d} through '
+            '{:d} can be read.'.format(
+                tick, tick_oldest, tick_count - 1))
+
+
+
+
+class _SharedSegment(object):
+    """Typed views over a shared memory segment's header, times, prices, and
+    stock symbol table.
+    """
+
+    memory: shared_memory.SharedMemory
+    """The mapped shared memory segment."""
+
+    header: memoryview
+    """The segment's `int64` header fields."""
+
+    times: memoryview
+    """Sample times in microseconds since the epoch, by slot."""
+
+    prices: 'memoryview[float]'
+    """Sample prices by slot and then by stock symbol ID."""
+
+    stock_symbols: memoryview
+    """The newline-separated UTF-8 stock symbol table."""
+
+    def __init__(self,
+        memory: shared_memory.SharedMemory,
+        capacity: int,
+        max_stock_symbols: int,
+        readonly: bool
+    ) -> None:
+        self.memory = memory
+        buffer = memory.buf
+        assert buffer is not None, 'Shared memory already closed'
+        if readonly:
+            buffer = buffer.toreadonly()
+
+        offset = _HEADER_FIELDS * _ITEM_SIZE
+        self.header = buffer[:offset].cast('q')
+        end = offset + capacity * _ITEM_SIZE
+        self.times = buffer[offset:end].cast('q')
+        offset, end = end, end + capacity * max_stock_symbols * _ITEM_SIZE
+        self.prices = buffer[offset:end].cast('d')
+        self.stock_symbols = buffer[
+            end:end + max_stock_symbols * _STOCK_SYMBOL_BYTES]
+
+    @staticmethod
+    def get_size(
+        capacity: int,
+        max_stock_symbols: int
+    ) -> int:
+        """Return the number of bytes needed for a segment's contents."""
+        return (_HEADER_FIELDS * _ITEM_SIZE + capacity * _ITEM_SIZE
+            + capacity * max_stock_symbols * _ITEM_SIZE
+            + max_stock_symbols * _STOCK_SYMBOL_BYTES)
+
+    def close(self
+    ) -> None:
+        """Release all views, and then the segment's memory map."""
+        for view in (self.header, self.times, self.prices, self.stock_symbols):
+            view.release()
+        self.memory.close()
+
+
+
+
+class SharedStockMarket(StockMarket):
+    """A `StockMarket` that also publishes its retained history to a shared
+    memory segment, which `SharedStockMarketView`s in other processes can
+    attach to by name and read without pickling prices each tick.
+
+    Samples are published into a ring of fixed-size slots in the order they
+    are added, each identified by a tick number that keeps increasing even
+    across `clear`. Readers can observe the segment's tick count to detect new
+    samples. Since the segment can't grow, a retention limit of `max_ticks`
+    samples is required, and at most `max_stock_symbols` stock symbols are
+    supported.
+
+    Only the process that created the market may modify it. Call `close`
+    when finished to free the shared segment.
+    """
+
+    _segment: _SharedSegment
+    """The shared memory segment that history is published to."""
+
+    _tick_count: int
+    """The number of samples published since the segment was created."""
+
+    _published_time: typing.Optional[datetime.datetime]
+    """The time of the newest published sample, or `None` if the segment holds
+    no samples since the last `clear` or `restore_history`.
+    """
+
+    _published_stock_symbol_ids: typing.Optional[typing.Dict[str, int]]
+    """The market's stock symbol table when history was last published, which
+    gets replaced by `clear` and `restore_history`.
+    """
+
+
+    def __init__(self,
+        max_ticks: int,
+        max_stock_symbols: int,
+        max_timespan: typing.Optional[datetime.timedelta] = None,
+        name: typing.Optional[str] = None
+    ) -> None:
+        """Create a shared memory segment named `name`, or with a unique name
+        if `None`, that fits `max_ticks` samples of up to `max_stock_symbols`
+        prices each. See `StockMarket.set_retention` for details on the
+        `max_ticks` and `max_timespan` retention limits.
+        """
+        if max_ticks is None or max_ticks <= 0:
+            raise RetentionPolicyError(max_ticks, max_timespan)
+
+        # One spare slot lets readers finish with the oldest retained sample
+        # while the newest gets written.
+        capacity = max_ticks + 1
+        memory = shared_memory.SharedMemory(name=name, create=True,
+            size=_SharedSegment.get_size(capacity, max_stock_symbols))
+        self._segment = _SharedSegment(memory,
+            capacity, max_stock_symbols, readonly=False)
+        header = self._segment.header
+        header[_CAPACITY] = capacity
+        header[_MAX_STOCK_SYMBOLS] = max_stock_symbols
+
+        self._tick_count = 0
+        self._published_time = None
+        self._published_stock_symbol_ids = None
+        super().__init__(max_ticks, max_timespan)
+
+
+    def get_shared_name(self
+    ) -> str:
+        """Return the name of this market's shared memory segment, which
+        `SharedStockMarketView`s attach to.
+        """
+        return self._segment.memory.name
+
+    def get_tick_count(self
+    ) -> int:
+        """Return the number of samples published since this market was
+        created, which is also the tick of the next sample.
+        """
+        return self._tick_count
+
+    def close(self
+    ) -> None:
+        """Release and destroy this market's shared memory segment. Attached
+        views remain readable until they close too, but this market can no
+        longer be modified.
+        """
+        memory = self._segment.memory
+        self._segment.close()
+        memory.unlink()
+
+
+    def set_retention(self,
+        max_ticks: typing.Optional[int] = None,
+        max_timespan: typing.Optional[datetime.timedelta] = None
+    ) -> None:
+        """Change retention limits like `StockMarket.set_retention`, except
+        that `max_ticks` is required. Raises `SharedCapacityError` if it
+        exceeds the number of samples this market's segment was created for.
+        """
+        capacity = self._segment.header[_CAPACITY] - 1
+        if max_ticks is None or max_ticks > capacity:
+            raise SharedCapacityError('price samples', capacity)
+        super().set_retention(max_ticks, max_timespan)
+
+    def _freeze_stock_symbols(self,
+        stock_symbols: typing.Iterable[str]
+    ) -> None:
+        """Assign IDs to `stock_symbols` in iteration order. Raises
+        `SharedCapacityError` if they don't fit in the shared segment.
+        """
+        stock_symbols = list(stock_symbols)
+        max_stock_symbols = self._segment.header[_MAX_STOCK_SYMBOLS]
+        if len(stock_symbols) > max_stock_symbols:
+            raise SharedCapacityError('stock symbols', max_stock_symbols)
+        if len(self._encode_stock_symbols(stock_symbols)) > len(
+            self._segment.stock_symbols
+        ):
+            raise SharedCapacityError('bytes of stock symbols',
+                len(self._segment.stock_symbols))
+        super()._freeze_stock_symbols(stock_symbols)
+
+    @staticmethod
+    def _encode_stock_symbols(
+        stock_symbols: typing.List[str]
+    ) -> bytes:
+        """Return the shared segment's encoding of `stock_symbols`."""
+        return '\n'.join(stock_symbols).encode('utf_8')
+
+
+    def _publish_history(self
+    ) -> None:
+        """Write samples retained since the last call into the shared segment,
+        and advance its tick count past each one. The oldest retained tick
+        advances past each sample before its slot gets reused, so readers
+        never accept a slot that was overwritten mid-read.
+        """
+        header = self._segment.header
+        if self._stock_symbol_ids is not self._published_stock_symbol_ids:
+            # Cleared or restored, so republish everything
+            self._published_stock_symbol_ids = self._stock_symbol_ids
+            self._published_time = None
+            header[_NUM_STOCK_SYMBOLS] = -1  # Rewrite stock symbols below
+
+        if header[_NUM_STOCK_SYMBOLS] != len(self._stock_symbols):
+            encoded = self._encode_stock_symbols(self._stock_symbols)
+            self._segment.stock_symbols[:len(encoded)] = encoded
+            header[_STOCK_SYMBOLS_LENGTH] = len(encoded)
+            header[_NUM_STOCK_SYMBOLS] = len(self._stock_symbols)
+
+        if self._published_time is None:
+            index = 0
+        else:
+            index = self._bisect_time(self._published_time)
+
+        length = self._history_length
+        if index < length:
+            times, prices = self._segment.times, self._segment.prices
+            capacity = header[_CAPACITY]
+            max_stock_symbols = header[_MAX_STOCK_SYMBOLS]
+            num_stock_symbols = len(self._stock_symbols)
+            for index in range(index, length):
+                buffer_index = self._get_buffer_index(index)
+                slot = self._tick_count % capacity
+                # Invalidate the slot's previous sample before overwriting it
+                tick_overwritten = self._tick_count - capacity
+                if header[_TICK_OLDEST] <= tick_overwritten:
+                    header[_TICK_OLDEST] = tick_overwritten + 1
+                times[slot] = time_to_microseconds(
+                    self._price_times[buffer_index])
+                offset = slot * max_stock_symbols
+                prices[offset:offset + num_stock_symbols] = array.array(
+                    'd', self._price_rows[buffer_index])
+
+                self._tick_count += 1
+                header[_TICK_COUNT] = self._tick_count
+            self._published_time = self._get_time_at_index(-1)
+        elif not length:
+            self._published_time = None
+
+        header[_TICK_OLDEST] = self._tick_count - length
+
+
+
+
+class SharedStockMarketView(object):
+    """A read-only view of a `SharedStockMarket`'s history, usually attached
+    from another process by the market's shared memory segment name.
+
+    Samples are identified by ticks, counting from when the market was
+    created. Reads made while the market's process publishes samples are
+    checked afterwards, so a sample that gets overwritten mid-read raises
+    `SharedTickUnavailableError` rather than returning torn prices.
+    """
+
+    _segment: _SharedSegment
+    """Read-only views of the attached shared memory segment."""
+
+    _stock_symbols_cache: typing.Tuple[bytes, typing.List[str]]
+    """The most recently decoded stock symbol table and its encoding."""
+
+
+    def __init__(self,
+        name: str
+    ) -> None:
+        """Attach to the shared memory segment of a `SharedStockMarket` with
+        the given `name`.
+        """
+        try:  # Python 3.13+ can leave the segment's lifetime to its creator
+            memory = shared_memory.SharedMemory(name=name,
+                track=False)  # type: ignore
+        except TypeError:
+            memory = shared_memory.SharedMemory(name=name)
+
+        assert memory.buf is not None, 'Shared memory already closed'
+        header = memory.buf[:_HEADER_FIELDS * _ITEM_SIZE].cast('q')
+        capacity = header[_CAPACITY]
+        max_stock_symbols = header[_MAX_STOCK_SYMBOLS]
+        header.release()
+
+        self._segment = _SharedSegment(memory,
+            capacity, max_stock_symbols, readonly=True)
+        self._stock_symbols_cache = (b'', [])
+
+    def close(self
+    ) -> None:
+        """Detach from the shared memory segment."""
+        self._segment.close()
+
+
+    def get_tick_count(self
+    ) -> int:
+        """Return the number of samples published since the market was
+        created, which is also the tick of the next sample.
+        """
+        return self._segment.header[_TICK_COUNT]
+
+    def get_tick_range(self
+    ) -> typing.Tuple[int, int]:
+        """Return the oldest retained tick along with the tick count, so that
+        readable ticks are within `range(*get_tick_range())`.
+        """
+        header = self._segment.header
+        return header[_TICK_OLDEST], header[_TICK_COUNT]
+
+    def get_stock_symbols(self
+    ) -> typing.List[str]:
+        """Return a `list` of the market's stock symbols indexed by their IDs.
+        """
+        header = self._segment.header
+        encoded = bytes(
+            self._segment.stock_symbols[:header[_STOCK_SYMBOLS_LENGTH]])
+        if encoded != self._stock_symbols_cache[0]:
+            self._stock_symbols_cache = (encoded,
+                encoded.decode('utf_8').split('\n') if encoded else [])
+        return list(self._stock_symbols_cache[1])
+
+
+    def _check_tick(self,
+        tick: int
+    ) -> None:
+        """Raise `SharedTickUnavailableError` if `tick` isn't readable."""
+        tick_oldest, tick_count = self.get_tick_range()
+        if not tick_oldest <= tick < tick_count:
+            raise SharedTickUnavailableError(tick, tick_oldest, tick_count)
+
+    def get_time(self,
+        tick: typing.Optional[int] = None
+    ) -> datetime.datetime:
+        """Return the time of the sample at `tick`, or of the newest sample if
+        `None`. Raises `SharedTickUnavailableError` if it isn't readable.
+        """
+        if tick is None:
+            tick = self.get_tick_count() - 1
+        self._check_tick(tick)
+
+        microseconds = self._segment.times[tick % self._segment.header[_CAPACITY]]
+        self._check_tick(tick)  # Not overwritten while reading
+        return microseconds_to_time(microseconds)
+
+    def get_prices_by_id(self,
+        tick: typing.Optional[int] = None
+    ) -> typing.List[float]:
+        """Return a `list` of share prices at `tick` indexed by stock symbol
+        ID, or of the newest sample if `None`. Raises
+        `SharedTickUnavailableError` if it isn't readable.
+        """
+        if tick is None:
+            tick = self.get_tick_count() - 1
+        self._check_tick(tick)
+
+        header = self._segment.header
+        offset = (tick % header[_CAPACITY]) * header[_MAX_STOCK_SYMBOLS]
+        prices = typing.cast(typing.List[float], self._segment.prices[
+            offset:offset + header[_NUM_STOCK_SYMBOLS]].tolist())
+        self._check_tick(tick)  # Not overwritten while reading
+        return prices
+
+    def get_prices(self,
+        tick: typing.Optional[int] = None
+    ) -> typing.Dict[str, float]:
+        """Return a `dict` mapping stock symbols to their share prices at
+        `tick`, or of the newest sample if `None`. Raises
+        `SharedTickUnavailableError` if it isn't readable.
+        """
+        return dict(zip(self.get_stock_symbols(), self.get_prices_by_id(tick)))
+
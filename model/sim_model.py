@@ -13,6 +13,7 @@ import dispatch
 if typing.TYPE_CHECKING:
     from model.stock_market import StockMarket
     from model.trader import Trader
+    from model.trader_pool import TraderProcessPool, TraderThreadPool
 
 
 
@@ -67,6 +68,12 @@ class SimModel(dispatch.Dispatcher):
     _traders: typing.Dict[str, 'Trader']
     """Participating `Trader` subclass instances indexed by their names."""
 
+    _trader_pool: typing.Optional[
+        typing.Union['TraderProcessPool', 'TraderThreadPool']]
+    """Worker processes or threads that make participating traders'
+    decisions, or `None` if traders run by themselves.
+    """
+
     EVENTS: typing.ClassVar[typing.FrozenSet[str]] = frozenset([
         'SIMMODEL_TRADER_ADDED',
         'SIMMODEL_TRADER_ALGORITHM_ADDED',
@@ -74,13 +81,18 @@ class SimModel(dispatch.Dispatcher):
     """Events broadcast by the `SimModel`."""
 
 
-    def __init__(self
+    def __init__(self,
+        stock_market: typing.Optional['StockMarket'] = None
     ) -> None:
-        """Initialize with no stock market prices or participating traders."""
+        """Initialize with no participating traders, and either an empty
+        `StockMarket` or a given `stock_market`, such as a
+        `shared_stock_market.SharedStockMarket`.
+        """
         self._trader_algorithms = {}
 
-        self._stock_market = StockMarket()
+        self._stock_market = StockMarket() if stock_market is None else stock_market
         self._traders = {}
+        self._trader_pool = None
 
         # Add all known Trader implementations
         for trader_subclass in Trader.iter_subclasses():
@@ -97,6 +109,135 @@ class SimModel(dispatch.Dispatcher):
         # Traders react by creating new accounts
 
 
+    def save_checkpoint(self,
+        filename: str,
+        datasource_position: typing.Optional[int] = None
+    ) -> None:
+        """Write a snapshot of this model's `StockMarket` history along with
+        every participating trader's `TraderAccount` ledger to a checkpoint
+        file named `filename`. An optional `datasource_position` can be saved
+        to resume reading from the same place in a datasource.
+        """
+        if self._trader_pool is not None:
+            self._trader_pool.fetch_algorithm_states()
+
+        market = self._stock_market
+        market.copy_mapped_history()  # In case `filename` is mapped
+        times, price_rows = market.get_history_by_id()
+        time_evicted = market.get_time_evicted()
+
+        traders = {}
+        for name, trader in self._traders.items():
+            account = trader.get_account()
+            if account is not None:
+                traders[name] = {
+                    'LEDGER': account.get_ledger(),
+                    'ALGORITHM_STATE': trader.get_checkpoint_state()}
+
+        write_checkpoint(filename, Checkpoint(
+            stock_symbols=market.get_stock_symbols(),
+            times=times,
+            price_rows=price_rows,
+            metadata={
+                'TIME_EVICTED': (None if time_evicted is None
+                    else time_to_microseconds(time_evicted)),
+                'DATASOURCE_POSITION': datasource_position,
+                'TRADERS': traders}))
+
+    def load_checkpoint(self,
+        filename: str
+    ) -> typing.Optional[int]:
+        """Replace this model's `StockMarket` history and trader accounts with
+        those saved by `save_checkpoint` to the file named `filename`, and
+        return its saved datasource position, if any.
+
+        The checkpoint's price data gets memory-mapped rather than copied or
+        parsed, though loading still takes time linear in history length to
+        convert sample times and create a view of each price row.
+        Participating traders get new accounts, which restore the ledgers saved
+        under the same trader names. Traders missing from the checkpoint keep
+        fresh accounts. Raises `checkpoint.CheckpointFormatError` if the file
+        isn't a valid checkpoint.
+        """
+        checkpoint = read_checkpoint(filename)
+        metadata = checkpoint.metadata
+
+        self._stock_market.clear()  # Traders react by creating new accounts
+        time_evicted = metadata['TIME_EVICTED']
+        self._stock_market.restore_history(
+            checkpoint.stock_symbols, checkpoint.times, checkpoint.price_rows,
+            None if time_evicted is None else microseconds_to_time(time_evicted))
+
+        for name, trader_state in metadata['TRADERS'].items():
+            trader = self._traders.get(name)
+            if trader is None:
+                continue
+            account = trader.get_account()
+            if account is not None:
+                account.restore_ledger(trader_state['LEDGER'])
+                trader.restore_checkpoint_state(trader_state['ALGORITHM_STATE'])
+
+        return metadata['DATASOURCE_POSITION']
+
+
+    def get_trader_processes(self
+    ) -> int:
+        """Return the number of worker processes that participating traders'
+        decisions are sharded across, or `0` if they run in this process.
+        """
+        if not isinstance(self._trader_pool, TraderProcessPool):
+            return 0
+        return self._trader_pool.get_num_processes()
+
+    def set_trader_processes(self,
+        num_processes: int
+    ) -> None:
+        """Shard participating traders' decisions across `num_processes`
+        worker processes (see `trader_pool.TraderProcessPool`), or run them
+        in this process if `0`. Results are identical either way, but worker
+        processes let many traders use more than one core. Replaces any
+        trader threads.
+        """
+        if num_processes == self.get_trader_processes():
+            return
+
+        self._close_trader_pool()
+        if num_processes > 0:
+            self._trader_pool = TraderProcessPool(self, num_processes)
+
+    def get_trader_threads(self
+    ) -> int:
+        """Return the number of threads that participating traders' decisions
+        are spread across, or `0` if they run by themselves.
+        """
+        if not isinstance(self._trader_pool, TraderThreadPool):
+            return 0
+        return self._trader_pool.get_num_threads()
+
+    def set_trader_threads(self,
+        num_threads: int
+    ) -> None:
+        """Run participating traders' decisions concurrently in `num_threads`
+        threads (see `trader_pool.TraderThreadPool`), or by themselves if `0`.
+        Threads only run concurrently on free-threaded Python builds, and
+        otherwise fall back to serial trading. Results are identical either
+        way. Replaces any trader processes.
+        """
+        if num_threads == self.get_trader_threads():
+            return
+
+        self._close_trader_pool()
+        if num_threads > 0:
+            self._trader_pool = TraderThreadPool(self, num_threads)
+
+    def _close_trader_pool(self
+    ) -> None:
+        """Return traders' decisions to them from any trader pool."""
+        if self._trader_pool is not None:
+            self._trader_pool.close()
+            self._trader_pool = None
+
+
     def get_stock_market(self
     ) -> 'StockMarket':
         """Return this simulation's `StockMarket` instance, which exposes its
@@ -265,5 +406,8 @@ class SimModel(dispatch.Dispatcher):
 
 
 # Imported last to avoid circular dependencies
+from model.checkpoint import (Checkpoint, microseconds_to_time,
+    read_checkpoint, time_to_microseconds, write_checkpoint)
 from model.stock_market import StockMarket
 from model.trader import Trader
+from model.trader_pool import TraderProcessPool, TraderThreadPool
@@ -7,6 +7,9 @@ __license__ = 'MIT'
 
 import bisect
 import datetime
+import functools
+import itertools
+import operator
 import typing
 
 import dispatch
@@ -14,6 +17,14 @@ import dispatch
 
 
 
+_is_positive = functools.partial(operator.lt, 0.0)
+"""Return `True` if a given price is positive. Mapped over sequences of prices
+to validate them without a Python-level loop.
+"""
+
+
+
+
 class InvalidSharePriceError(ValueError):
     """An exception raised when attempting to add a non-positive share price.
     """
@@ -57,6 +68,33 @@ class NonconsecutiveTimeError(ValueError):
                 time, time_previous))
 
 
+class PriceBlockShapeError(ValueError):
+    """An exception raised when a block of stock prices has a different number
+    of samples for a stock symbol than the block has times.
+    """
+
+    stock_symbol: str
+    """The stock symbol whose prices have the wrong number of samples."""
+
+    length: int
+    """The number of prices given for `stock_symbol`."""
+
+    length_expected: int
+    """The number of times in the block."""
+
+    def __init__(self,
+        stock_symbol: str,
+        length: int,
+        length_expected: int
+    ) -> None:
+        self.stock_symbol = stock_symbol
+        self.length = length
+        self.length_expected = length_expected
+        super().__init__('Stock {!r} has {:d} prices in a block of {:d} '
+            'times.'.format(
+                stock_symbol, length, length_expected))
+
+
 class StockSymbolMissingError(ValueError):
     """An exception raised when an attempt to add new stock price readings left
     out a previously-added symbol.
@@ -89,6 +127,50 @@ class StockSymbolMissingError(ValueError):
         super().__init__(error)
 
 
+class PricesEvictedError(ValueError):
+    """An exception raised when requesting prices from a time that a
+    `StockMarket` with a retention policy has already discarded.
+    """
+
+    time: datetime.datetime
+    """The requested time whose prices were evicted."""
+
+    time_oldest: typing.Optional[datetime.datetime]
+    """The oldest time still retained, or `None` if no prices are retained."""
+
+    def __init__(self,
+        time: datetime.datetime,
+        time_oldest: typing.Optional[datetime.datetime]
+    ) -> None:
+        self.time = time
+        self.time_oldest = time_oldest
+        super().__init__('Prices at time {} were evicted from the market\'s '
+            'history, which now starts at {}.'.format(
+                time, time_oldest))
+
+
+class RetentionPolicyError(ValueError):
+    """An exception raised when configuring a non-positive history retention
+    limit.
+    """
+
+    max_ticks: typing.Optional[int]
+    """The requested maximum number of retained price samples."""
+
+    max_timespan: typing.Optional[datetime.timedelta]
+    """The requested maximum span of time covered by retained samples."""
+
+    def __init__(self,
+        max_ticks: typing.Optional[int],
+        max_timespan: typing.Optional[datetime.timedelta]
+    ) -> None:
+        self.max_ticks = max_ticks
+        self.max_timespan = max_timespan
+        super().__init__('Retention limits must be positive, not max_ticks={!r} '
+            'and max_timespan={!r}.'.format(
+                max_ticks, max_timespan))
+
+
 class StockSymbolUnrecognizedError(ValueError):
     """An exception raised when referencing an unrecognized stock symbol.
     """
@@ -106,32 +188,196 @@ class StockSymbolUnrecognizedError(ValueError):
 
 
 
+class StockSymbolPrices(typing.Mapping[str, float]):
+    """A read-only mapping of stock symbols to their prices per share at one
+    `StockMarket` sample. This view is created in constant time regardless of
+    how many stock symbols the market includes.
+    """
+    __slots__ = ('_stock_symbol_ids', '_prices')
+
+    _stock_symbol_ids: typing.Dict[str, int]
+    """The market's stock symbols mapped to their IDs."""
+
+    _prices: typing.Sequence[float]
+    """Prices per share indexed by stock symbol ID."""
+
+    def __init__(self,
+        stock_symbol_ids: typing.Dict[str, int],
+        prices: typing.Sequence[float]
+    ) -> None:
+        self._stock_symbol_ids = stock_symbol_ids
+        self._prices = prices
+
+    def __getitem__(self,
+        stock_symbol: str
+    ) -> float:
+        return self._prices[self._stock_symbol_ids[stock_symbol]]
+
+    def __iter__(self
+    ) -> typing.Iterator[str]:
+        return iter(self._stock_symbol_ids)
+
+    def __len__(self
+    ) -> int:
+        return len(self._prices)
+
+    def __repr__(self
+    ) -> str:
+        return repr(dict(self.items()))
+
+
+
+
 class StockMarket(dispatch.Dispatcher):
     """A component of `SimModel` that stores a time series of stock share
     prices accumulated over simulation runs. To begin a new simulation, the
     stock market can be reset.
+
+    By default every price sample is kept until the market is cleared. A
+    retention policy can instead limit history to a maximum number of samples
+    and/or a maximum span of time, in which case samples are stored in a ring
+    buffer and the oldest ones are evicted as new prices arrive. This keeps
+    memory use constant for arbitrarily long simulations.
+
+    Prices can either be added as complete samples of every stock symbol, or
+    as sparse changes to the previous sample (see `add_next_price_changes`).
+    Either way, the stock symbols whose prices changed in the newest sample are
+    available from `get_price_changes`.
     """
 
 
     _price_times: typing.List[datetime.datetime]
-    """A `list` of times for the price readings stored in `_symbol_prices`."""
+    """A ring buffer of times for the price readings stored in `_price_rows`.
+    Its length is the buffer's capacity, which may exceed `_history_length`.
+    """
+
+    _price_rows: typing.List[typing.Sequence[float]]
+    """A ring buffer of recorded prices corresponding to insertion times
+    within `_price_times`. Each row lists prices indexed by stock symbol ID.
+    Rows are never modified once stored, so consecutive samples without price
+    changes can share the same row, and restored rows can be read-only views
+    of a checkpoint file.
+    """
+
+    _stock_symbols: typing.List[str]
+    """Included stock symbols indexed by their IDs. This symbol table is frozen
+    by the first price sample until the market is cleared.
+    """
+
+    _stock_symbol_ids: typing.Dict[str, int]
+    """Included stock symbols mapped to their indexes in `_stock_symbols`."""
+
+    _history_start: int
+    """The index within `_price_times` and `_price_rows` of the oldest
+    retained price sample.
+    """
+
+    _history_length: int
+    """The number of retained price samples, starting at `_history_start` and
+    wrapping around the end of each ring buffer.
+    """
+
+    _max_ticks: typing.Optional[int]
+    """The maximum number of price samples to retain, or `None` if unlimited.
+    """
+
+    _max_timespan: typing.Optional[datetime.timedelta]
+    """The maximum time between the oldest and newest retained price samples,
+    or `None` if unlimited.
+    """
 
-    _symbol_prices: typing.Dict[str, typing.List[float]]
-    """A `dict` of included stock symbols mapped to `list`s of recorded prices
-    corresponding to insertion times within `_price_times`.
+    _time_evicted: typing.Optional[datetime.datetime]
+    """The time of the most recently evicted price sample, or `None` if no
+    samples have been evicted since the last `clear`.
+    """
+
+    _price_row_previous: typing.Optional[typing.Sequence[float]]
+    """The price row that preceded the newest sample, or `None` if the newest
+    sample was the first.
+    """
+
+    _time_previous: typing.Optional[datetime.datetime]
+    """The time of the sample that preceded the newest sample, or `None` if
+    the newest sample was the first.
+    """
+
+    _price_changes: typing.Optional[typing.Tuple[int, ...]]
+    """Sorted IDs of stock symbols whose prices changed in the newest sample,
+    or `None` if not determined yet.
+    """
+
+    _price_changes_mask: typing.Optional[int]
+    """A bitmap of `_price_changes` IDs, or `None` if not determined yet."""
+
+    _addition_listeners: 'dispatch._EventListeners'
+    """Listeners of `STOCKMARKET_ADDITION`, called directly to skip
+    `emit`'s lookup since it fires for every sample. Falsy while there are
+    none.
     """
 
     EVENTS: typing.ClassVar[typing.FrozenSet[str]] = frozenset([
         'STOCKMARKET_ADDITION',
-        'STOCKMARKET_CLEARED'])
+        'STOCKMARKET_BLOCK_ADDITION',
+        'STOCKMARKET_CLEARED',
+        'STOCKMARKET_RESTORED'])
     """Events broadcast by instances of the `StockMarket`."""
 
 
-    def __init__(self
+    def __init__(self,
+        max_ticks: typing.Optional[int] = None,
+        max_timespan: typing.Optional[datetime.timedelta] = None
     ) -> None:
-        """Initialize this `StockMarket` with no stock price readings."""
+        """Initialize this `StockMarket` with no stock price readings.
+
+        See `set_retention` for details on the optional `max_ticks` and
+        `max_timespan` retention limits.
+        """
         self._price_times = []
-        self._symbol_prices = {}
+        self._price_rows = []
+        self._stock_symbols = []
+        self._stock_symbol_ids = {}
+
+        self._history_start = self._history_length = 0
+        self._time_evicted = None
+
+        self._price_row_previous = self._time_previous = None
+        self._price_changes = self._price_changes_mask = None
+
+        self._max_ticks = self._max_timespan = None
+        self.set_retention(max_ticks, max_timespan)
+
+        self._addition_listeners = self.get_event_listeners(
+            'STOCKMARKET_ADDITION')
+
+
+    def get_retention(self
+    ) -> typing.Tuple[typing.Optional[int], typing.Optional[datetime.timedelta]]:
+        """Return a `(max_ticks, max_timespan)` `tuple` describing this
+        market's history retention policy, where `None` values are unlimited.
+        """
+        return self._max_ticks, self._max_timespan
+
+    def set_retention(self,
+        max_ticks: typing.Optional[int] = None,
+        max_timespan: typing.Optional[datetime.timedelta] = None
+    ) -> None:
+        """Limit this market's price history to the newest `max_ticks` samples
+        and to samples no older than `max_timespan` before the newest sample.
+        Either limit can be `None` to leave it unlimited. Non-positive limits
+        raise `RetentionPolicyError`.
+
+        Samples that fall outside of new limits are evicted immediately.
+        """
+        if ((max_ticks is not None and max_ticks <= 0)
+            or (max_timespan is not None
+                and max_timespan <= datetime.timedelta(0))
+        ):
+            raise RetentionPolicyError(max_ticks, max_timespan)
+
+        self._max_ticks = max_ticks
+        self._max_timespan = max_timespan
+        self._trim_history()
+        self._publish_history()
 
 
     def clear(self
@@ -145,14 +391,21 @@ class StockMarket(dispatch.Dispatcher):
         #   return  # Nothing to clear
 
         self._price_times.clear()
-        self._symbol_prices.clear()
+        self._price_rows.clear()
+        self._stock_symbols.clear()
+        self._stock_symbol_ids = {}  # Leave old StockSymbolPrices views intact
+        self._history_start = self._history_length = 0
+        self._time_evicted = None
+        self._price_row_previous = self._time_previous = None
+        self._price_changes = self._price_changes_mask = None
+        self._publish_history()
         self.emit('STOCKMARKET_CLEARED',
             market=self)
 
 
     def add_next_prices(self,
         time: datetime.datetime,
-        stock_symbol_prices: typing.Dict[str, float]
+        stock_symbol_prices: typing.Mapping[str, float]
     ) -> None:
         """Add new price readings to this market's history.
 
@@ -161,60 +414,456 @@ class StockMarket(dispatch.Dispatcher):
         precedes or matches the previous reading raises
         `NonconsecutiveTimeError`.
 
-        The `stock_symbol_prices` `dict` maps stock symbol keys to
+        The `stock_symbol_prices` mapping associates stock symbol keys with
         price-per-share values. All previously-added stock symbol prices should
         be provided, except on the first addition when at least one symbol is
         required; If these requirements are not met, this method raises
         `StockSymbolMissingError`. All price-per-share
         values must be positive, or `InvalidSharePriceError` will be raised.
 
+        The first addition freezes this market's stock symbol IDs (see
+        `get_stock_symbol_id`) until it gets cleared.
+
+        If this market has a retention policy, samples that fall outside of it
+        are evicted after adding the new prices.
+
+        Triggers `STOCKMARKET_ADDITION` if successful.
+        """
+        if not self._stock_symbols:  # First datapoint
+            if not stock_symbol_prices:
+                # Need at least one initial stock
+                raise StockSymbolMissingError(set(), set())
+            for stock_symbol, price in stock_symbol_prices.items():
+                if not price > 0:  # Validate before freezing symbols
+                    raise InvalidSharePriceError(stock_symbol, price)
+            stock_symbols: typing.Iterable[str] = stock_symbol_prices.keys()
+        else:
+            stock_symbols = self._stock_symbols
+
+        try:
+            prices = [stock_symbol_prices[stock_symbol]
+                for stock_symbol in stock_symbols]
+        except KeyError:
+            prices = []  # Missing symbols are reported below
+        if len(prices) != len(stock_symbol_prices):
+            # Must include exactly the previously-seen symbols
+            raise StockSymbolMissingError(
+                set(self._stock_symbols), set(stock_symbol_prices.keys()))
+
+        if not self._stock_symbols:
+            self._freeze_stock_symbols(stock_symbol_prices.keys())
+        self.add_next_prices_by_id(time, prices)
+
+    def add_next_prices_by_id(self,
+        time: datetime.datetime,
+        prices: typing.Sequence[float]
+    ) -> None:
+        """Add new price readings to this market's history, where `prices`
+        lists price-per-share values in order of stock symbol ID. This is a
+        faster alternative to `add_next_prices` for callers that already know
+        the frozen stock symbol IDs (see `get_stock_symbol_id`).
+
+        The same time and price requirements as `add_next_prices` apply. If
+        `prices` doesn't include exactly one price per stock symbol ID, raises
+        `StockSymbolMissingError`. Stock symbol IDs must already be frozen by
+        a previous addition.
+
+        Triggers `STOCKMARKET_ADDITION` if successful.
+        """
+        stock_symbols = self._stock_symbols
+        if len(prices) != len(stock_symbols) or not stock_symbols:
+            raise StockSymbolMissingError(set(stock_symbols), set())
+
+        # Validate prices
+        if not all(map(_is_positive, prices)):
+            for stock_symbol, price in zip(stock_symbols, prices):
+                if not price > 0:
+                    raise InvalidSharePriceError(stock_symbol, price)
+
+        self._add_price_row(time, list(prices), None)
+
+
+    def add_next_price_changes(self,
+        time: datetime.datetime,
+        stock_symbol_prices: typing.Mapping[str, float]
+    ) -> None:
+        """Add a new sample to this market's history that only includes prices
+        which changed since the previous sample. All other stock symbols keep
+        their previous prices. This is cheaper than `add_next_prices` when only
+        a few of many stock symbols change each sample.
+
+        The first addition must still include every stock symbol, as with
+        `add_next_prices`. Afterwards, `stock_symbol_prices` may include any
+        subset of this market's stock symbols, including none; Unrecognized
+        symbols raise `StockSymbolUnrecognizedError`. The same time and price
+        requirements as `add_next_prices` apply.
+
+        Triggers `STOCKMARKET_ADDITION` if successful.
+        """
+        if not self._stock_symbols:  # First datapoint must be complete
+            self.add_next_prices(time, stock_symbol_prices)
+            return
+
+        self.add_next_price_changes_by_id(time,
+            {self.get_stock_symbol_id(stock_symbol): price
+                for stock_symbol, price in stock_symbol_prices.items()})
+
+    def add_next_price_changes_by_id(self,
+        time: datetime.datetime,
+        prices: typing.Mapping[int, float]
+    ) -> None:
+        """Add a new sample to this market's history that only includes prices
+        which changed since the previous sample, where `prices` maps stock
+        symbol IDs to their new prices. This is a faster alternative to
+        `add_next_price_changes` for callers that already know the frozen
+        stock symbol IDs (see `get_stock_symbol_id`).
+
+        Stock symbol IDs must already be frozen by a previous addition;
+        Unrecognized IDs raise `IndexError`. The same time and price
+        requirements as `add_next_prices` apply.
+
+        Triggers `STOCKMARKET_ADDITION` if successful.
+        """
+        if not self._history_length:
+            raise StockSymbolMissingError(set(self._stock_symbols), set())
+
+        # Validate prices
+        if prices:
+            if min(prices) < 0 or max(prices) >= len(self._stock_symbols):
+                raise IndexError('Stock symbol ID out of range.')
+            if not all(map(_is_positive, prices.values())):
+                for stock_symbol_id, price in prices.items():
+                    if not price > 0:
+                        raise InvalidSharePriceError(
+                            self._stock_symbols[stock_symbol_id], price)
+
+        row_previous = self._price_rows[self._get_buffer_index(-1)]
+        price_changes = sorted(stock_symbol_id
+            for stock_symbol_id, price in prices.items()
+                if price != row_previous[stock_symbol_id])
+        row: typing.Sequence[float]
+        if price_changes:
+            row = list(row_previous)
+            for stock_symbol_id in price_changes:
+                row[stock_symbol_id] = prices[stock_symbol_id]
+        else:  # Share unchanged prices
+            row = row_previous
+
+        self._add_price_row(time, row, tuple(price_changes))
+
+
+    def _add_price_row(self,
+        time: datetime.datetime,
+        row: typing.Sequence[float],
+        price_changes: typing.Optional[typing.Tuple[int, ...]]
+    ) -> None:
+        """Store a validated `row` of prices sampled at `time`, along with IDs
+        of `price_changes` since the previous sample if known.
+
         Triggers `STOCKMARKET_ADDITION` if successful.
         """
+        row_previous = time_previous = None
+        if self._history_length:
+            # Times must be consecutive
+            index_previous = self._get_buffer_index(-1)
+            time_previous = self._price_times[index_previous]
+            if not time > time_previous:
+                raise NonconsecutiveTimeError(time, time_previous)
+            row_previous = self._price_rows[index_previous]
+
+        # Save valid datapoint
+        index = self._allocate_history_index()
+        self._price_times[index] = time
+        self._price_rows[index] = row
+        self._evict_expired_history()
+
+        self._price_row_previous = row_previous
+        self._time_previous = time_previous
+        self._price_changes = price_changes
+        self._price_changes_mask = None
+        self._publish_history()
+
+        if self._addition_listeners:
+            self._addition_listeners(
+                market=self,
+                time=time,
+                stock_symbol_prices=StockSymbolPrices(
+                    self._stock_symbol_ids, row))
+
+
+    def add_prices_block(self,
+        times: typing.Sequence[datetime.datetime],
+        stock_symbol_prices: typing.Mapping[str, typing.Sequence[float]],
+        emit_additions: bool = False
+    ) -> None:
+        """Add a block of consecutive price readings to this market's history
+        at once, such as when loading warm-up data.
+
+        The `times` sequence must be strictly increasing, and its first entry
+        must follow any previously added sample, otherwise
+        `NonconsecutiveTimeError` is raised. The `stock_symbol_prices` mapping
+        associates each stock symbol with a sequence of its price-per-share
+        values at every time in `times`; Sequences with a different length
+        raise `PriceBlockShapeError`. The same stock symbol and price
+        requirements as `add_next_prices` apply.
+
+        The whole block is validated before any of it gets stored, so invalid
+        blocks leave this market unchanged. Empty blocks are ignored.
+
+        Triggers `STOCKMARKET_BLOCK_ADDITION` if successful, when listeners
+        observe this market with the whole block already stored. If
+        `emit_additions` is `True`, `STOCKMARKET_ADDITION` is also triggered
+        for each sample in the block before that, right after the sample gets
+        stored, so that its listeners observe the same prices and changes as
+        if the samples were added by `add_next_prices`. That stores samples
+        one at a time, so it's slower when `STOCKMARKET_ADDITION` has
+        listeners.
+        """
+        if not times:
+            return  # Nothing to add
+
         # Validate prices
-        for stock_symbol, price in stock_symbol_prices.items():
-            if not price > 0:
+        for stock_symbol, prices in stock_symbol_prices.items():
+            if len(prices) != len(times):
+                raise PriceBlockShapeError(stock_symbol, len(prices), len(times))
+            if not all(map(_is_positive, prices)):
+                price = next(price for price in prices if not price > 0)
                 raise InvalidSharePriceError(stock_symbol, price)
 
-        if not self._symbol_prices:  # First datapoint
+        if not self._stock_symbols:  # First datapoints
             if not stock_symbol_prices:
                 # Need at least one initial stock
                 raise StockSymbolMissingError(set(), set())
 
-            # Initialize storage
-            for stock_symbol in stock_symbol_prices.keys():
-                self._symbol_prices[stock_symbol] = []
-
         else:
             # Must include previously-seen symbols
-            symbols_old = set(self._symbol_prices.keys())
+            symbols_old = set(self._stock_symbols)
             symbols_new = set(stock_symbol_prices.keys())
             if symbols_old != symbols_new:
                 raise StockSymbolMissingError(symbols_old, symbols_new)
 
-            # Times must be consecutive
-            time_previous = self._price_times[-1]
-            if not time > time_previous:
-                raise NonconsecutiveTimeError(time, time_previous)
+            time_previous = self._get_time_at_index(-1)
+            if not times[0] > time_previous:
+                raise NonconsecutiveTimeError(times[0], time_previous)
 
-        # Save valid datapoint
-        self._price_times.append(time)
-        for stock_symbol, price in stock_symbol_prices.items():
-            self._symbol_prices[stock_symbol].append(price)
-        self.emit('STOCKMARKET_ADDITION',
+        # Times must be consecutive within the block
+        times_next = itertools.islice(times, 1, None)
+        if not all(map(operator.lt, times, times_next)):
+            for time_previous, time in zip(times, times[1:]):
+                if not time > time_previous:
+                    raise NonconsecutiveTimeError(time, time_previous)
+
+        # Save valid datapoints, skipping any that would be evicted immediately
+        if not self._stock_symbols:
+            self._freeze_stock_symbols(stock_symbol_prices.keys())
+        rows = list(map(list, zip(*(stock_symbol_prices[stock_symbol]
+            for stock_symbol in self._stock_symbols))))
+
+        if emit_additions and self._addition_listeners:
+            # Store and announce one sample at a time like `add_next_prices`,
+            # so listeners see each sample's own prices and changes
+            for time, row in zip(times, rows):
+                self._add_price_row(time, row, None)
+            self.emit('STOCKMARKET_BLOCK_ADDITION',
+                market=self,
+                times=times,
+                stock_symbol_prices=stock_symbol_prices)
+            return
+
+        if len(rows) > 1:
+            self._price_row_previous = rows[-2]
+            self._time_previous = times[-2]
+        elif self._history_length:
+            index_previous = self._get_buffer_index(-1)
+            self._price_row_previous = self._price_rows[index_previous]
+            self._time_previous = self._price_times[index_previous]
+        else:
+            self._price_row_previous = self._time_previous = None
+        self._price_changes = self._price_changes_mask = None
+
+        self._trim_history()
+        offset = 0
+        if self._max_ticks is not None and len(times) > self._max_ticks:
+            offset = len(times) - self._max_ticks
+
+        self._price_times.extend(itertools.islice(times, offset, None))
+        self._price_rows.extend(itertools.islice(rows, offset, None))
+        self._history_length += len(times) - offset
+        self._trim_history()
+        if offset:  # Skipped samples are newer than any other evicted ones
+            self._time_evicted = times[offset - 1]
+        self._publish_history()
+
+        self.emit('STOCKMARKET_BLOCK_ADDITION',
             market=self,
-            time=time,
+            times=times,
             stock_symbol_prices=stock_symbol_prices)
 
 
+    def _freeze_stock_symbols(self,
+        stock_symbols: typing.Iterable[str]
+    ) -> None:
+        """Assign IDs to `stock_symbols` in iteration order."""
+        assert not self._stock_symbols, 'Stock symbols already frozen'
+        assert not self._history_length, 'Prices stored without symbols'
+
+        self._stock_symbols.extend(stock_symbols)
+        self._stock_symbol_ids.update(
+            (stock_symbol, stock_symbol_id)
+                for stock_symbol_id, stock_symbol in enumerate(self._stock_symbols))
+
+
+    def _publish_history(self
+    ) -> None:
+        """Called whenever retained history changes, before listeners get
+        notified. Does nothing, but subclasses can override this to mirror
+        history elsewhere.
+        """
+        pass
+
+
+    def _get_buffer_index(self,
+        index: int
+    ) -> int:
+        """Return the ring buffer index of the retained sample at chronological
+        `index`, where negative values count back from the newest sample.
+        """
+        if index < 0:
+            index += self._history_length
+        return (self._history_start + index) % len(self._price_times)
+
+    def _linearize_history(self
+    ) -> None:
+        """Rotate ring buffers so that the oldest retained sample is first."""
+        start = self._history_start
+        if start == 0:
+            return  # Already in order
+
+        self._price_times[:] = (
+            self._price_times[start:] + self._price_times[:start])
+        self._price_rows[:] = (
+            self._price_rows[start:] + self._price_rows[:start])
+        self._history_start = 0
+
+    def _allocate_history_index(self
+    ) -> int:
+        """Reserve room for one new sample at the end of the retained history,
+        and return its ring buffer index. Evicts the oldest sample if this
+        would exceed `_max_ticks`.
+        """
+        capacity = len(self._price_times)
+        if self._history_length < capacity:  # Reuse a free slot
+            self._history_length += 1
+            return self._get_buffer_index(-1)
+
+        if self._max_ticks is not None and capacity >= self._max_ticks:
+            # Overwrite the oldest sample
+            index = self._history_start
+            self._time_evicted = self._price_times[index]
+            self._history_start = (index + 1) % capacity
+            return index
+
+        # Grow buffers
+        self._linearize_history()
+        self._price_times.append(None)  # type: ignore
+        self._price_rows.append(None)  # type: ignore
+        self._history_length += 1
+        return capacity
+
+    def _trim_history(self
+    ) -> None:
+        """Shrink ring buffers to just the retained samples in chronological
+        order, and evict any samples outside of the retention policy.
+        """
+        self._linearize_history()
+        del self._price_times[self._history_length:]
+        del self._price_rows[self._history_length:]
+
+        max_ticks = self._max_ticks
+        if max_ticks is not None and self._history_length > max_ticks:
+            evicted = self._history_length - max_ticks
+            self._time_evicted = self._price_times[evicted - 1]
+            del self._price_times[:evicted]
+            del self._price_rows[:evicted]
+            self._history_length = max_ticks
+        self._evict_expired_history()
+
+    def _evict_expired_history(self
+    ) -> None:
+        """Discard the oldest samples that are older than `_max_timespan`
+        relative to the newest sample.
+        """
+        if self._max_timespan is None or not self._history_length:
+            return
+
+        time_oldest_allowed = self._get_time_at_index(-1) - self._max_timespan
+        capacity = len(self._price_times)
+        while self._price_times[self._history_start] < time_oldest_allowed:
+            self._time_evicted = self._price_times[self._history_start]
+            self._price_rows[self._history_start] = None  # type: ignore
+            self._history_start = (self._history_start + 1) % capacity
+            self._history_length -= 1
+
+    def _get_time_at_index(self,
+        index: int
+    ) -> datetime.datetime:
+        """Return the time of the retained sample at chronological `index`."""
+        return self._price_times[self._get_buffer_index(index)]
+
     def _get_prices_at_index(self,
         index: int
     ) -> typing.Dict[str, float]:
         """Return a mapping of stock symbols to their prices per share at
-        sample `index`.
+        retained sample `index`.
+        """
+        return dict(zip(self._stock_symbols,
+            self._price_rows[self._get_buffer_index(index)]))
+
+    def _bisect_time(self,
+        time: datetime.datetime,
+        index_low: int = 0
+    ) -> int:
+        """Return the number of retained samples that were taken at or before
+        `time`, which must be at least `index_low`.
+        """
+        start, length = self._history_start, self._history_length
+        length_unwrapped = min(length, len(self._price_times) - start)
+        if (length > length_unwrapped  # Buffer wraps around
+            and time >= self._price_times[0]
+        ):
+            return length_unwrapped + bisect.bisect_right(self._price_times,
+                time, max(index_low - length_unwrapped, 0),
+                length - length_unwrapped)
+
+        return bisect.bisect_right(self._price_times, time,
+            start + min(index_low, length_unwrapped),
+            start + length_unwrapped) - start
+
+
+    def get_time_range(self
+    ) -> typing.Optional[typing.Tuple[datetime.datetime, datetime.datetime]]:
+        """Return a `tuple` of the oldest and newest retained sample times, or
+        `None` if no prices are retained.
+
+        This result changes upon `STOCKMARKET_ADDITION` and
+        `STOCKMARKET_CLEARED` events.
         """
-        
-        return {stock_symbol: prices[index]
-            for stock_symbol, prices in self._symbol_prices.items()}
+        if not self._history_length:
+            return None
+        return self._get_time_at_index(0), self._get_time_at_index(-1)
+
+    def get_time_previous(self
+    ) -> typing.Optional[datetime.datetime]:
+        """Return the time of the sample that preceded the newest one, which
+        `get_price_changes_by_id` compares with, or `None` if the newest
+        sample was the first or no prices were added. Remains available after
+        that sample gets evicted.
+
+        This result changes upon `STOCKMARKET_ADDITION`,
+        `STOCKMARKET_BLOCK_ADDITION`, `STOCKMARKET_CLEARED`, and
+        `STOCKMARKET_RESTORED` events.
+        """
+        return self._time_previous
 
 
     def get_prices(self,
@@ -223,24 +872,174 @@ class StockMarket(dispatch.Dispatcher):
         """Return a `dict` mapping stock symbol keys to their price-per-share
         values that follow `time`, or `None` if no data had been added by that
         time. If `time` is `None`, the most recent prices are returned.
+
+        If the prices at `time` were evicted by this market's retention policy,
+        raises `PricesEvictedError`.
         """
         if time is None:  # Get most recent prices
-            index = len(self._price_times)
+            index = self._history_length
         else:
-            index = bisect.bisect_right(self._price_times, time)
+            index = self._bisect_time(time)
 
-        return (None if index == 0
-            else self._get_prices_at_index(index - 1))
+        if index == 0:
+            if time is not None and self._time_evicted is not None:
+                time_range = self.get_time_range()
+                raise PricesEvictedError(time,
+                    time_range[0] if time_range else None)
+            return None
+        return self._get_prices_at_index(index - 1)
+
+
+    def get_prices_as_of_by_id(self,
+        times: typing.Sequence[datetime.datetime]
+    ) -> typing.List[typing.Optional[typing.Sequence[float]]]:
+        """Return a `list` with one row of prices for each of `times`, where
+        rows hold the prices that follow that time indexed by stock symbol ID.
+        Rows are `None` for times before any data had been added, and must not
+        be modified.
+
+        This is equivalent to calling `get_prices` once per time, but sorts
+        `times` and then finds all of them in one pass over the history. It
+        does not build a `dict` for each result.
+
+        If the prices at any of `times` were evicted by this market's retention
+        policy, raises `PricesEvictedError`.
+        """
+        price_rows = self._price_rows
+        results: typing.List[typing.Optional[typing.Sequence[float]]] = [
+            None] * len(times)
+        index = 0
+        for query in sorted(range(len(times)), key=times.__getitem__):
+            time = times[query]
+            index = self._bisect_time(time, index)
+            if index:
+                results[query] = price_rows[self._get_buffer_index(index - 1)]
+            elif self._time_evicted is not None:
+                time_range = self.get_time_range()
+                raise PricesEvictedError(time,
+                    time_range[0] if time_range else None)
+        return results
 
 
     def iter_prices(self
     ) -> typing.Iterator[typing.Tuple[datetime.datetime, typing.Dict[str, float]]]:
         """Return an iterator that yields times with `dict`s that map stock
-        symbols to their prices in reverse chronological order. This iterator
+        symbols to their prices in reverse chronological order. Only samples
+        retained by this market's retention policy are included. This iterator
         should be iterated immediately, as market changes will invalidate it.
         """
-        for index, time in enumerate(reversed(self._price_times)):
-            yield time, self._get_prices_at_index(index)
+        for index in range(-1, -self._history_length - 1, -1):
+            yield self._get_time_at_index(index), self._get_prices_at_index(index)
+
+
+    def get_price_changes_by_id(self
+    ) -> typing.Tuple[int, ...]:
+        """Return a sorted `tuple` of the IDs of stock symbols whose prices
+        changed in the newest sample compared to the sample before it. All
+        stock symbols are included for the first sample after clearing, and
+        none are included if no prices were added.
+
+        This result changes upon `STOCKMARKET_ADDITION`,
+        `STOCKMARKET_BLOCK_ADDITION`, and `STOCKMARKET_CLEARED` events.
+        """
+        if self._price_changes is None:
+            if not self._history_length:
+                return ()
+
+            row = self._price_rows[self._get_buffer_index(-1)]
+            row_previous = self._price_row_previous
+            if row_previous is None:  # First sample
+                self._price_changes = tuple(range(len(row)))
+            elif row_previous is row:  # Shared unchanged prices
+                self._price_changes = ()
+            else:
+                self._price_changes = tuple(itertools.compress(
+                    itertools.count(), map(operator.ne, row, row_previous)))
+        return self._price_changes
+
+    def has_price_changes(self,
+        stock_symbols_mask: int = -1
+    ) -> bool:
+        """Classify the newest sample, returning `True` if it changed the price
+        of any stock symbol, or `False` if it was idle. If a
+        `stock_symbols_mask` bitmap of stock symbol IDs is given (see
+        `get_price_changes_mask`), only those stock symbols are considered.
+        """
+        if stock_symbols_mask == -1:  # All stock symbols
+            return bool(self.get_price_changes_by_id())
+        return bool(self.get_price_changes_mask() & stock_symbols_mask)
+
+    def get_price_changes_mask(self
+    ) -> int:
+        """Return a bitmap of `get_price_changes_by_id`, where bit `1 << ID`
+        is set if the stock symbol with that ID changed price in the newest
+        sample.
+        """
+        if self._price_changes_mask is None:
+            self._price_changes_mask = sum(
+                1 << stock_symbol_id
+                    for stock_symbol_id in self.get_price_changes_by_id())
+        return self._price_changes_mask
+
+    def get_price_changes(self
+    ) -> typing.Dict[str, float]:
+        """Return a `dict` mapping stock symbols whose prices changed in the
+        newest sample to their new prices per share. See
+        `get_price_changes_by_id`.
+        """
+        price_changes = self.get_price_changes_by_id()
+        if not price_changes:
+            return {}
+
+        row = self._price_rows[self._get_buffer_index(-1)]
+        return {self._stock_symbols[stock_symbol_id]: row[stock_symbol_id]
+            for stock_symbol_id in price_changes}
+
+
+    def get_stock_symbols(self
+    ) -> typing.List[str]:
+        """Return a `list` of the stock symbols included in this market,
+        ordered by their IDs, so that each symbol's index is its ID.
+
+        This result changes upon the first `STOCKMARKET_ADDITION` or
+        `STOCKMARKET_BLOCK_ADDITION` event following a `STOCKMARKET_CLEARED`
+        event.
+        """
+        return self._stock_symbols.copy()
+
+    def get_num_stock_symbols(self
+    ) -> int:
+        """Return the number of stock symbols included in this market, so
+        that valid IDs are within `range(get_num_stock_symbols())`.
+        """
+        return len(self._stock_symbols)
+
+    def get_stock_symbol(self,
+        stock_symbol_id: int
+    ) -> str:
+        """Return the stock symbol identified by `stock_symbol_id`.
+        Unrecognized IDs, including negative ones, raise `IndexError`.
+        """
+        if not 0 <= stock_symbol_id < len(self._stock_symbols):
+            raise IndexError('Stock symbol ID out of range.')
+        return self._stock_symbols[stock_symbol_id]
+
+    def get_stock_symbol_id(self,
+        stock_symbol: str
+    ) -> int:
+        """Return the dense integer ID of `stock_symbol`, for use with the
+        faster `*_by_id` variants of price lookups and `TraderAccount` trades.
+        IDs are assigned from zero by the first price addition, and remain
+        fixed until this market is cleared.
+
+        If `stock_symbol` isn't included in this `StockMarket`, including when
+        no prices have been added yet, raises `StockSymbolUnrecognizedError`.
+        """
+        try:
+            return self._stock_symbol_ids[stock_symbol]
+
+        except KeyError as e:
+            raise StockSymbolUnrecognizedError(stock_symbol) from e
 
 
     def get_stock_symbol_price(self,
@@ -254,8 +1053,112 @@ class StockMarket(dispatch.Dispatcher):
         This result changes upon `STOCKMARKET_ADDITION` and
         `STOCKMARKET_CLEARED` events.
         """
-        try:
-            return self._symbol_prices[stock_symbol][-1]
+        return self.get_stock_symbol_price_by_id(
+            self.get_stock_symbol_id(stock_symbol))
 
-        except KeyError as e:
-            raise StockSymbolUnrecognizedError(stock_symbol) from e
+    def get_stock_symbol_price_by_id(self,
+        stock_symbol_id: int
+    ) -> float:
+        """Return the most recent cost for one share of the stock symbol
+        identified by `stock_symbol_id` (see `get_stock_symbol_id`).
+        Unrecognized IDs, including negative ones, raise `IndexError`.
+        """
+        if not 0 <= stock_symbol_id < len(self._stock_symbols):
+            raise IndexError('Stock symbol ID out of range.')
+        return self._price_rows[self._get_buffer_index(-1)][stock_symbol_id]
+
+    def get_prices_by_id(self
+    ) -> typing.List[float]:
+        """Return a `list` of the most recent share prices indexed by stock
+        symbol ID, or an empty `list` if no prices have been added.
+        """
+        if not self._history_length:
+            return []
+        return list(self._price_rows[self._get_buffer_index(-1)])
+
+
+    def get_history_by_id(self
+    ) -> typing.Tuple[typing.List[datetime.datetime],
+        typing.List[typing.Sequence[float]]]:
+        """Return a `tuple` of all retained sample times in chronological
+        order, along with a corresponding `list` of price rows indexed by stock
+        symbol ID. Rows must not be modified.
+        """
+        price_times, price_rows = self._price_times, self._price_rows
+        start = self._history_start
+        end = start + self._history_length
+        if end <= len(price_times):
+            return price_times[start:end], price_rows[start:end]
+
+        end -= len(price_times)  # Buffer wraps around
+        return (price_times[start:] + price_times[:end],
+            price_rows[start:] + price_rows[:end])
+
+    def get_time_evicted(self
+    ) -> typing.Optional[datetime.datetime]:
+        """Return the time of the newest sample evicted by this market's
+        retention policy, or `None` if none were evicted since clearing.
+        """
+        return self._time_evicted
+
+    def copy_mapped_history(self
+    ) -> None:
+        """Replace any price rows that are views of a checkpoint file, as
+        adopted by `restore_history`, with copies, so that the file can be
+        overwritten or deleted without changing this market's history.
+        """
+        copies: typing.Dict[int, typing.Sequence[float]] = {}
+        price_rows = self._price_rows
+        for index, row in enumerate(price_rows):
+            if isinstance(row, memoryview):
+                price_rows[index] = copies[id(row)] = row.tolist()
+
+        row_previous = self._price_row_previous
+        if isinstance(row_previous, memoryview):
+            self._price_row_previous = copies.get(id(row_previous),
+                row_previous.tolist())
+
+    def restore_history(self,
+        stock_symbols: typing.Sequence[str],
+        times: typing.List[datetime.datetime],
+        price_rows: typing.List[typing.Sequence[float]],
+        time_evicted: typing.Optional[datetime.datetime] = None
+    ) -> None:
+        """Replace this market's history with previously saved results of
+        `get_stock_symbols`, `get_history_by_id`, and `get_time_evicted`.
+        The given lists are adopted without copying, and `price_rows` must not
+        be modified afterwards. Samples outside of this market's retention
+        policy are evicted.
+
+        This doesn't re-validate prices. If the number of rows doesn't match
+        `times` or any row doesn't match `stock_symbols`, raises
+        `PriceBlockShapeError`. Doesn't trigger `STOCKMARKET_CLEARED`, so
+        listeners must be reset separately if necessary.
+
+        Triggers `STOCKMARKET_RESTORED` if successful.
+        """
+        if len(price_rows) != len(times):
+            raise PriceBlockShapeError('', len(price_rows), len(times))
+        for row in price_rows:
+            if len(row) != len(stock_symbols):
+                raise PriceBlockShapeError(
+                    next(iter(stock_symbols), ''), len(row), len(stock_symbols))
+
+        self._price_times = times
+        self._price_rows = price_rows
+        self._history_start = self._history_length = 0
+        self._stock_symbols = []
+        self._stock_symbol_ids = {}
+        if times:
+            self._freeze_stock_symbols(stock_symbols)
+        self._history_length = len(times)
+        self._time_evicted = time_evicted
+
+        self._price_row_previous = price_rows[-2] if len(price_rows) > 1 else None
+        self._time_previous = times[-2] if len(times) > 1 else None
+        self._price_changes = self._price_changes_mask = None
+        self._trim_history()
+        self._publish_history()
+
+        self.emit('STOCKMARKET_RESTORED',
+            market=self)
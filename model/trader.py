@@ -105,6 +105,23 @@ class Trader(dispatch.Dispatcher, metaclass=TraderMeta):
     _account: typing.Optional['TraderAccount']
     """This trader's active bank account and stock portfolio."""
 
+    _traded_stock_symbols_mask: typing.Optional[int]
+    """A bitmap of the IDs of `get_traded_stock_symbols` within
+    `_stock_market`, where `-1` includes all stock symbols, or `None` if not
+    determined since the last account creation or settings change.
+    """
+
+    _trades_remotely: bool
+    """When `True`, this trader doesn't `trade` in response to `StockMarket`
+    additions, since a replica in another process does instead.
+    """
+
+    TRADES_ON_PRICE_CHANGES_ONLY: typing.ClassVar[bool] = False
+    """When `True`, `trade` is skipped for `StockMarket` samples that don't
+    change the price of any stock symbol from `get_traded_stock_symbols`.
+    Subclasses can opt in when trading decisions only depend on price changes.
+    """
+
     EVENTS: typing.ClassVar[typing.FrozenSet[str]] = frozenset([
         'TRADER_ACCOUNT_CREATED',
         'TRADER_ALGORITHM_SETTINGS_CHANGED',
@@ -166,6 +183,8 @@ class Trader(dispatch.Dispatcher, metaclass=TraderMeta):
 
         self._name = name
         self._account = None
+        self._traded_stock_symbols_mask = None
+        self._trades_remotely = False
 
         self._initial_funds = 0.0
         self.set_initial_funds(initial_funds)
@@ -223,10 +242,12 @@ class Trader(dispatch.Dispatcher, metaclass=TraderMeta):
                 self._on_traderaccount_frozen)
 
         self._account = TraderAccount(self._stock_market, self)
+        self._traded_stock_symbols_mask = None  # Symbol IDs get reassigned
         self._account.bind(
             TRADERACCOUNT_FROZEN=self._on_traderaccount_frozen)
-        self._stock_market.bind(
-            STOCKMARKET_ADDITION=self._on_stockmarket_addition)
+        if not self._trades_remotely:
+            self._stock_market.bind(
+                STOCKMARKET_ADDITION=self._on_stockmarket_addition)
 
         self.emit('TRADER_ACCOUNT_CREATED',
             trader=self,
@@ -245,9 +266,24 @@ class Trader(dispatch.Dispatcher, metaclass=TraderMeta):
     def _on_stockmarket_addition(self,
         market: 'StockMarket',
         time: datetime.datetime,
-        stock_symbol_prices: typing.Dict[str, float]
+        stock_symbol_prices: typing.Mapping[str, float]
     ) -> None:
         """Make trading decisions as `StockMarket` prices update."""
+        self.respond_to_market()
+
+    def respond_to_market(self
+    ) -> None:
+        """Call `trade` for the newest `StockMarket` sample unless it's idle
+        for this trader (see `TRADES_ON_PRICE_CHANGES_ONLY`), and freeze the
+        active account if `trade` raises an exception. Called automatically for
+        each sample unless trading remotely (see `set_trading_remotely`).
+        """
+        if (self.TRADES_ON_PRICE_CHANGES_ONLY
+            and not self._stock_market.has_price_changes(
+                self._get_traded_stock_symbols_mask())
+        ):
+            return  # Idle sample for this trader
+
         try:
             self.trade()
         except Exception as e:
@@ -258,6 +294,58 @@ class Trader(dispatch.Dispatcher, metaclass=TraderMeta):
                 exception=e)
 
 
+    def is_trading_remotely(self
+    ) -> bool:
+        """Return `True` if this trader's decisions are made by an executor
+        rather than by itself. See `set_trading_remotely`.
+        """
+        return self._trades_remotely
+
+    def set_trading_remotely(self,
+        trades_remotely: bool
+    ) -> None:
+        """Choose whether this trader stops calling `trade` itself, so that an
+        executor can make its decisions instead, such as a replica in another
+        process (see `model.trader_pool.TraderProcessPool`) or a thread (see
+        `model.trader_pool.TraderThreadPool`).
+        """
+        self._trades_remotely = trades_remotely
+        if trades_remotely:
+            self._stock_market.unbind(
+                self._on_stockmarket_addition)
+        elif self._account is not None and not self._account.is_frozen():
+            self._stock_market.bind(
+                STOCKMARKET_ADDITION=self._on_stockmarket_addition)
+
+
+    def get_traded_stock_symbols(self
+    ) -> typing.Optional[typing.Collection[str]]:
+        """Return the stock symbols whose price changes can affect this
+        trader's decisions, or `None` if all stock symbols can. Only used when
+        `TRADES_ON_PRICE_CHANGES_ONLY` is enabled, and re-evaluated when
+        creating accounts or changing algorithm settings.
+        """
+        return None
+
+    def _get_traded_stock_symbols_mask(self
+    ) -> int:
+        """Return a bitmap of the IDs of `get_traded_stock_symbols` within
+        `_stock_market`, where `-1` includes all stock symbols.
+        """
+        if self._traded_stock_symbols_mask is None:
+            stock_symbols = self.get_traded_stock_symbols()
+            if stock_symbols is None:
+                self._traded_stock_symbols_mask = -1
+            else:
+                market_stock_symbols = self._stock_market.get_stock_symbols()
+                self._traded_stock_symbols_mask = sum(
+                    1 << stock_symbol_id
+                        for stock_symbol_id, stock_symbol
+                            in enumerate(market_stock_symbols)
+                            if stock_symbol in stock_symbols)
+        return self._traded_stock_symbols_mask
+
+
     @classmethod
     @abc.abstractmethod
     def get_algorithm_name(cls
@@ -372,6 +460,7 @@ class Trader(dispatch.Dispatcher, metaclass=TraderMeta):
         settings.
         """
         self._algorithm_settings = algorithm_settings
+        self._traded_stock_symbols_mask = None  # May depend on settings
         self.emit('TRADER_ALGORITHM_SETTINGS_CHANGED',
             trader=self,
             algorithm_settings=algorithm_settings)
@@ -394,6 +483,23 @@ class Trader(dispatch.Dispatcher, metaclass=TraderMeta):
         #self._set_algorithm_settings(algorithm_settings)
 
 
+    def get_checkpoint_state(self
+    ) -> typing.Any:
+        """Return JSON-compatible algorithm state that `trade` depends on and
+        that must be saved to resume the active account from a checkpoint.
+        Subclasses with such state override this and `restore_checkpoint_state`.
+        """
+        return None
+
+    def restore_checkpoint_state(self,
+        state: typing.Any
+    ) -> None:
+        """Restore algorithm state previously returned by
+        `get_checkpoint_state` after the active account is restored.
+        """
+        pass
+
+
     @abc.abstractmethod
     def trade(self
     ) -> None:
@@ -154,14 +154,21 @@ class TraderAccount(dispatch.Dispatcher):
     _sales_profit: float
     """The total profit of all sales made with `sell()`."""
 
-    _stocks: typing.DefaultDict[str, float]
-    """A `collections.defaultdict` of owned stock symbols mapped to
-    non-negative quantities owned, defaulting to `0.0` for new keys.
+    _stocks: typing.DefaultDict[int, float]
+    """A `collections.defaultdict` of owned stock symbol IDs (see
+    `StockMarket.get_stock_symbol_id`) mapped to non-negative quantities
+    owned, defaulting to `0.0` for new keys.
     """
 
     _frozen: bool
     """When `True`, this account can no longer be used to `buy` or `sell`."""
 
+    _events_held: typing.Optional[typing.List[
+        typing.Tuple[str, typing.Dict[str, typing.Any]]]]
+    """Names and arguments of events to emit upon `release_events`, or `None`
+    if events are emitted immediately.
+    """
+
     EVENTS: typing.ClassVar[typing.FrozenSet[str]] = frozenset([
         'TRADERACCOUNT_BOUGHT',
         'TRADERACCOUNT_FROZEN',
@@ -187,6 +194,38 @@ class TraderAccount(dispatch.Dispatcher):
 
         self._stocks = collections.defaultdict(float)  # Default to 0.0
         self._frozen = False
+        self._events_held = None
+
+
+    def emit(self,
+        name: str,
+        *args: typing.Any,
+        **kwargs: typing.Any
+    ) -> bool:
+        """Dispatch an event to listeners, or hold it until `release_events`
+        if `hold_events` was called.
+        """
+        if self._events_held is not None:
+            self._events_held.append((name, kwargs))
+            return True
+        return super().emit(name, *args, **kwargs)
+
+    def hold_events(self
+    ) -> None:
+        """Delay all events from this account until `release_events`, so that
+        it can be traded with outside of the thread that listeners expect.
+        """
+        if self._events_held is None:
+            self._events_held = []
+
+    def release_events(self
+    ) -> None:
+        """Emit events held since `hold_events` in their original order, and
+        resume emitting events immediately.
+        """
+        events_held, self._events_held = self._events_held, None
+        for name, kwargs in events_held or ():
+            super().emit(name, **kwargs)
 
 
     def get_stock_market(self
@@ -219,7 +258,20 @@ class TraderAccount(dispatch.Dispatcher):
         This result changes upon `TRADERACCOUNT_BOUGHT` and
         `TRADERACCOUNT_SOLD` events.
         """
-        return self._stocks.copy()
+        get_stock_symbol = self._stock_market.get_stock_symbol
+        return {get_stock_symbol(stock_symbol_id): quantity
+            for stock_symbol_id, quantity in self._stocks.items()}
+
+    def get_stocks_by_id(self
+    ) -> typing.Dict[int, float]:
+        """Return the quantities of stock shares that this account holds as a
+        `dict` mapping stock symbol IDs to non-negative quantities. See
+        `StockMarket.get_stock_symbol_id`.
+
+        This result changes upon `TRADERACCOUNT_BOUGHT` and
+        `TRADERACCOUNT_SOLD` events.
+        """
+        return dict(self._stocks)
 
 
     def is_frozen(self
@@ -276,36 +328,58 @@ class TraderAccount(dispatch.Dispatcher):
 
         Triggers `TRADERACCOUNT_BOUGHT` if successful.
         """
-        if self.is_frozen():
+        self.buy_by_id(
+            self._stock_market.get_stock_symbol_id(stock_symbol), shares)
+
+    def buy_by_id(self,
+        stock_symbol_id: int,
+        shares: float
+    ) -> None:
+        """Buy a quantity `shares` of the stock symbol identified by
+        `stock_symbol_id` (see `StockMarket.get_stock_symbol_id`). This is a
+        faster alternative to `buy`, with the same requirements, except that
+        unrecognized IDs, including negative ones, raise `IndexError`.
+
+        Triggers `TRADERACCOUNT_BOUGHT` if successful.
+        """
+        if self._frozen:
             raise FrozenError()
 
+        market = self._stock_market
+        if not 0 <= stock_symbol_id < market.get_num_stock_symbols():
+            raise IndexError('Stock symbol ID out of range.')
         fee = self._trader.get_trading_fee()
-        price_per_share = self._stock_market.get_stock_symbol_price(stock_symbol)
+        price_per_share = market.get_stock_symbol_price_by_id(stock_symbol_id)
         cost = shares * price_per_share + fee
-        if cost > self.get_balance():
-            if self.get_balance() - cost < -self._MAX_ROUNDING_ERROR:
+        if cost > self._balance:
+            if self._balance - cost < -self._MAX_ROUNDING_ERROR:
                 raise InsufficientBalanceError(
-                    stock_symbol, cost, self.get_balance())
+                    market.get_stock_symbol(stock_symbol_id), cost,
+                    self._balance)
 
             # Ignore rounding error and spend all funds
-            cost = self.get_balance()
+            cost = self._balance
             shares = (cost - fee) / price_per_share
 
         if shares <= 0:
-            raise StockShareQuantityError(stock_symbol, shares)
+            raise StockShareQuantityError(
+                market.get_stock_symbol(stock_symbol_id), shares)
 
         # Make transaction
         self._balance -= cost
-        self._stocks[stock_symbol] += shares
+        self._stocks[stock_symbol_id] += shares
 
         self._num_purchases += 1
         self._purchases_cost += cost
 
-        self.emit('TRADERACCOUNT_BOUGHT',
-            account=self,
-            stock_symbol=stock_symbol,
-            shares=shares,
-            balance_change=-cost)
+        if (self._events_held is not None
+            or self.has_listeners('TRADERACCOUNT_BOUGHT')
+        ):
+            self.emit('TRADERACCOUNT_BOUGHT',
+                account=self,
+                stock_symbol=market.get_stock_symbol(stock_symbol_id),
+                shares=shares,
+                balance_change=-cost)
 
     def sell(self,
         stock_symbol: str,
@@ -329,39 +403,103 @@ class TraderAccount(dispatch.Dispatcher):
 
         Triggers `TRADERACCOUNT_SOLD` if successful.
         """
-        if self.is_frozen():
+        self.sell_by_id(
+            self._stock_market.get_stock_symbol_id(stock_symbol), shares)
+
+    def sell_by_id(self,
+        stock_symbol_id: int,
+        shares: float
+    ) -> None:
+        """Sell a quantity `shares` of the stock symbol identified by
+        `stock_symbol_id` (see `StockMarket.get_stock_symbol_id`). This is a
+        faster alternative to `sell`, with the same requirements, except that
+        unrecognized IDs, including negative ones, raise `IndexError`.
+
+        Triggers `TRADERACCOUNT_SOLD` if successful.
+        """
+        if self._frozen:
             raise FrozenError()
 
-        if shares > self._stocks[stock_symbol]:
-            if self._stocks[stock_symbol] - shares < -self._MAX_ROUNDING_ERROR:
+        market = self._stock_market
+        if not 0 <= stock_symbol_id < market.get_num_stock_symbols():
+            raise IndexError('Stock symbol ID out of range.')
+        price_per_share = market.get_stock_symbol_price_by_id(stock_symbol_id)
+        shares_owned = self._stocks[stock_symbol_id]
+        if shares > shares_owned:
+            if shares_owned - shares < -self._MAX_ROUNDING_ERROR:
                 raise InsufficientStockSharesError(
-                    stock_symbol, shares, self._stocks[stock_symbol])
+                    market.get_stock_symbol(stock_symbol_id), shares,
+                    shares_owned)
 
             # Ignore rounding error and sell all shares
-            shares = self._stocks[stock_symbol]
+            shares = shares_owned
 
         if shares <= 0:
-            raise StockShareQuantityError(stock_symbol, shares)
+            raise StockShareQuantityError(
+                market.get_stock_symbol(stock_symbol_id), shares)
 
-        price_per_share = self._stock_market.get_stock_symbol_price(stock_symbol)
         profit = shares * price_per_share - self._trader.get_trading_fee()
-        if self.get_balance() + profit < 0:
+        if self._balance + profit < 0:
             # Trading fee made profit negative
             raise InsufficientBalanceError(
-                stock_symbol, -profit, self.get_balance())
+                market.get_stock_symbol(stock_symbol_id), -profit,
+                self._balance)
 
         # Make transaction
         self._balance += profit
-        self._stocks[stock_symbol] -= shares
+        self._stocks[stock_symbol_id] -= shares
 
         self._num_sales += 1
         self._sales_profit += profit
 
-        self.emit('TRADERACCOUNT_SOLD',
-            account=self,
-            stock_symbol=stock_symbol,
-            shares=shares,
-            balance_change=profit)
+        if (self._events_held is not None
+            or self.has_listeners('TRADERACCOUNT_SOLD')
+        ):
+            self.emit('TRADERACCOUNT_SOLD',
+                account=self,
+                stock_symbol=market.get_stock_symbol(stock_symbol_id),
+                shares=shares,
+                balance_change=profit)
+
+
+    def get_ledger(self
+    ) -> typing.Dict[str, typing.Any]:
+        """Return a JSON-compatible `dict` of this account's balances, stock
+        holdings, and running statistics, which `restore_ledger` can apply to
+        another account for the same `StockMarket` symbols.
+        """
+        return {
+            'BALANCE_INITIAL': self._balance_initial,
+            'BALANCE': self._balance,
+            'PURCHASE_COUNT': self._num_purchases,
+            'PURCHASE_COST': self._purchases_cost,
+            'SALE_COUNT': self._num_sales,
+            'SALE_PROFIT': self._sales_profit,
+            'STOCKS': sorted(self._stocks.items()),
+            'FROZEN': self._frozen}
+
+    def restore_ledger(self,
+        ledger: typing.Dict[str, typing.Any]
+    ) -> None:
+        """Replace this account's balances, stock holdings, and running
+        statistics with a `ledger` previously returned by `get_ledger`.
+
+        Triggers `TRADERACCOUNT_FROZEN` if `ledger` was frozen.
+        """
+        self._balance_initial = ledger['BALANCE_INITIAL']
+        self._balance = ledger['BALANCE']
+        self._num_purchases = ledger['PURCHASE_COUNT']
+        self._purchases_cost = ledger['PURCHASE_COST']
+        self._num_sales = ledger['SALE_COUNT']
+        self._sales_profit = ledger['SALE_PROFIT']
+
+        self._stocks.clear()
+        self._stocks.update(
+            (stock_symbol_id, quantity)
+                for stock_symbol_id, quantity in ledger['STOCKS'])
+
+        if ledger['FROZEN']:
+            self.freeze('Account was frozen when its ledger was saved.')
 
 
     def get_statistics_daily(self
@@ -383,9 +521,11 @@ class TraderAccount(dispatch.Dispatcher):
         and the associated values can be converted to `str`.
         """
         fee = self._trader.get_trading_fee()
+        get_price = self._stock_market.get_stock_symbol_price_by_id
         stocks_value = sum(
-            quantity * self._stock_market.get_stock_symbol_price(symbol) - fee
-                for symbol, quantity in self._stocks.items() if quantity > 0)
+            quantity * get_price(stock_symbol_id) - fee
+                for stock_symbol_id, quantity in self._stocks.items()
+                    if quantity > 0)
 
         return {
             'PROFIT_NET': self._balance + stocks_value - self._balance_initial,
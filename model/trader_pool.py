@@ -0,0 +1,681 @@
+"""Defines `TraderProcessPool`, `TraderThreadPool`, and supporting classes."""
+
+
+__copyright__ = 'Copyright © 2019, Erik Anderson, James Abernathy, and Tyler Gerritsen'
+__license__ = 'MIT'
+
+
+import concurrent.futures
+import datetime
+import multiprocessing
+import multiprocessing.connection
+import operator
+import pickle
+import sys
+import typing
+
+# Local package imports duplicated at end of file to resolve circular dependencies
+if typing.TYPE_CHECKING:
+    from model.shared_stock_market import SharedStockMarket, SharedStockMarketView
+    from model.sim_model import SimModel
+    from model.stock_market import StockMarket
+    from model.trader import Trader
+    from model.trader_account import FrozenError, TraderAccount
+
+
+
+
+_Order = typing.Tuple[str, str, typing.Tuple[typing.Any, ...]]
+"""A trader name, the name of a `TraderAccount` method that the trader called,
+and that method's arguments.
+"""
+
+
+
+
+class TraderProcessError(RuntimeError):
+    """An exception raised when a `TraderProcessPool` worker process fails
+    outside of any trader's decisions.
+    """
+
+    exception: BaseException
+    """The exception raised within the worker process."""
+
+    def __init__(self,
+        exception: BaseException
+    ) -> None:
+        self.exception = exception
+        super().__init__('Trader worker process failed: {!r}'.format(
+            exception))
+
+
+
+
+def _get_portable_exception(
+    exception: BaseException
+) -> BaseException:
+    """Return `exception` if it can be sent between processes, or else a
+    `RuntimeError` describing it.
+    """
+    try:
+        return pickle.loads(pickle.dumps(exception))
+    except Exception:
+        return RuntimeError(repr(exception))
+
+
+
+
+class _TraderWorker(object):
+    """Replicas of a shard of traders and their `StockMarket`, run inside a
+    `TraderProcessPool` worker process. Orders that the replicas make through
+    their `TraderAccount`s are recorded for the parent process to apply.
+    """
+
+    _market: 'StockMarket'
+    """A replica of the parent's market that replica traders react to."""
+
+    _market_view: typing.Optional['SharedStockMarketView']
+    """A view of the parent's `SharedStockMarket` if it has one, which ticks
+    are read from instead of being sent.
+    """
+
+    _stock_symbols: typing.List[str]
+    """The parent market's stock symbols, for when the replica market is
+    empty and its stock symbols aren't frozen yet.
+    """
+
+    _traders: typing.Dict[str, 'Trader']
+    """Replica traders indexed by name."""
+
+    _orders: typing.List[_Order]
+    """Orders recorded since the last tick was reported."""
+
+
+    def __init__(self
+    ) -> None:
+        self._market = StockMarket()
+        self._market_view = None
+        self._stock_symbols = []
+        self._traders = {}
+        self._orders = []
+
+
+    def sync(self,
+        state: typing.Dict[str, typing.Any]
+    ) -> None:
+        """Discard all replicas, and rebuild them from a `state` gathered by
+        `TraderProcessPool._sync`.
+        """
+        if self._market_view is not None:
+            self._market_view.close()
+            self._market_view = None
+
+        market = self._market = StockMarket(*state['RETENTION'])
+        self._stock_symbols = state['STOCK_SYMBOLS']
+        market.restore_history(state['STOCK_SYMBOLS'], state['TIMES'],
+            state['PRICE_ROWS'], state['TIME_EVICTED'])
+        if state['SHARED_NAME'] is not None:
+            self._market_view = SharedStockMarketView(state['SHARED_NAME'])
+
+        self._traders = {}
+        for (trader_class, name, initial_funds, trading_fee,
+            algorithm_settings, ledger, algorithm_state
+        ) in state['TRADERS']:
+            trader = trader_class(market,
+                name, initial_funds, trading_fee, algorithm_settings)
+            trader.bind(
+                TRADER_ACCOUNT_CREATED=self._on_trader_account_created)
+            if ledger is not None:
+                trader.create_account().restore_ledger(ledger)
+                trader.restore_checkpoint_state(algorithm_state)
+            self._traders[name] = trader
+
+        self._orders.clear()  # Ignore freezes from restoring ledgers
+
+    def _on_trader_account_created(self,
+        trader: 'Trader',
+        account: 'TraderAccount'
+    ) -> None:
+        """Record orders made through a replica trader's new account."""
+        name = trader.get_name()
+        orders = self._orders
+
+        def record(method_name: str) -> None:
+            method = getattr(account, method_name)
+            def method_recorded(*args: typing.Any) -> None:
+                method(*args)
+                orders.append((name, method_name, args))  # Only if successful
+            setattr(account, method_name, method_recorded)
+        record('buy_by_id')
+        record('sell_by_id')
+
+        def on_traderaccount_frozen(
+            account: 'TraderAccount',
+            reason: typing.Optional[str],
+            exception: typing.Optional[Exception]
+        ) -> None:
+            orders.append((name, 'freeze', (reason,
+                None if exception is None
+                    else _get_portable_exception(exception))))
+        account.bind(
+            TRADERACCOUNT_FROZEN=on_traderaccount_frozen)
+
+
+    def tick(self,
+        time: typing.Optional[datetime.datetime],
+        prices: typing.Optional[typing.List[float]],
+        tick: typing.Optional[int]
+    ) -> typing.List[_Order]:
+        """Add a sample of `prices` at `time` to the replica market, or read
+        them at `tick` from the parent's `SharedStockMarket`, and return the
+        orders that replica traders made in response.
+        """
+        if self._market_view is not None and tick is not None:
+            time = self._market_view.get_time(tick)
+            prices = self._market_view.get_prices_by_id(tick)
+        assert time is not None and prices is not None, 'Tick missing'
+
+        if self._market.get_stock_symbols():
+            self._market.add_next_prices_by_id(time, prices)
+        else:  # First sample freezes stock symbols
+            self._market.add_next_prices(time,
+                dict(zip(self._stock_symbols, prices)))
+        orders = self._orders.copy()
+        self._orders.clear()
+        return orders
+
+    def get_algorithm_states(self
+    ) -> typing.Dict[str, typing.Any]:
+        """Return replica traders' `Trader.get_checkpoint_state` results
+        indexed by name, for traders with accounts.
+        """
+        return {name: trader.get_checkpoint_state()
+            for name, trader in self._traders.items()
+                if trader.get_account() is not None}
+
+
+    @classmethod
+    def run(cls,
+        connection: multiprocessing.connection.Connection
+    ) -> None:
+        """Serve requests from a `TraderProcessPool` over `connection` until
+        told to stop. Each request is a method name and its arguments, and is
+        answered with `('OK', result)` or `('ERROR', exception)`.
+        """
+        worker = cls()
+        while True:
+            method_name, args = connection.recv()
+            if method_name is None:
+                break
+            try:
+                result = ('OK', getattr(worker, method_name)(*args))
+            except Exception as e:
+                result = ('ERROR', _get_portable_exception(e))
+            connection.send(result)
+
+        if worker._market_view is not None:
+            worker._market_view.close()
+        connection.close()
+
+
+
+
+class TraderProcessPool(object):
+    """Runs a `SimModel`'s traders in worker processes so that their `trade`
+    decisions use more than one core.
+
+    Traders are sharded across workers by name. Each worker holds replicas of
+    its traders along with a replica of the model's `StockMarket`. Every
+    `STOCKMARKET_ADDITION` is sent once to each worker, which replays it for
+    its replica traders and returns the orders they made. Those orders then
+    get applied to the model's real `TraderAccount`s, in order of trader name,
+    so results match running every trader in the main process.
+
+    Whenever the market or traders change in ways other than additions, the
+    workers get rebuilt from the model's state before the next addition.
+    Algorithm state that isn't stored in accounts (see
+    `Trader.get_checkpoint_state`) lives in the workers, and is fetched back
+    with `fetch_algorithm_states`.
+    """
+
+
+    _model: 'SimModel'
+    """The model whose traders run in this pool."""
+
+    _processes: typing.List[multiprocessing.process.BaseProcess]
+    """Worker processes, each running `_TraderWorker.run`."""
+
+    _connections: typing.List[multiprocessing.connection.Connection]
+    """Connections to each of `_processes`."""
+
+    _synced: bool
+    """`True` while worker replicas match the model, apart from algorithm
+    state."""
+
+    _algorithm_states_remote: bool
+    """`True` if workers have algorithm states newer than the model's."""
+
+    _replaying_orders: bool
+    """`True` while applying orders that replica traders made."""
+
+
+    def __init__(self,
+        model: 'SimModel',
+        num_processes: int
+    ) -> None:
+        """Start `num_processes` workers for `model`'s traders, which stop
+        trading by themselves until `close` is called.
+        """
+        if num_processes <= 0:
+            raise ValueError('Trader pools need at least one process.')
+
+        self._model = model
+        self._processes = []
+        self._connections = []
+        self._synced = False
+        self._algorithm_states_remote = False
+        self._replaying_orders = False
+
+        context = multiprocessing.get_context()
+        for _ in range(num_processes):
+            connection, connection_child = context.Pipe()
+            process = context.Process(target=_TraderWorker.run,
+                args=(connection_child,), daemon=True)
+            process.start()
+            connection_child.close()
+            self._processes.append(process)
+            self._connections.append(connection)
+
+        model.bind(
+            SIMMODEL_TRADER_ADDED=self._on_simmodel_trader_added,
+            SIMMODEL_TRADER_REMOVED=self._on_simmodel_trader_removed)
+        for trader in model.get_traders():
+            self._add_trader(trader)
+
+        model.get_stock_market().bind(
+            STOCKMARKET_ADDITION=self._on_stockmarket_addition,
+            STOCKMARKET_BLOCK_ADDITION=self._on_stockmarket_changed,
+            STOCKMARKET_CLEARED=self._on_stockmarket_changed,
+            STOCKMARKET_RESTORED=self._on_stockmarket_changed)
+
+    def get_num_processes(self
+    ) -> int:
+        """Return the number of worker processes in this pool."""
+        return len(self._processes)
+
+    def close(self
+    ) -> None:
+        """Fetch algorithm states back from workers, stop them, and let the
+        model's traders trade by themselves again.
+        """
+        self.fetch_algorithm_states()
+
+        self._model.unbind(
+            self._on_simmodel_trader_added,
+            self._on_simmodel_trader_removed)
+        self._model.get_stock_market().unbind(
+            self._on_stockmarket_addition,
+            self._on_stockmarket_changed)
+        for trader in self._model.get_traders():
+            self._remove_trader(trader)
+
+        for connection in self._connections:
+            connection.send((None, ()))
+            connection.close()
+        for process in self._processes:
+            process.join()
+        self._processes.clear()
+        self._connections.clear()
+
+
+    def _add_trader(self,
+        trader: 'Trader'
+    ) -> None:
+        """Take over `trader`'s decisions, and watch for changes that its
+        replica needs.
+        """
+        trader.set_trading_remotely(True)
+        trader.bind(
+            TRADER_ACCOUNT_CREATED=self._on_trader_account_created,
+            TRADER_ALGORITHM_SETTINGS_CHANGED=self._on_trader_changed,
+            TRADER_INITIAL_FUNDS_CHANGED=self._on_trader_changed,
+            TRADER_TRADING_FEE_CHANGED=self._on_trader_changed)
+        account = trader.get_account()
+        if account is not None:
+            account.bind(
+                TRADERACCOUNT_FROZEN=self._on_traderaccount_frozen)
+        self._synced = False
+
+    def _remove_trader(self,
+        trader: 'Trader'
+    ) -> None:
+        """Return `trader`'s decisions to it."""
+        trader.unbind(
+            self._on_trader_account_created,
+            self._on_trader_changed)
+        account = trader.get_account()
+        if account is not None:
+            account.unbind(
+                self._on_traderaccount_frozen)
+        trader.set_trading_remotely(False)
+        self._synced = False
+
+    def _on_simmodel_trader_added(self,
+        model: 'SimModel',
+        trader: 'Trader'
+    ) -> None:
+        self._add_trader(trader)
+
+    def _on_simmodel_trader_removed(self,
+        model: 'SimModel',
+        trader: 'Trader'
+    ) -> None:
+        self._remove_trader(trader)
+
+    def _on_trader_changed(self,
+        trader: 'Trader',
+        **kwargs: typing.Any
+    ) -> None:
+        self._synced = False
+
+    def _on_trader_account_created(self,
+        trader: 'Trader',
+        account: 'TraderAccount'
+    ) -> None:
+        account.bind(
+            TRADERACCOUNT_FROZEN=self._on_traderaccount_frozen)
+        self._synced = False
+
+    def _on_traderaccount_frozen(self,
+        account: 'TraderAccount',
+        reason: typing.Optional[str],
+        exception: typing.Optional[Exception]
+    ) -> None:
+        """Resync replicas after accounts freeze outside of their orders."""
+        if not self._replaying_orders:
+            self._synced = False
+
+    def _on_stockmarket_changed(self,
+        market: 'StockMarket',
+        **kwargs: typing.Any
+    ) -> None:
+        self._synced = False
+        # Model's algorithm states were reset or restored along with accounts
+        self._algorithm_states_remote = False
+
+
+    def _request_all(self,
+        requests: typing.Sequence[typing.Tuple[str, typing.Tuple[typing.Any, ...]]]
+    ) -> typing.List[typing.Any]:
+        """Send one request to each worker, wait for them all to finish, and
+        return their results in worker order. Raises `TraderProcessError` if
+        any worker failed.
+        """
+        for connection, request in zip(self._connections, requests):
+            connection.send(request)
+
+        results = []
+        for connection in self._connections:
+            status, result = connection.recv()
+            if status == 'ERROR':
+                raise TraderProcessError(result)
+            results.append(result)
+        return results
+
+    def fetch_algorithm_states(self
+    ) -> None:
+        """Restore the model's traders' algorithm states from their replicas
+        (see `Trader.restore_checkpoint_state`), such as before saving a
+        checkpoint.
+        """
+        if not self._algorithm_states_remote:
+            return
+
+        for algorithm_states in self._request_all(
+            [('get_algorithm_states', ())] * len(self._connections)
+        ):
+            for name, algorithm_state in algorithm_states.items():
+                trader = self._model.get_trader(name)
+                if trader is not None and trader.get_account() is not None:
+                    trader.restore_checkpoint_state(algorithm_state)
+        self._algorithm_states_remote = False
+
+    def _sync(self
+    ) -> None:
+        """Rebuild every worker's replicas from the model's state, excluding
+        the newest market sample, which is sent as a tick afterwards.
+        """
+        self.fetch_algorithm_states()
+
+        market = self._model.get_stock_market()
+        times, price_rows = market.get_history_by_id()
+        state = {
+            'RETENTION': market.get_retention(),
+            'STOCK_SYMBOLS': market.get_stock_symbols(),
+            'TIMES': times[:-1],
+            'PRICE_ROWS': [list(row) for row in price_rows[:-1]],
+            'TIME_EVICTED': market.get_time_evicted(),
+            'SHARED_NAME': (market.get_shared_name()
+                if isinstance(market, SharedStockMarket) else None)}
+
+        traders = sorted(self._model.get_traders(), key=Trader.get_name)
+        shards: typing.List[typing.List[typing.Tuple[typing.Any, ...]]] = [
+            [] for _ in self._connections]
+        for index, trader in enumerate(traders):
+            account = trader.get_account()
+            shards[index % len(shards)].append((
+                type(trader), trader.get_name(),
+                trader.get_initial_funds(), trader.get_trading_fee(),
+                trader.get_algorithm_settings(),
+                None if account is None else account.get_ledger(),
+                None if account is None else trader.get_checkpoint_state()))
+
+        self._request_all([('sync', (dict(state, TRADERS=shard),))
+            for shard in shards])
+        self._synced = True
+
+    def _on_stockmarket_addition(self,
+        market: 'StockMarket',
+        time: datetime.datetime,
+        stock_symbol_prices: typing.Mapping[str, float]
+    ) -> None:
+        """Have workers replay the new sample, and apply the orders that their
+        replica traders made.
+        """
+        if not self._synced:
+            self._sync()
+
+        if isinstance(market, SharedStockMarket):
+            args: typing.Tuple[typing.Any, ...] = (
+                None, None, market.get_tick_count() - 1)
+        else:
+            args = (time, market.get_prices_by_id(), None)
+        orders = [order
+            for orders_shard in self._request_all(
+                [('tick', args)] * len(self._connections))
+                for order in orders_shard]
+        self._algorithm_states_remote = True
+
+        orders.sort(key=operator.itemgetter(0))  # Stable within each trader
+        self._replaying_orders = True
+        try:
+            for name, method_name, args in orders:
+                trader = self._model.get_trader(name)
+                assert trader is not None, 'Order from unknown trader'
+                account = trader.get_account()
+                assert account is not None, 'Order without an account'
+                try:
+                    getattr(account, method_name)(*args)
+                except FrozenError:
+                    pass  # Frozen here since the last sync, which resyncs
+                except Exception:
+                    self._synced = False  # Replica diverged from the model
+        finally:
+            self._replaying_orders = False
+
+
+
+
+
+class TraderThreadPool(object):
+    """Runs a `SimModel`'s traders concurrently in threads on free-threaded
+    Python builds, where threads execute Python code in parallel.
+
+    Every `STOCKMARKET_ADDITION` gets submitted to the pool once per trader
+    with an active account, and the market isn't modified until all of them
+    finish, so traders see an unchanging snapshot. Each trader only modifies
+    its own `TraderAccount`, whose events are held while trading and then
+    emitted in this thread in order of trader name. Results and event order
+    therefore match running every trader serially.
+
+    Where the GIL is enabled, threads would only add overhead, so traders
+    instead trade serially in this thread in order of trader name.
+    """
+
+
+    _model: 'SimModel'
+    """The model whose traders run in this pool."""
+
+    _num_threads: int
+    """The requested number of threads."""
+
+    _executor: typing.Optional[concurrent.futures.ThreadPoolExecutor]
+    """Threads that traders run in, or `None` if the GIL is enabled."""
+
+    _traders_sorted: typing.Optional[typing.List['Trader']]
+    """The model's traders in order of name, or `None` if not determined since
+    the last trader was added or removed.
+    """
+
+
+    def __init__(self,
+        model: 'SimModel',
+        num_threads: int
+    ) -> None:
+        """Start `num_threads` threads for `model`'s traders if this Python
+        build is free-threaded. Traders stop trading by themselves until
+        `close` is called.
+        """
+        if num_threads <= 0:
+            raise ValueError('Trader pools need at least one thread.')
+
+        self._model = model
+        self._num_threads = num_threads
+        self._executor = None
+        if self.is_free_threaded():
+            self._executor = concurrent.futures.ThreadPoolExecutor(
+                num_threads, thread_name_prefix='TraderThreadPool')
+        self._traders_sorted = None
+
+        model.bind(
+            SIMMODEL_TRADER_ADDED=self._on_simmodel_trader_added,
+            SIMMODEL_TRADER_REMOVED=self._on_simmodel_trader_removed)
+        for trader in model.get_traders():
+            trader.set_trading_remotely(True)
+
+        model.get_stock_market().bind(
+            STOCKMARKET_ADDITION=self._on_stockmarket_addition)
+
+    @staticmethod
+    def is_free_threaded(
+    ) -> bool:
+        """Return `True` if this Python build runs threads without the GIL."""
+        is_gil_enabled = getattr(sys, '_is_gil_enabled', None)
+        return is_gil_enabled is not None and not is_gil_enabled()
+
+    def is_concurrent(self
+    ) -> bool:
+        """Return `True` if traders run in threads, or `False` if they fell
+        back to trading serially because the GIL is enabled.
+        """
+        return self._executor is not None
+
+    def get_num_threads(self
+    ) -> int:
+        """Return the number of threads requested for this pool."""
+        return self._num_threads
+
+    def fetch_algorithm_states(self
+    ) -> None:
+        """Does nothing, since traders' algorithm states stay in this process.
+        """
+        pass
+
+    def close(self
+    ) -> None:
+        """Stop all threads, and let the model's traders trade by themselves
+        again.
+        """
+        self._model.unbind(
+            self._on_simmodel_trader_added,
+            self._on_simmodel_trader_removed)
+        self._model.get_stock_market().unbind(
+            self._on_stockmarket_addition)
+        for trader in self._model.get_traders():
+            trader.set_trading_remotely(False)
+
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+
+    def _on_simmodel_trader_added(self,
+        model: 'SimModel',
+        trader: 'Trader'
+    ) -> None:
+        trader.set_trading_remotely(True)
+        self._traders_sorted = None
+
+    def _on_simmodel_trader_removed(self,
+        model: 'SimModel',
+        trader: 'Trader'
+    ) -> None:
+        trader.set_trading_remotely(False)
+        self._traders_sorted = None
+
+    def _on_stockmarket_addition(self,
+        market: 'StockMarket',
+        time: datetime.datetime,
+        stock_symbol_prices: typing.Mapping[str, float]
+    ) -> None:
+        """Have every trader with an active account respond to the new sample.
+        """
+        if self._traders_sorted is None:
+            self._traders_sorted = sorted(
+                self._model.get_traders(), key=Trader.get_name)
+
+        traders = []
+        accounts = []
+        for trader in self._traders_sorted:
+            account = trader.get_account()
+            if account is not None and not account.is_frozen():
+                traders.append(trader)
+                accounts.append(account)
+
+        if self._executor is None:
+            for trader in traders:
+                trader.respond_to_market()
+            return
+
+        market.get_price_changes_mask()  # Cache before threads read it
+        for account in accounts:
+            account.hold_events()
+        try:
+            for future in [self._executor.submit(trader.respond_to_market)
+                for trader in traders
+            ]:
+                future.result()
+        finally:
+            for account in accounts:
+                account.release_events()
+
+
+
+
+# Imported last to avoid circular dependencies
+from model.shared_stock_market import SharedStockMarket, SharedStockMarketView
+from model.sim_model import SimModel
+from model.stock_market import StockMarket
+from model.trader import Trader
+from model.trader_account import FrozenError, TraderAccount
+
@@ -0,0 +1,61 @@
+"""Defines `StartupTimer`, which breaks down application startup time by
+phase. Imports nothing else, so it can time the imports that follow it.
+"""
+
+
+__copyright__ = 'Copyright © 2019, Erik Anderson, James Abernathy, and Tyler Gerritsen'
+__license__ = 'MIT'
+
+
+import time
+import typing
+
+
+
+
+class StartupTimer(object):
+    """Records how long each phase of startup takes, where each phase ends
+    when it gets marked with `mark`.
+    """
+
+    _time_last: float
+    """`time.perf_counter` value when the previous phase ended."""
+
+    _phases: typing.List[typing.Tuple[str, float]]
+    """Names and durations in seconds of each marked phase, in order."""
+
+    def __init__(self
+    ) -> None:
+        """Start timing the first phase now."""
+        self._time_last = time.perf_counter()
+        self._phases = []
+
+    def mark(self,
+        phase: str
+    ) -> None:
+        """End the current phase, naming it `phase`, and start the next."""
+        time_now = time.perf_counter()
+        self._phases.append((phase, time_now - self._time_last))
+        self._time_last = time_now
+
+    def get_phases(self
+    ) -> typing.List[typing.Tuple[str, float]]:
+        """Return the names and durations in seconds of each marked phase, in
+        order.
+        """
+        return list(self._phases)
+
+    def get_total(self
+    ) -> float:
+        """Return the total seconds of all marked phases."""
+        return sum(duration for phase, duration in self._phases)
+
+    def report(self
+    ) -> str:
+        """Return a human-readable table of phase durations and their total.
+        """
+        lines = ['{:<32} {:8.1f} ms'.format(phase + ':', 1000 * duration)
+            for phase, duration in self._phases]
+        lines.append('{:<32} {:8.1f} ms'.format('Total:',
+            1000 * self.get_total()))
+        return '\n'.join(lines)
@@ -125,7 +125,7 @@ class LoggingView(object):
     ) -> None:
         """Bind to all of `dispatcher`'s emitted events to log them."""
         dispatcher.bind(**{event_name: self._create_event_logger(event_name)
-            for event_name in dispatcher.EVENTS})
+            for event_name in dispatcher.get_event_names()})
 
 
 
@@ -15,9 +15,11 @@ from kivy.uix.boxlayout import BoxLayout
 from kivy.properties import (StringProperty, ObjectProperty)
 from kivy.clock import Clock
 
+import dispatch
+
 # Local package imports duplicated at end of file to resolve circular dependencies
 if typing.TYPE_CHECKING:
-    from controller.market_updater import MarketUpdater
+    from controller.market_updater import MarketSnapshot, MarketUpdater
     from model.stock_market import StockMarket
 
 
@@ -30,6 +32,20 @@ class SimulationTab(TabbedPanelItem):
 
     updater_state: str = StringProperty("reset")
     simulation_time: str = StringProperty("[Simulation Time]")
+    simulation_speed: str = StringProperty("")
+
+    SPEEDS: typing.ClassVar[typing.Dict[str, typing.Tuple[
+        int, typing.Optional[float], typing.Optional[float]]]] = {
+            '1 tick/frame': (1, None, None),
+            '10 ticks/frame': (10, None, None),
+            '100 ticks/frame': (100, None, None),
+            'Fastest': (1, 0.010, None),
+            'Real time': (1, 0.010, 1.0),
+            '10x real time': (1, 0.010, 10.0),
+            '60x real time': (1, 0.010, 60.0)}
+    """Simulation speeds selectable by name, as `MarketUpdater` ticks per
+    frame, frame budget in seconds, and replay speed.
+    """
 
     def __init__(self,
         *args: typing.Any,
@@ -39,12 +55,31 @@ class SimulationTab(TabbedPanelItem):
 
         controller = self._get_controller()
         controller.get_updater().bind(
+            MARKETUPDATER_BATCH_FINISHED=self.on_marketupdater_batch_finished,
             MARKETUPDATER_PLAYING=self.on_marketupdater_playing,
             MARKETUPDATER_PAUSED=self.on_marketupdater_paused,
-            MARKETUPDATER_RESET=self.on_marketupdater_reset)
-        controller.get_model().get_stock_market().bind(
-            STOCKMARKET_ADDITION=self.on_stockmarket_addition,
-            STOCKMARKET_CLEARED=self.on_stockmarket_cleared)
+            MARKETUPDATER_RESET=self.on_marketupdater_reset,
+            MARKETUPDATER_SNAPSHOT=self.on_marketupdater_snapshot,
+            MARKETUPDATER_SPEED_CHANGED=self.on_marketupdater_speed_changed)
+        # Only the latest time gets displayed, so skip redundant updates
+        self._addition_delivery = dispatch.CoalescedDelivery()
+        self._addition_delivery.flush_every(Clock, 0)
+        market = controller.get_model().get_stock_market()
+        market.bind_deferred(self._addition_delivery,
+            STOCKMARKET_ADDITION=self.on_stockmarket_addition)
+        market.bind(
+            STOCKMARKET_BLOCK_ADDITION=self.on_stockmarket_block_addition,
+            STOCKMARKET_CLEARED=self.on_stockmarket_cleared,
+            STOCKMARKET_RESTORED=self.on_stockmarket_restored)
+
+        # Catch up with the simulation if this tab was built after it started
+        updater = controller.get_updater()
+        if updater.is_playing():
+            self.updater_state = 'playing'
+        elif updater.is_paused():
+            self.updater_state = 'paused'
+        if not (updater.is_threaded() and updater.is_playing()):
+            self.show_latest_time(controller.get_model().get_stock_market())
 
 
     def _get_controller(self):
@@ -61,6 +96,43 @@ class SimulationTab(TabbedPanelItem):
     def on_marketupdater_reset(self, updater: 'MarketUpdater'):
         self.updater_state = 'reset'
 
+    def on_marketupdater_speed_changed(self,
+        updater: 'MarketUpdater',
+        ticks_per_second: float
+    ) -> None:
+        self.simulation_speed = ('' if not ticks_per_second
+            else '{:,.0f} ticks/s'.format(ticks_per_second))
+
+    def on_marketupdater_batch_finished(self,
+        updater: 'MarketUpdater',
+        num_ticks: int
+    ) -> None:
+        self.show_latest_time(
+            self._get_controller().get_model().get_stock_market())
+
+    def on_marketupdater_snapshot(self,
+        updater: 'MarketUpdater',
+        snapshot: 'MarketSnapshot'
+    ) -> None:
+        self.label_time.text = ('' if snapshot.time is None
+            else '{:%Y-%m-%d %H:%M}'.format(snapshot.time))
+
+    def set_simulation_threaded(self,
+        threaded: bool
+    ) -> None:
+        """Choose whether the updater plays from a background thread."""
+        self._get_controller().get_updater().set_threaded(threaded)
+
+    def set_simulation_speed(self,
+        speed: str
+    ) -> None:
+        """Configure the updater with a speed named in `SPEEDS`."""
+        ticks_per_frame, frame_budget, replay_speed = self.SPEEDS[speed]
+        updater = self._get_controller().get_updater()
+        updater.set_ticks_per_frame(ticks_per_frame)
+        updater.set_frame_budget(frame_budget)
+        updater.set_replay_speed(replay_speed)
+
     def play_simulation(self):
         self._get_controller().get_updater().play()
 
@@ -74,15 +146,42 @@ class SimulationTab(TabbedPanelItem):
     def on_stockmarket_addition(self,
         market: 'StockMarket',
         time: datetime.datetime,
-        stock_symbol_prices: typing.Dict[str, float]
+        stock_symbol_prices: typing.Mapping[str, float]
     ) -> None:
+        """Display the latest `time` once per frame, even from threads."""
         self.label_time.text = '{:%Y-%m-%d %H:%M}'.format(time)
 
+    def on_stockmarket_block_addition(self,
+        market: 'StockMarket',
+        times: typing.Sequence[datetime.datetime],
+        stock_symbol_prices: typing.Mapping[str, typing.Sequence[float]]
+    ) -> None:
+        updater = self._get_controller().get_updater()
+        if updater.is_worker_thread():
+            return  # Rendered from snapshots instead
+        if updater.is_quiet():
+            return  # Rendered once the batch finishes
+        self.label_time.text = '{:%Y-%m-%d %H:%M}'.format(times[-1])
+
     def on_stockmarket_cleared(self,
         market: 'StockMarket'
     ) -> None:
+        self._addition_delivery.clear()  # Times from before clearing
         self.label_time.text = ''
 
+    def on_stockmarket_restored(self,
+        market: 'StockMarket'
+    ) -> None:
+        self.show_latest_time(market)
+
+    def show_latest_time(self,
+        market: 'StockMarket'
+    ) -> None:
+        """Display the time of `market`'s latest prices."""
+        time_range = market.get_time_range()
+        self.label_time.text = ('' if time_range is None
+            else '{:%Y-%m-%d %H:%M}'.format(time_range[1]))
+
 
     def run_console_test(self
     ) -> None:
@@ -143,5 +242,5 @@ class SimulationTab(TabbedPanelItem):
 
 
 # Imported last to avoid circular dependencies
-from controller.market_updater import MarketUpdater
+from controller.market_updater import MarketSnapshot, MarketUpdater
 from model.stock_market import StockMarket
@@ -72,6 +72,12 @@ class StatisticsTab(TabbedPanelItem):
             SIMMODEL_TRADER_ADDED=self.on_simmodel_trader_added,
             SIMMODEL_TRADER_REMOVED=self.on_simmodel_trader_removed)
 
+        # Follow preexisting traders
+        for trader in model.get_traders():
+            trader.bind(
+                TRADER_ACCOUNT_CREATED=self.on_trader_account_created)
+        self.update_trader_menu()
+
         Clock.schedule_once(self.update_statistics, -1)
         Clock.schedule_interval(self.update_statistics, 0.5)
 
@@ -127,20 +133,36 @@ class StatisticsTab(TabbedPanelItem):
     def update_statistics(self,
         delta: float
     ) -> None:
-        """Periodically update statistics text."""
-        model = App.get_running_app().get_controller().get_model()
+        """Periodically update statistics text while shown."""
+        if self.content is None or self.content.get_parent_window() is None:
+            return  # Another tab is shown
+        controller = App.get_running_app().get_controller()
+        model = controller.get_model()
 
         statistics_overall = statistics_daily = ''
 
-        selected_trader = model.get_trader(self.bot_spinner.text)
-        if selected_trader is not None:
-            account = selected_trader.get_account()
-            if account:
-                # Statistics available from simulation
-                statistics_daily = self.statistics_to_string(
-                    account.get_statistics_daily())
-                statistics_overall = self.statistics_to_string(
-                    account.get_statistics_overall())
+        updater = controller.get_updater()
+        if updater.is_threaded() and updater.is_playing():
+            # Model is changing in another thread, so render its snapshot
+            snapshot = updater.get_snapshot()
+            trader_snapshot = (None if snapshot is None
+                else snapshot.traders.get(self.bot_spinner.text))
+            if trader_snapshot is None:
+                return  # Keep showing the last statistics until available
+            statistics_daily = self.statistics_to_string(
+                trader_snapshot.statistics_daily)
+            statistics_overall = self.statistics_to_string(
+                trader_snapshot.statistics_overall)
+        else:
+            selected_trader = model.get_trader(self.bot_spinner.text)
+            if selected_trader is not None:
+                account = selected_trader.get_account()
+                if account:
+                    # Statistics available from simulation
+                    statistics_daily = self.statistics_to_string(
+                        account.get_statistics_daily())
+                    statistics_overall = self.statistics_to_string(
+                        account.get_statistics_overall())
 
         self.statistics_daily_label_text = statistics_daily
         self.statistics_overall_label_text = statistics_overall
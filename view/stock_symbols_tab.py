@@ -123,6 +123,12 @@ class StockSymbolsTab(TabbedPanelItem):
             MARKETDATASOURCE_STOCK_SYMBOL_REMOVED= \
                 self.on_datasource_symbol_removed)
 
+        # Add preexisting symbols
+        for stock_symbol in datasource.get_stock_symbols():
+            self.on_datasource_symbol_added(
+                datasource=datasource,
+                stock_symbol=stock_symbol)
+
 
     def on_add_clicked(self
     ) -> None:
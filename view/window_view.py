@@ -5,9 +5,12 @@ __copyright__ = 'Copyright © 2019, Erik Anderson, James Abernathy, and Tyler Ge
 __license__ = 'MIT'
 
 
+import importlib
 import typing
 
 from kivy.app import App
+from kivy.clock import Clock
+from kivy.factory import Factory
 from kivy.lang import Builder
 from kivy.properties import ObjectProperty, StringProperty
 from kivy.uix.popup import Popup
@@ -16,10 +19,7 @@ from kivy.uix.tabbedpanel import TabbedPanel, TabbedPanelItem
 # Local package imports duplicated at end of file to resolve circular dependencies
 if typing.TYPE_CHECKING:
     from controller.sim_controller import SimController
-    from view.simulation_tab import SimulationTab
-    from view.statistics_tab import StatisticsTab
-    from view.stock_symbols_tab import StockSymbolsTab
-    from view.traders_tab import TradersTab
+    from startup_timer import StartupTimer
 
 
 
@@ -33,10 +33,63 @@ class ErrorPopup(Popup):
 
 
 
+class LazyTab(TabbedPanelItem):
+    """A tab header that builds its contents on first activation, by loading
+    the `view.<tab_module>` module and its `.kv` template, then borrowing the
+    content of a new `tab_class` instance. Until then, none of the tab's
+    widgets or event bindings exist.
+    """
+
+    tab_module: str = StringProperty()
+    """Name of the `view` module defining `tab_class`, which shares its name
+    with the module's template.
+    """
+
+    tab_class: str = StringProperty()
+    """Name of the tab class whose content is shown under this header."""
+
+    tab: typing.Optional[TabbedPanelItem] = ObjectProperty(None, allownone=True)
+    """The built tab, whose event handlers manage the content shown under
+    this header, or `None` until built.
+    """
+
+    _templates_loaded: typing.ClassVar[typing.Set[str]] = set()
+    """Filenames of `.kv` templates loaded by any `LazyTab`."""
+
+    def build_tab(self
+    ) -> TabbedPanelItem:
+        """Build and return this header's tab if not yet built."""
+        if self.tab is None:
+            importlib.import_module('view.' + self.tab_module)
+            template = 'view/{}.kv'.format(self.tab_module)
+            if template not in self._templates_loaded:
+                self._templates_loaded.add(template)
+                Builder.load_file(template)
+
+            self.tab = Factory.get(self.tab_class)()
+            self.add_widget(self.tab.content)
+
+            App.get_running_app().mark_startup(
+                'Build {} tab'.format(self.text))
+        return self.tab
+
+
+
+
 class RootWidget(TabbedPanel):
     """Class associated with the `<RootWidget>` remplate defined within
     `window_view.kv`.
     """
+    def switch_to(self,
+        header: TabbedPanelItem,
+        *args: typing.Any,
+        **kwargs: typing.Any
+    ) -> None:
+        """Build `LazyTab` contents before showing them."""
+        if isinstance(header, LazyTab):
+            header.build_tab()
+        super().switch_to(header, *args, **kwargs)
+
     @staticmethod
     def on_current_tab(
         instance: 'RootWidget',
@@ -47,6 +100,10 @@ class RootWidget(TabbedPanel):
             tab.bold = False;
         current_tab.bold = True
 
+        if isinstance(current_tab, LazyTab) and current_tab.tab is None:
+            # Activated without `switch_to`, so show it once built
+            Clock.schedule_once(lambda elapsed: instance.switch_to(current_tab))
+
 
 
 
@@ -57,27 +114,33 @@ class WindowView(App):
     _sim_controller: 'SimController'
     """MVC controller tied to an underlying model and driven by this view."""
 
-    # References to tab widgets
-    traders_tab: 'TradersTab'
-    stock_symbols_tab: 'StockSymbolsTab'
-    simulation_tab: 'SimulationTab'
-    statistics_tab: 'StatisticsTab'
+    _startup_timer: typing.Optional['StartupTimer']
+    """Times startup phases until the first frame is shown, then gets
+    reported, or `None` if not measuring startup.
+    """
 
 
     def __init__(self,
-        sim_controller: 'SimController'
+        sim_controller: 'SimController',
+        startup_timer: typing.Optional['StartupTimer'] = None
     ) -> None:
-        """Prepare to build and run this window by loading UI templates."""
+        """Prepare to build and run this window by loading the window's UI
+        template. Each tab's template loads when it's first shown.
+
+        If `startup_timer` is given, startup phases are marked on it until the
+        first frame is shown, then its report is printed and the window closes.
+        """
         super().__init__()
 
         self._sim_controller = sim_controller
+        self._startup_timer = startup_timer
 
         # Disable closing the app with escape
         from kivy.config import Config
         Config.set('kivy', 'exit_on_escape', '0')
 
-        # Load all UI templates
         Builder.load_file('view/window_view.kv')
+        self.mark_startup('Load window template')
 
 
     def get_controller(self
@@ -95,7 +158,34 @@ class WindowView(App):
         """
         self.title = 'EasyMoney'
         self.icon = 'view/Icon.png'
-        return RootWidget()
+        root = RootWidget()
+        self.mark_startup('Build window')
+        return root
+
+    def on_start(self
+    ) -> None:
+        """Finish measuring startup once the first frame is shown."""
+        if self._startup_timer is not None:
+            from kivy.core.window import Window
+            Window.bind(on_flip=self._on_window_first_flip)
+
+    def _on_window_first_flip(self,
+        window: typing.Any
+    ) -> None:
+        """Report startup phases and close the window."""
+        window.unbind(on_flip=self._on_window_first_flip)
+        self.mark_startup('First frame')
+        assert self._startup_timer is not None, 'Not measuring startup'
+        print(self._startup_timer.report())
+        self._startup_timer = None
+        self.stop()
+
+    def mark_startup(self,
+        phase: str
+    ) -> None:
+        """End a `phase` of startup if measuring it. See `StartupTimer`."""
+        if self._startup_timer is not None:
+            self._startup_timer.mark(phase)
 
 
     def run(self
@@ -112,7 +202,5 @@ class WindowView(App):
 
 # Imported last to avoid circular dependencies
 from controller.sim_controller import SimController
-from view.simulation_tab import SimulationTab
-from view.statistics_tab import StatisticsTab
-from view.stock_symbols_tab import StockSymbolsTab
-from view.traders_tab import TradersTab
+from startup_timer import StartupTimer
+# Tab modules are imported by `LazyTab`s when first shown